@@ -0,0 +1,45 @@
+import sys
+import os
+import argparse
+import timeit
+
+# Add the project root to the Python path to allow imports from `src`
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.backend.services import auth_service
+
+# Measures what the verified-token cache saves on each authenticated request:
+# `uncached` is a full HS256 check + JSON decode, `cached` is a digest + LRU hit.
+
+def bench(label: str, fn, number: int) -> float:
+    per_call = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f"{label:<10} {per_call * 1e6:8.2f} µs/request")
+    return per_call
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark auth_service.verify_token with and without the token cache.")
+    parser.add_argument("-n", "--number", type=int, default=20000, help="verify_token calls per timing run")
+    args = parser.parse_args()
+
+    # Only the cache is measured; the periodic revocation pull would need MongoDB.
+    auth_service.sync_revocations = lambda force=False: None
+    token = auth_service.create_token(account_id=1, email="bench@example.com", role="user")
+    cache = auth_service.token_cache
+
+    def uncached():
+        cache.clear()
+        auth_service.verify_token(token)
+
+    def cached():
+        auth_service.verify_token(token)
+
+    assert auth_service.verify_token(token) is not None, "token failed verification"
+    slow = bench("uncached", uncached, args.number)
+    cache.clear()
+    fast = bench("cached", cached, args.number)
+    print(f"saving     {(slow - fast) * 1e6:8.2f} µs/request ({slow / fast:.1f}x)")
+    print(f"counters   hits={cache.hits} misses={cache.misses}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import sys
+import os
+import argparse
+import time
+
+# Add the project root to the Python path to allow imports from `src`
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.backend.services.embedding_service import EMBEDDING_DIM, EMBEDDING_DIR, SemanticIndex
+
+def main():
+    parser = argparse.ArgumentParser(description="Embed every job and user profile and write the vector index used by semanticJobs/semanticCandidates.")
+    parser.add_argument("--dir", default=EMBEDDING_DIR, help="Output directory (default: EMBEDDING_DIR)")
+    parser.add_argument("--dim", type=int, default=EMBEDDING_DIM, help="Vector dimensions (default: EMBEDDING_DIM)")
+    args = parser.parse_args()
+    if not args.dir:
+        parser.error("Set EMBEDDING_DIR or pass --dir.")
+
+    started = time.perf_counter()
+    index = SemanticIndex(directory=None, dim=args.dim)
+    print("Embedding jobs and users...")
+    index.build()
+    print(f"  {len(index.jobs):,} jobs, {len(index.users):,} users in {time.perf_counter() - started:.1f}s")
+    index.save(args.dir)
+    print(f"Wrote {args.dir}. Restart the API servers to load it.")
+
+if __name__ == "__main__":
+    main()
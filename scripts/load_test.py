@@ -0,0 +1,286 @@
+import sys
+import os
+import argparse
+import json
+import random
+import subprocess
+import threading
+import time
+from datetime import datetime, timezone
+
+# Add the project root to the Python path to allow imports from `src`
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import requests
+
+# HTTP load test for /graphql and /nl2gql.
+#
+#   python scripts/load_test.py --store mongod --generate --duration 30 --concurrency 16 --output bench.json
+#   python scripts/load_test.py --store inprocess --baseline bench.json
+#   python scripts/load_test.py --base-url http://localhost:8000      # an already running server
+#
+# Unless --base-url is given, the Flask app is started in-process on a free
+# port, with OLLAMA_HOST pointed at scripts/stub_ollama.py, so /nl2gql latency
+# reflects this app rather than a model. `--store inprocess` swaps MongoDB for
+# mongomock (pip install mongomock) when no mongod is available.
+
+JOBS_QUERY = """query($company: String, $location: String, $title: String) {
+  jobs(company: $company, location: $location, title: $title, limit: 20) { jobId title company location }
+}"""
+RECOMMENDED_QUERY = "query { recommendedJobs(limit: 10) { jobId title company } }"
+APPLICATIONS_QUERY = """query($jobId: Int) {
+  applications(jobId: $jobId) { appId status candidate { UserID FirstName LastName } job { jobId title } }
+}"""
+APPLY_MUTATION = "mutation($t: String!, $c: String) { apply(jobTitle: $t, companyName: $c) { appId } }"
+LOGIN_MUTATION = "mutation($e: String!, $p: String!) { login(email: $e, password: $p) { token } }"
+NL2GQL_PROMPTS = ["show all jobs", "list jobs in Austin", "jobs at DataCorp", "show remote jobs"]
+
+# Relative weights of each operation in the replayed mix.
+DEFAULT_MIX = {
+    "jobs": 35,
+    "recommendedJobs": 15,
+    "applications": 20,
+    "apply": 5,
+    "login": 5,
+    "nl2gql": 20,
+}
+
+class Scenario:
+    """Builds requests for the operation mix against a seeded database."""
+
+    def __init__(self, base_url: str, rng_seed: int, accounts: list, jobs: list):
+        self.base_url = base_url.rstrip("/")
+        self.rng_seed = rng_seed
+        self.accounts = accounts
+        self.jobs = jobs
+
+    def request(self, op: str, rng: random.Random, token: str):
+        """Returns (path, json body, headers) for one operation."""
+        auth = {"Authorization": f"Bearer {token}"} if token else {}
+        job = rng.choice(self.jobs) if self.jobs else {}
+        if op == "jobs":
+            variables = rng.choice([
+                {"company": job.get("company")},
+                {"location": job.get("location")},
+                {"title": (job.get("title") or "engineer").split()[-1]},
+                {"company": job.get("company"), "location": job.get("location")},
+            ])
+            return "/graphql", {"query": JOBS_QUERY, "variables": variables}, {}
+        if op == "recommendedJobs":
+            return "/graphql", {"query": RECOMMENDED_QUERY}, auth
+        if op == "applications":
+            return "/graphql", {"query": APPLICATIONS_QUERY, "variables": {"jobId": job.get("jobId")}}, {}
+        if op == "apply":
+            variables = {"t": job.get("title") or "", "c": job.get("company")}
+            return "/graphql", {"query": APPLY_MUTATION, "variables": variables}, auth
+        if op == "login":
+            email = rng.choice(self.accounts)
+            return "/graphql", {"query": LOGIN_MUTATION, "variables": {"e": email, "p": "password123"}}, {}
+        if op == "nl2gql":
+            return "/nl2gql", {"query": rng.choice(NL2GQL_PROMPTS)}, auth
+        raise ValueError(f"Unknown operation: {op}")
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        "count": count,
+        "errors": errors,
+        "rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(ordered) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if count else 0.0,
+    }
+
+def _is_error(resp) -> bool:
+    # GraphQL domain errors (e.g. a repeated `apply`) still exercised the server; count them separately.
+    if resp.status_code >= 500:
+        return True
+    try:
+        body = resp.json()
+    except ValueError:
+        return True
+    return resp.status_code != 200 or bool(isinstance(body, dict) and (body.get("errors") or body.get("error")))
+
+def run_load(scenario: Scenario, mix: dict, concurrency: int, duration: float, max_requests: int, tokens: list) -> dict:
+    ops, weights = zip(*[(op, w) for op, w in mix.items() if w > 0])
+    latencies = {op: [] for op in ops}
+    errors = {op: 0 for op in ops}
+    lock = threading.Lock()
+    issued = [0]
+    deadline = time.perf_counter() + duration
+
+    def worker(worker_id: int):
+        rng = random.Random(scenario.rng_seed * 1000 + worker_id)
+        session = requests.Session()
+        token = tokens[worker_id % len(tokens)] if tokens else None
+        while time.perf_counter() < deadline:
+            with lock:
+                if max_requests and issued[0] >= max_requests:
+                    return
+                issued[0] += 1
+            op = rng.choices(ops, weights=weights)[0]
+            path, body, headers = scenario.request(op, rng, token)
+            started = time.perf_counter()
+            try:
+                resp = session.post(scenario.base_url + path, json=body, headers=headers, timeout=120)
+                failed = _is_error(resp)
+            except requests.RequestException:
+                failed = True
+            took = time.perf_counter() - started
+            with lock:
+                latencies[op].append(took)
+                errors[op] += int(failed)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [x for values in latencies.values() for x in values]
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "overall": summarize(all_latencies, sum(errors.values()), elapsed),
+        "operations": {op: summarize(latencies[op], errors[op], elapsed) for op in ops},
+    }
+
+def compare(results: dict, baseline: dict, max_regression: float) -> int:
+    """Prints p95/RPS deltas against a baseline run; returns the number of regressions."""
+    regressions = 0
+    print(f"\n{'operation':<18}{'p95 base':>10}{'p95 now':>10}{'delta':>9}{'rps base':>10}{'rps now':>10}{'delta':>9}")
+    rows = [("overall", baseline.get("overall", {}), results["overall"])]
+    rows += [(op, baseline.get("operations", {}).get(op, {}), now) for op, now in results["operations"].items()]
+    for op, old, new in rows:
+        if not old:
+            continue
+        p95_delta = (new["p95_ms"] - old["p95_ms"]) / old["p95_ms"] if old["p95_ms"] else 0.0
+        rps_delta = (new["rps"] - old["rps"]) / old["rps"] if old["rps"] else 0.0
+        flag = ""
+        if p95_delta > max_regression or rps_delta < -max_regression:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{op:<18}{old['p95_ms']:>10.1f}{new['p95_ms']:>10.1f}{p95_delta:>+9.0%}"
+              f"{old['rps']:>10.1f}{new['rps']:>10.1f}{rps_delta:>+9.0%}{flag}")
+    return regressions
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=project_root, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def start_app(store: str, stub_delay: float):
+    """Starts a stub Ollama and the Flask app in this process; returns the app's base URL."""
+    from stub_ollama import start_stub_server
+
+    stub = start_stub_server(delay=stub_delay)
+    os.environ["OLLAMA_HOST"] = f"http://127.0.0.1:{stub.server_address[1]}"
+    if store == "inprocess":
+        try:
+            import mongomock
+        except ImportError:
+            sys.exit("--store inprocess needs mongomock: pip install mongomock")
+        import pymongo
+        pymongo.MongoClient = mongomock.MongoClient
+
+    import logging
+    from werkzeug.serving import make_server
+    from src.backend.app import app
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # no per-request access log
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+def load_fixture(sample_size: int):
+    """Reads job and account samples for building requests, straight from the database."""
+    from src.backend import db
+
+    jobs = list(db.jobs_collection().find({}, {"_id": 0, "jobId": 1, "title": 1, "company": 1, "location": 1}).limit(sample_size))
+    accounts = [a["email"] for a in db.accounts_collection().find({"role": "user"}, {"email": 1}).limit(sample_size)]
+    return jobs, accounts
+
+def login_tokens(base_url: str, accounts: list, count: int) -> list:
+    tokens = []
+    for email in accounts[:count]:
+        resp = requests.post(f"{base_url}/graphql", json={"query": LOGIN_MUTATION, "variables": {"e": email, "p": "password123"}}, timeout=60)
+        token = (((resp.json() or {}).get("data") or {}).get("login") or {}).get("token")
+        if token:
+            tokens.append(token)
+    return tokens
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test /graphql and /nl2gql and report latency percentiles.")
+    parser.add_argument("--base-url", help="Test an already running server instead of starting one in-process")
+    parser.add_argument("--store", choices=["mongod", "inprocess"], default="mongod",
+                        help="In-process mode: use the MONGO_URI mongod, or a mongomock stand-in")
+    parser.add_argument("--generate", action="store_true", help="Seed synthetic data before the run (wipes the database)")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--applications", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run")
+    parser.add_argument("--requests", type=int, default=0, help="Stop after this many requests (0 = no limit)")
+    parser.add_argument("--mix", type=json.loads, default=None, help='Operation weights as JSON, e.g. \'{"jobs": 1, "nl2gql": 1}\'')
+    parser.add_argument("--stub-delay", type=float, default=0.2, help="Seconds each stub Ollama generation takes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against a previous --output file")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed p95/RPS change before failing (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    if args.store == "inprocess" and not args.base_url:
+        args.generate = True  # an empty in-memory store has nothing to query
+    base_url = args.base_url or start_app(args.store, args.stub_delay)
+
+    if args.generate:
+        import seed_db
+        seed_db.generate_database(args.users, args.jobs, args.applications, min(args.users, 200), args.seed, 5000)
+
+    jobs, accounts = load_fixture(5000)
+    if not jobs or not accounts:
+        sys.exit("The database has no jobs or user accounts; run with --generate or seed it first.")
+    tokens = login_tokens(base_url, accounts, args.concurrency)
+    scenario = Scenario(base_url, args.seed, accounts, jobs)
+    mix = args.mix or DEFAULT_MIX
+
+    print(f"Running {args.concurrency} workers for {args.duration}s against {base_url} ...")
+    results = run_load(scenario, mix, args.concurrency, args.duration, args.requests, tokens)
+    results = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {k: getattr(args, k) for k in ("store", "concurrency", "duration", "requests", "stub_delay", "seed")} | {"mix": mix},
+        **results,
+    }
+
+    print(f"\n{'operation':<18}{'count':>8}{'errors':>8}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for op, stats in [("overall", results["overall"]), *results["operations"].items()]:
+        print(f"{op:<18}{stats['count']:>8}{stats['errors']:>8}{stats['rps']:>9.1f}"
+              f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        sys.exit(1 if compare(results, baseline, args.max_regression) else 0)
+
+if __name__ == "__main__":
+    main()
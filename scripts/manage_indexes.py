@@ -0,0 +1,104 @@
+import sys
+import os
+import argparse
+from datetime import datetime, timezone
+
+# Add the project root to the Python path to allow imports from `src`
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.backend import db
+from src.backend.repository import job_repo, user_repo
+
+# --- Representative queries ---
+# One entry per filter shape (and optional sort key) a repository function sends to MongoDB.
+# `explain` fails if any of them is planned as a collection scan.
+QUERY_SHAPES = [
+    ("user_repo.find_one_by_id / update_one / delete_one", db.users_collection, {"UserID": 1}),
+    ("user_repo.find_users_by_ids", db.users_collection, {"UserID": {"$in": [1, 2, 3]}}),
+    ("user_repo.find_users (FirstName)", db.users_collection, user_repo.build_filter("alice", None, None)),
+    ("user_repo.find_users (LastName)", db.users_collection, user_repo.build_filter(None, "johnson", None)),
+    ("user_repo.find_users (FirstName + LastName)", db.users_collection, user_repo.build_filter("alice", "johnson", None)),
+    ("job_repo.find_job_by_id / update_one_job / delete_one_job", db.jobs_collection, {"jobId": 1}),
+    ("job_repo.find_jobs_by_ids", db.jobs_collection, {"jobId": {"$in": [1, 2, 3]}}),
+    ("job_repo.find_jobs (company)", db.jobs_collection, job_repo.build_job_filter("DataCorp", None, None)),
+    ("job_repo.find_jobs (location)", db.jobs_collection, job_repo.build_job_filter(None, "Austin, TX", None)),
+    ("job_repo.find_jobs (company + location)", db.jobs_collection, job_repo.build_job_filter("DataCorp", "Austin, TX", None)),
+    ("job_repo.find_jobs (title)", db.jobs_collection, job_repo.build_job_filter(None, None, "data scientist")),
+    ("job_repo.find_jobs_page (company)", db.jobs_collection, {"$and": [job_repo.build_job_filter("DataCorp", None, None), {"jobId": {"$gt": 1}}]}, "jobId"),
+    ("job_repo.find_jobs_page (location)", db.jobs_collection, {"$and": [job_repo.build_job_filter(None, "Austin, TX", None), {"jobId": {"$gt": 1}}]}, "jobId"),
+    ("application_repo.find_applications_page (by userId)", db.applications_collection, {"$and": [{"userId": 1}, {"appId": {"$gt": 1}}]}, "appId"),
+    ("application_repo.find_applications_page (by status)", db.applications_collection, {"$and": [{"status": "Applied"}, {"appId": {"$gt": 1}}]}, "appId"),
+    ("pagination.find_page (unfiltered users)", db.users_collection, {"UserID": {"$gt": 1}}, "UserID"),
+    ("application_repo.find_application_by_id", db.applications_collection, {"appId": 1}),
+    ("application_repo.find_applications (duplicate check in apply)", db.applications_collection, {"userId": 1, "jobId": 1}),
+    ("application_repo.find_applications (by userId)", db.applications_collection, {"userId": 1}),
+    ("application_repo.find_applications (by jobId)", db.applications_collection, {"jobId": 1}),
+    ("auth_resolvers login/register (by email)", db.accounts_collection, {"email": "alice@example.com"}),
+    ("auth_service.sync_revocations", db.revoked_tokens_collection, {"revokedAt": {"$gte": datetime(2024, 1, 1, tzinfo=timezone.utc)}}),
+    ("change_log_repo.find_changes", db.change_log_collection, {"kind": "jobs", "seq": {"$gt": 1}}, "seq"),
+]
+
+def _stages(plan: dict):
+    """Yields every stage name in an explain() plan tree."""
+    if not isinstance(plan, dict):
+        return
+    if "stage" in plan:
+        yield plan["stage"]
+    for key in ("inputStage", "queryPlan", "winningPlan"):
+        yield from _stages(plan.get(key))
+    for child in plan.get("inputStages", []) or []:
+        yield from _stages(child)
+
+def explain_queries() -> int:
+    """Explains every QUERY_SHAPES entry; returns the number that fall back to COLLSCAN."""
+    failures = 0
+    for label, collection_fn, query, *sort in QUERY_SHAPES:
+        cursor = collection_fn().find(query)
+        if sort:
+            cursor = cursor.sort(sort[0], 1)
+        explained = cursor.explain()
+        stages = list(_stages(explained.get("queryPlanner", {}).get("winningPlan", {})))
+        if "COLLSCAN" in stages:
+            failures += 1
+            print(f"FAIL  {label}: COLLSCAN for {query}")
+        else:
+            print(f"ok    {label}: {' <- '.join(stages)}")
+    return failures
+
+def reconcile(drop_unknown: bool) -> int:
+    report = db.reconcile_indexes(drop_unknown=drop_unknown)
+    for name in report["dropped"]:
+        print(f"dropped  {name}")
+    for name in report["created"]:
+        print(f"created  {name}")
+    for failure in report["failed"]:
+        print(f"FAILED   {failure}")
+    if not any(report.values()):
+        print("Indexes already match the registry.")
+    return len(report["failed"])
+
+def migrate() -> int:
+    print(f"Backfilled search fields on {job_repo.backfill_search_fields()} jobs.")
+    print(f"Backfilled search fields on {user_repo.backfill_search_fields()} users.")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile MongoDB indexes and check query plans.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("reconcile", help="Create/rebuild indexes declared in db.INDEXES")
+    rec.add_argument("--drop-unknown", action="store_true", help="Also drop indexes not in the registry")
+    sub.add_parser("migrate", help="Backfill normalized search fields on existing jobs and users")
+    sub.add_parser("explain", help="Fail if any repository query shape is planned as a COLLSCAN")
+    args = parser.parse_args()
+
+    if args.command == "reconcile":
+        failed = reconcile(args.drop_unknown)
+    elif args.command == "migrate":
+        failed = migrate()
+    else:
+        failed = explain_queries()
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import sys
+import os
+import argparse
+
+# Add the project root to the Python path to allow imports from `src`
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.backend.repository import job_repo, user_repo
+from src.backend.services.resume_parser_service import ingest_resumes, iter_resume_files
+
+def load_vocabulary(skills_file):
+    """Skills already used by jobs and users, plus one skill per line from `skills_file`."""
+    skills = job_repo.find_distinct_skills() + user_repo.find_distinct_skills()
+    if skills_file:
+        with open(skills_file, encoding="utf-8") as f:
+            skills.extend(line.strip() for line in f if line.strip())
+    return skills
+
+def print_progress(report):
+    rate = report["files"] / report["elapsed"] if report["elapsed"] else 0
+    print(f"  {report['files']:,} files, {report['modified']:,} profiles updated ({rate:,.0f} files/s)")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract skills, title and summary from resume files (.txt, .md, .pdf, .docx) into user profiles. "
+                    "Files are matched to users by a leading UserID in the file name (1042_cv.pdf), else by email."
+    )
+    parser.add_argument("directory", help="Directory to scan recursively for resumes")
+    parser.add_argument("--skills-file", help="Extra skill vocabulary, one skill per line")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Parser processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Profiles per bulk_write (default: 1000)")
+    parser.add_argument("--dry-run", action="store_true", help="Parse everything but write nothing")
+    args = parser.parse_args()
+
+    skills = load_vocabulary(args.skills_file)
+    print(f"Matching against {len(set(s.casefold() for s in skills)):,} skills with {args.workers} workers...")
+    report = ingest_resumes(
+        iter_resume_files(args.directory), skills,
+        workers=args.workers, batch_size=args.batch_size, dry_run=args.dry_run, progress=print_progress,
+    )
+    print("\n--- Resume ingestion complete ---")
+    print(f"-> {report['files']:,} files in {report['elapsed']:.1f}s")
+    print(f"-> {report['parsed']:,} parsed, {report['failed']:,} failed, {report['unmatched']:,} without a matching user")
+    print(f"-> {report['modified']:,} profiles updated{' (dry run, nothing written)' if args.dry_run else ''}")
+    for error in report["errors"]:
+        print(f"  FAILED {error}")
+    if report["modified"]:
+        print("Running API servers pick up the new skills on their next match; cached responses expire after RESPONSE_CACHE_TTL.")
+    sys.exit(1 if report["failed"] else 0)
+
+if __name__ == "__main__":
+    main()
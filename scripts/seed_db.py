@@ -1,6 +1,11 @@
 import sys
 import os
-from datetime import datetime
+import argparse
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import islice
 
 # Add the project root to the Python path to allow imports from `src`
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -8,7 +13,9 @@ sys.path.insert(0, project_root)
 
 # Now we can import our backend modules
 from src.backend import db
+from src.backend.repository import change_log_repo, job_repo, job_stats_repo, user_repo
 from src.backend.services import auth_service
+from src.backend.services.search_index_service import job_search_index
 
 # --- Sample Data ---
 
@@ -54,6 +61,13 @@ JOBS_DATA = [
     # ... more jobs if you like
 ]
 
+def reset_server_indexes():
+    """Makes running servers rebuild their in-memory indexes, which no longer describe the data."""
+    # A saved search index is stale too; the server rebuilds it on first search.
+    job_search_index.reset()
+    for kind in change_log_repo.KINDS:
+        change_log_repo.record_changes(kind, (), reset=True)
+
 def seed_database():
     """Wipes and reseeds the database with sample accounts, users, and jobs."""
     print("Connecting to the database...")
@@ -73,25 +87,26 @@ def seed_database():
 
     print("Seeding accounts...")
     accounts_to_insert = []
-    for account in ACCOUNTS_DATA:
-        hashed_password = auth_service.hash_password("password123")
+    # One bcrypt hash (with its own salt) per account, computed in parallel
+    hashed_passwords = auth_service.hash_passwords(["password123"] * len(ACCOUNTS_DATA))
+    for account, hashed_password in zip(ACCOUNTS_DATA, hashed_passwords):
         accounts_to_insert.append({
             "_id": account["_id"],
             "email": account["email"],
             "password": hashed_password,
             "role": account["role"],
-            "createdAt": datetime.utcnow()
+            "createdAt": SEED_EPOCH
         })
     if accounts_to_insert:
         accounts_col.insert_many(accounts_to_insert)
 
     print(f"Seeding {len(USERS_DATA)} user profiles...")
     if USERS_DATA:
-        users_col.insert_many(USERS_DATA)
+        users_col.insert_many([user_repo.with_search_fields(u) for u in USERS_DATA])
 
     print(f"Seeding {len(JOBS_DATA)} jobs...")
     if JOBS_DATA:
-        jobs_col.insert_many(JOBS_DATA)
+        jobs_col.insert_many([job_repo.with_search_fields(j) for j in JOBS_DATA])
 
     # Set counters to a value higher than our highest hardcoded ID
     print("Resetting counters...")
@@ -99,6 +114,13 @@ def seed_database():
     counters_col.update_one({"_id": "jobId"}, {"$set": {"sequence_value": 200}}, upsert=True)
     counters_col.update_one({"_id": "appId"}, {"$set": {"sequence_value": 0}}, upsert=True)
 
+    print("Reconciling indexes...")
+    db.reconcile_indexes()
+
+    print("Rebuilding job counters...")
+    job_stats_repo.rebuild_job_stats()
+    reset_server_indexes()
+
     print("\n--- Database Seeding Complete! ---")
     print(f"-> {accounts_col.count_documents({})} accounts created.")
     print(f"-> {users_col.count_documents({})} user profiles created.")
@@ -109,5 +131,250 @@ def seed_database():
     print("  - recruiter@corp.com (recruiter)")
     print("\nAll accounts have the password: 'password123'")
 
+# --- Synthetic data generator ---
+# `python scripts/seed_db.py generate --users 1000000 --jobs 500000 --applications 5000000`
+# Documents are produced lazily and written in insert_many batches, so memory
+# stays flat whatever the counts. The same --seed always yields the same data.
+
+# Skills ordered roughly by real-world popularity; draws follow a Zipf-like law over this rank.
+SKILL_VOCABULARY = [
+    "Python", "SQL", "JavaScript", "Git", "Java", "AWS", "Docker", "Linux", "React", "TypeScript",
+    "Excel", "HTML5", "CSS", "Node.js", "REST APIs", "Kubernetes", "C#", "PostgreSQL", "Agile", "Azure",
+    "Machine Learning", "Pandas", "C++", "MongoDB", "Go", "Spring", "Django", "Flask", "GCP", "Terraform",
+    "Data Analysis", "Tableau", "Power BI", "NumPy", "TensorFlow", "PyTorch", "Scikit-learn", "Spark", "Kafka", "Redis",
+    "GraphQL", "Angular", "Vue.js", "Redux", "Next.js", "PHP", "Ruby", "Rails", "Kotlin", "Swift",
+    "iOS", "Android", "Figma", "UX Research", "Jira", "Scrum", "CI/CD", "Jenkins", "GitHub Actions", "Ansible",
+    "Rust", "Scala", "Hadoop", "Airflow", "dbt", "Snowflake", "BigQuery", "Statistics", "R", "Deep Learning",
+    "NLP", "Computer Vision", "LLMs", "MLOps", "Elasticsearch", "RabbitMQ", "Microservices", "System Design", "Security", "Networking",
+    "Big Data", "ETL", "Data Modeling", "Product Management", "Technical Writing", "Selenium", "Cypress", "Jest", "Pytest", "Unity",
+    "Embedded C", "FPGA", "Salesforce", "SAP", "Solidity", "Prometheus", "Grafana", "Nginx", "Bash", "MySQL",
+]
+
+# Role families: title and the skills its people and postings concentrate on.
+ROLE_FAMILIES = [
+    ("Backend Engineer", ["Python", "Java", "Go", "SQL", "PostgreSQL", "Docker", "REST APIs", "Microservices", "Redis", "Kafka", "Django", "Flask", "Spring"]),
+    ("Frontend Developer", ["JavaScript", "TypeScript", "React", "HTML5", "CSS", "Redux", "Next.js", "Vue.js", "Angular", "Jest", "Figma"]),
+    ("Full Stack Developer", ["JavaScript", "TypeScript", "React", "Node.js", "SQL", "MongoDB", "Docker", "GraphQL", "REST APIs"]),
+    ("Data Scientist", ["Python", "SQL", "Pandas", "NumPy", "Machine Learning", "Scikit-learn", "Statistics", "R", "Deep Learning", "PyTorch"]),
+    ("Data Engineer", ["Python", "SQL", "Spark", "Airflow", "Kafka", "dbt", "Snowflake", "BigQuery", "ETL", "Data Modeling", "Hadoop"]),
+    ("DevOps Engineer", ["Linux", "Docker", "Kubernetes", "Terraform", "AWS", "CI/CD", "Ansible", "Prometheus", "Grafana", "Bash", "Nginx"]),
+    ("Mobile Developer", ["Swift", "iOS", "Kotlin", "Android", "Java", "REST APIs", "Git", "Figma"]),
+    ("Machine Learning Engineer", ["Python", "PyTorch", "TensorFlow", "MLOps", "Deep Learning", "NLP", "Computer Vision", "LLMs", "Docker", "Kubernetes"]),
+    ("Data Analyst", ["SQL", "Excel", "Tableau", "Power BI", "Data Analysis", "Python", "Statistics"]),
+    ("QA Engineer", ["Selenium", "Cypress", "Pytest", "Jest", "Python", "JavaScript", "CI/CD", "Jira"]),
+    ("Product Manager", ["Product Management", "Agile", "Scrum", "Jira", "UX Research", "Data Analysis", "Technical Writing"]),
+    ("Security Engineer", ["Security", "Networking", "Linux", "Python", "AWS", "Bash", "Kubernetes"]),
+]
+ROLE_WEIGHTS = [18, 14, 12, 9, 8, 8, 6, 6, 7, 5, 4, 3]
+SENIORITY = ["Junior", "", "", "Senior", "Senior", "Lead", "Staff", "Principal"]
+
+FIRST_NAMES = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+               "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Wei", "Priya",
+               "Carlos", "Fatima", "Hiroshi", "Olga", "Ahmed", "Ana", "Luca", "Amara", "Noah", "Emma"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+              "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+              "Lee", "Chen", "Patel", "Kim", "Nguyen", "Singh", "Ivanova", "Rossi", "Okafor", "Tanaka"]
+LOCATIONS = ["San Francisco, CA", "New York, NY", "Austin, TX", "Seattle, WA", "Boston, MA", "Chicago, IL",
+             "Denver, CO", "Atlanta, GA", "Los Angeles, CA", "Remote", "Toronto, ON", "London, UK",
+             "Berlin, DE", "Bangalore, IN", "Miami, FL", "Portland, OR"]
+LOCATION_WEIGHTS = [12, 14, 9, 9, 7, 7, 5, 5, 8, 15, 4, 4, 3, 3, 3, 2]
+COMPANY_PREFIXES = ["Innovate", "Data", "Cloud", "Quantum", "Blue", "Bright", "Nova", "Apex", "Green", "Iron",
+                    "Silver", "Pixel", "Core", "Hyper", "Vertex", "Summit", "North", "Open", "Smart", "Rapid"]
+COMPANY_SUFFIXES = ["Corp", "Inc.", "Labs", "Systems", "Solutions", "Technologies", "Works", "Analytics", "Networks", "Group"]
+APPLICATION_STATUSES = ["Applied", "Reviewed", "Interviewing", "Offered", "Rejected"]
+APPLICATION_STATUS_WEIGHTS = [55, 20, 12, 3, 10]
+
+# Generated IDs start above the hand-written sample data.
+GENERATED_ID_OFFSET = 1000
+# Every seeded timestamp is relative to this, so the same --seed always gives the same documents.
+SEED_EPOCH = datetime(2025, 1, 1)
+ZIPF_EXPONENT = 1.1
+
+def batched(iterable, size):
+    it = iter(iterable)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+def _cumulative(weights):
+    total, out = 0.0, []
+    for w in weights:
+        total += w
+        out.append(total)
+    return out
+
+class SkillSampler:
+    """Draws skill sets: mostly from a role family, topped up from the global Zipf popularity curve."""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.global_cum = _cumulative([1.0 / (rank + 1) ** ZIPF_EXPONENT for rank in range(len(SKILL_VOCABULARY))])
+        rank = {skill: i for i, skill in enumerate(SKILL_VOCABULARY)}
+        self.family_cum = [
+            _cumulative([1.0 / (rank[s] + 1) ** ZIPF_EXPONENT for s in skills]) for _, skills in ROLE_FAMILIES
+        ]
+
+    def draw(self, family: int, low: int, high: int) -> list:
+        rng = self.rng
+        k = rng.randint(low, high)
+        skills = ROLE_FAMILIES[family][1]
+        picked = dict.fromkeys(rng.choices(skills, cum_weights=self.family_cum[family], k=k))
+        while len(picked) < k:
+            picked[rng.choices(SKILL_VOCABULARY, cum_weights=self.global_cum)[0]] = None
+        return list(picked)
+
+def _coprime_step(n: int, rng: random.Random) -> int:
+    step = max(1, int(n * 0.6180339887) + rng.randrange(max(1, n // 100 or 1)))
+    while math.gcd(step, n) != 1:
+        step += 1
+    return step
+
+def generate_users(count: int, rng: random.Random, sampler: SkillSampler):
+    role_cum = _cumulative(ROLE_WEIGHTS)
+    start = datetime(1960, 1, 1)
+    for i in range(count):
+        family = rng.choices(range(len(ROLE_FAMILIES)), cum_weights=role_cum)[0]
+        seniority = rng.choice(SENIORITY)
+        yield user_repo.with_search_fields({
+            "UserID": GENERATED_ID_OFFSET + i + 1,
+            "FirstName": rng.choice(FIRST_NAMES),
+            "LastName": rng.choice(LAST_NAMES),
+            "DateOfBirth": (start + timedelta(days=rng.randrange(45 * 365))).strftime("%Y-%m-%d"),
+            "ProfessionalTitle": f"{seniority} {ROLE_FAMILIES[family][0]}".strip(),
+            "skills": sampler.draw(family, 3, 10),
+        })
+
+def generate_jobs(count: int, rng: random.Random, sampler: SkillSampler, recruiter_ids: list):
+    role_cum = _cumulative(ROLE_WEIGHTS)
+    location_cum = _cumulative(LOCATION_WEIGHTS)
+    companies = [f"{p} {s}" for p in COMPANY_PREFIXES for s in COMPANY_SUFFIXES]
+    # A few large employers post most of the jobs.
+    company_cum = _cumulative([1.0 / (rank + 1) ** ZIPF_EXPONENT for rank in range(len(companies))])
+    for i in range(count):
+        family = rng.choices(range(len(ROLE_FAMILIES)), cum_weights=role_cum)[0]
+        seniority = rng.choice(SENIORITY)
+        yield job_repo.with_search_fields({
+            "jobId": GENERATED_ID_OFFSET + i + 1,
+            "title": f"{seniority} {ROLE_FAMILIES[family][0]}".strip(),
+            "company": rng.choices(companies, cum_weights=company_cum)[0],
+            "location": rng.choices(LOCATIONS, cum_weights=location_cum)[0],
+            "salaryRange": f"${(s := rng.randrange(60, 200, 5))}k - ${s + rng.randrange(10, 60, 5)}k",
+            "skillsRequired": sampler.draw(family, 3, 6),
+            "description": f"Join our team as a {ROLE_FAMILIES[family][0]}.",
+            "postedAt": (SEED_EPOCH - timedelta(days=rng.randrange(365))).strftime("%Y-%m-%d"),
+            "recruiterId": rng.choice(recruiter_ids),
+        })
+
+def generate_applications(count: int, users: int, jobs: int, rng: random.Random):
+    """
+    Unique (userId, jobId) pairs without remembering any: walks the users x jobs
+    grid with a step coprime to its size, which visits each cell at most once.
+    """
+    if count == 0:
+        return  # also covers an empty grid (--users 0 or --jobs 0), where randrange would fail
+    space = users * jobs
+    step = _coprime_step(space, rng)
+    offset = rng.randrange(space)
+    status_cum = _cumulative(APPLICATION_STATUS_WEIGHTS)
+    for i in range(count):
+        cell = (offset + i * step) % space
+        yield {
+            "appId": i + 1,
+            "userId": GENERATED_ID_OFFSET + cell // jobs + 1,
+            "jobId": GENERATED_ID_OFFSET + cell % jobs + 1,
+            "status": rng.choices(APPLICATION_STATUSES, cum_weights=status_cum)[0],
+            "submittedAt": (SEED_EPOCH - timedelta(seconds=rng.randrange(180 * 86400))).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        }
+
+def generate_accounts(count: int, users: int, hashed_password: bytes):
+    """Login accounts for the first `count` generated users; they share one precomputed hash."""
+    for i in range(min(count, users)):
+        user_id = GENERATED_ID_OFFSET + i + 1
+        yield {"_id": user_id, "email": f"user{user_id}@example.com", "password": hashed_password,
+               "role": "user", "createdAt": SEED_EPOCH}
+
+def _insert_stream(label: str, col, docs, total: int, batch_size: int) -> None:
+    started, done = time.time(), 0
+    for batch in batched(docs, batch_size):
+        col.insert_many(batch, ordered=False)
+        done += len(batch)
+        if done % (batch_size * 20) < batch_size or done == total:
+            rate = done / max(time.time() - started, 1e-9)
+            print(f"  {label}: {done:,}/{total:,} ({rate:,.0f} docs/s)")
+
+def generate_database(users: int, jobs: int, applications: int, accounts: int, seed: int, batch_size: int):
+    if applications > users * jobs:
+        raise ValueError("--applications cannot exceed users x jobs (each pair applies at most once).")
+    rng = random.Random(seed)
+    sampler = SkillSampler(rng)
+
+    # Dropping is much faster than delete_many on a previously generated data set.
+    for col in (db.users_collection(), db.jobs_collection(), db.applications_collection(), db.accounts_collection()):
+        col.drop()
+    # Start from the sample data so the demo logins keep working.
+    seed_database()
+
+    print(f"\nGenerating {users:,} users, {jobs:,} jobs, {applications:,} applications (seed {seed})...")
+    # Bulk loads are much faster without secondary indexes; they are rebuilt at the end.
+    for col in (db.users_collection(), db.jobs_collection(), db.applications_collection(), db.accounts_collection()):
+        col.drop_indexes()
+
+    recruiter_ids = [a["_id"] for a in ACCOUNTS_DATA if a["role"] == "recruiter"]
+    _insert_stream("users", db.users_collection(), generate_users(users, rng, sampler), users, batch_size)
+    _insert_stream("jobs", db.jobs_collection(), generate_jobs(jobs, rng, sampler, recruiter_ids), jobs, batch_size)
+    _insert_stream("applications", db.applications_collection(), generate_applications(applications, users, jobs, rng), applications, batch_size)
+    if accounts:
+        hashed = auth_service.hash_password("password123")
+        _insert_stream("accounts", db.accounts_collection(), generate_accounts(accounts, users, hashed), min(accounts, users), batch_size)
+
+    print("Resetting counters to the generated ranges...")
+    counters_col = db.counters_collection()
+    counters_col.update_one({"_id": "UserID"}, {"$set": {"sequence_value": GENERATED_ID_OFFSET + users}}, upsert=True)
+    counters_col.update_one({"_id": "jobId"}, {"$set": {"sequence_value": GENERATED_ID_OFFSET + jobs}}, upsert=True)
+    counters_col.update_one({"_id": "appId"}, {"$set": {"sequence_value": applications}}, upsert=True)
+
+    print("Rebuilding indexes...")
+    report = db.reconcile_indexes()
+    for failure in report["failed"]:
+        print(f"  FAILED {failure}")
+    print("Rebuilding job counters...")
+    job_stats_repo.rebuild_job_stats()
+    reset_server_indexes()
+    print("\n--- Synthetic data generated ---")
+    if accounts:
+        print(f"Generated accounts are user{GENERATED_ID_OFFSET + 1}@example.com ... with password 'password123'")
+
+def _count(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {number}")
+    return number
+
+def _positive(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be 1 or more, got {number}")
+    return number
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the job portal database.")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("sample", help="Insert the small hand-written sample data set (default)")
+    gen = sub.add_parser("generate", help="Insert sample data plus a large synthetic data set")
+    gen.add_argument("--users", type=_count, default=10000)
+    gen.add_argument("--jobs", type=_count, default=5000)
+    gen.add_argument("--applications", type=_count, default=50000)
+    gen.add_argument("--accounts", type=_count, default=1000, help="Login accounts for the first N generated users")
+    gen.add_argument("--seed", type=int, default=42, help="Random seed; the same seed yields the same data")
+    gen.add_argument("--batch-size", type=_positive, default=5000)
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        generate_database(args.users, args.jobs, args.applications, args.accounts, args.seed, args.batch_size)
+    else:
+        seed_database()
+
 if __name__ == "__main__":
-    seed_database()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,105 @@
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Stand-in for Ollama's /api/generate, for exercising the LLM client and /nl2gql
+# without a model. Point the backend at it with OLLAMA_HOST=http://localhost:11435.
+
+DEFAULT_RESPONSE = "```graphql\nquery { jobs { jobId title company location } }\n```"
+
+class StubOllamaServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, delay: float, response: str, chunks: int):
+        super().__init__(address, StubOllamaHandler)
+        self.delay = delay
+        self.response = response
+        self.chunks = max(1, chunks)
+        self.lock = threading.Lock()
+        self.requests = 0   # generations served
+        self.active = 0     # generations running now
+        self.peak = 0       # most generations running at once
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is observable
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        if self.path != "/api/generate":
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self.send_error(400)
+            return
+
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            if body.get("stream", True):
+                self._stream(server)
+            else:
+                time.sleep(server.delay)
+                self._send_json({"model": body.get("model"), "response": server.response, "done": True})
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _send_json(self, payload: dict):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, server):
+        # NDJSON chunks spread over `delay`, like Ollama's stream=True mode.
+        text = server.response
+        size = -(-len(text) // server.chunks)
+        parts = [text[i:i + size] for i in range(0, len(text), size)]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for part in parts + [""]:
+            time.sleep(server.delay / (len(parts) + 1))
+            line = json.dumps({"response": part, "done": part == ""}).encode("utf-8") + b"\n"
+            self.wfile.write(f"{len(line):x}\r\n".encode("ascii") + line + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+def start_stub_server(port: int = 0, delay: float = 0.5, response: str = DEFAULT_RESPONSE, chunks: int = 8) -> StubOllamaServer:
+    """Starts the stub on a background thread and returns it; port 0 picks a free port."""
+    server = StubOllamaServer(("127.0.0.1", port), delay, response, chunks)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake Ollama /api/generate endpoint.")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--delay", type=float, default=0.5, help="Seconds each generation takes")
+    parser.add_argument("--response", default=DEFAULT_RESPONSE, help="Text every generation returns")
+    parser.add_argument("--chunks", type=int, default=8, help="Number of chunks in stream mode")
+    args = parser.parse_args()
+
+    server = StubOllamaServer(("127.0.0.1", args.port), args.delay, args.response, args.chunks)
+    print(f"Stub Ollama listening on http://127.0.0.1:{args.port}/api/generate (delay {args.delay}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Served {server.requests} generations, peak concurrency {server.peak}.")
+
+if __name__ == "__main__":
+    main()
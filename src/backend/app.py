@@ -1,11 +1,12 @@
+import json
 import os
 import sys
 # Add project root (src/) to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from flask import Flask, jsonify, request, g
+from flask import Flask, Response, jsonify, request, g, stream_with_context
 from flask_cors import CORS
-from ariadne import load_schema_from_path, make_executable_schema, graphql_sync
+from ariadne import graphql_sync
 from ariadne.explorer import ExplorerGraphiQL
 from dotenv import load_dotenv
 from werkzeug.exceptions import HTTPException
@@ -18,19 +19,32 @@ load_dotenv(os.path.join(os.path.dirname(__file__), '../../config/.env'))
 from src.backend.errors import (
     handle_http_exception, handle_value_error, handle_generic_exception, json_error
 )
-from src.backend.services.nl2gql_service import process_nl2gql_request
-from src.backend.resolvers.user_resolvers import query as user_query, mutation as user_mutation
-from src.backend.resolvers.job_resolvers import query as job_query, mutation as job_mutation
-from src.backend.resolvers.application_resolvers import query as app_query, mutation as app_mutation, application as application_object
-from src.backend.resolvers.auth_resolvers import mutation as auth_mutation
-from src.backend.resolvers.recommendation_resolvers import query as recommendation_query
-from src.backend.db import ensure_user_counter, ensure_job_counter, ensure_application_counter
+from src.backend.services.nl2gql_service import process_nl2gql_request, stream_nl2gql_request
+from src.backend.services.response_cache_service import response_cache, encode_result, etag_matches
+from src.backend.graphql_schema import schema, llm_schema_path
+from src.backend.dataloaders import build_loaders
+from src.backend.document_cache import DocumentCache, PersistedQueryError
+from src.backend.query_limits import validation_rules
+from src.backend.db import ensure_user_counter, ensure_job_counter, ensure_application_counter, ensure_indexes
+from src.backend.repository.job_stats_repo import ensure_job_stats
+from src.backend import metrics
 
 # --- Flask app setup ---
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=["ETag"])
 explorer_html = ExplorerGraphiQL().html(None)
 
+# --- Instrumentation ---
+@app.before_request
+def start_request_trace():
+    g.trace = metrics.start_trace(request.method, request.path)
+
+@app.after_request
+def finish_request_trace(response):
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    metrics.finish_trace(g.get("trace"), route, response.status_code)
+    return response
+
 # --- Authentication Middleware (RE-ENABLED) ---
 @app.before_request
 def authenticate_request():
@@ -43,22 +57,62 @@ def authenticate_request():
         token = auth_header.split(" ")[1]
         g.user = auth_service.verify_token(token)
 
-# --- Load and build GraphQL schema ---
-schema_path = os.path.join(os.path.dirname(__file__), "schema.graphql")
-type_defs = load_schema_from_path(schema_path)
+def graphql_context():
+    """Builds the per-request GraphQL context, including fresh batch loaders."""
+    return {"request": request, "user": g.user, "loaders": build_loaders()}
+
+# Parsed/validated documents and automatic persisted queries, keyed by query hash
+document_cache = DocumentCache(maxsize=int(os.getenv("GRAPHQL_DOCUMENT_CACHE_SIZE", "512")))
+
+def execute_graphql(data, require_query=False):
+    """Runs an operation against `schema`, reusing cached parse and validation results."""
+    return graphql_sync(
+        schema, data,
+        context_value=graphql_context(),
+        query_parser=document_cache.parse_query,
+        query_validator=document_cache.validate,
+        validation_rules=validation_rules,
+        require_query=require_query,
+        extensions=[metrics.MetricsExtension],
+        debug=app.debug,
+    )
 
-schema = make_executable_schema(
-    type_defs,
-    [user_query, job_query, app_query, recommendation_query],
-    [user_mutation, job_mutation, app_mutation, auth_mutation],
-    application_object
-)
+def graphql_response(data, require_query=False):
+    """
+    Executes `data` and builds the /graphql response. Cacheable reads are served
+    from the response cache and carry an ETag, so a matching If-None-Match costs a 304.
+    """
+    plan = response_cache.plan(data, g.user)
+    if plan is None:
+        success, result = execute_graphql(data, require_query)
+        return jsonify(result), (200 if success else 400)
+
+    entry = response_cache.get(plan)
+    if entry is None:
+        success, result = execute_graphql(data, require_query)
+        if not success or result.get("errors"):
+            return jsonify(result), (200 if success else 400)
+        entry = response_cache.put(plan, encode_result(result))
+
+    if etag_matches(request.headers.get("If-None-Match"), entry.etag):
+        return Response(status=304, headers=entry.headers())
+    return Response(entry.body, status=200, headers=entry.headers(), mimetype="application/json")
 
 # Initialize database counters
 ensure_user_counter()
 ensure_job_counter()
 ensure_application_counter()
 
+# Create any MongoDB indexes from the registry in db.py that are missing
+index_report = ensure_indexes()
+for failure in index_report["failed"]:
+    print(f"⚠️  Could not build index {failure}")
+for name in index_report["mismatched"]:
+    print(f"⚠️  Index {name} differs from the registry; run scripts/manage_indexes.py reconcile")
+
+# Build the materialized job counters if this database predates them
+ensure_job_stats()
+
 # --- Error Handlers ---
 @app.errorhandler(404)
 def not_found(e):
@@ -79,7 +133,16 @@ def unhandled_exception(e):
 # --- API Endpoints ---
 @app.route("/graphql", methods=["GET"])
 def graphql_explorer():
-    return explorer_html, 200
+    # GET with ?query= runs a read-only operation, so browsers and proxies can revalidate it by ETag.
+    if "query" not in request.args:
+        return explorer_html, 200
+    try:
+        variables = json.loads(request.args["variables"]) if request.args.get("variables") else None
+    except ValueError:
+        payload, status = json_error("'variables' must be JSON", 400)
+        return jsonify(payload), status
+    data = {"query": request.args["query"], "variables": variables, "operationName": request.args.get("operationName") or None}
+    return graphql_response(data, require_query=True)
 
 @app.route("/graphql", methods=["POST"])
 def graphql_server():
@@ -88,39 +151,66 @@ def graphql_server():
         payload, status = json_error("Body must be JSON with 'query' and optional 'variables'", 400)
         return jsonify(payload), status
     
-    success, result = graphql_sync(schema, data, context_value={"request": request, "user": g.user}, debug=app.debug)
-    return jsonify(result), (200 if success else 400)
+    try:
+        data = document_cache.resolve_persisted_query(data)
+    except PersistedQueryError as e:
+        # Per the APQ protocol a miss is a normal GraphQL error; the client retries with the full query.
+        return jsonify({"errors": [e.to_dict()]}), 200
+
+    return graphql_response(data)
+
+@app.route("/metrics")
+def prometheus_metrics():
+    return Response(metrics.render_metrics(), content_type=metrics.PROMETHEUS_CONTENT_TYPE)
 
 @app.route("/")
 def health():
     return jsonify({"status": "Backend is running!"}), 200
 
-@app.route("/nl2gql", methods=["POST"])
-def nl2gql():
+def read_nl2gql_request():
+    """Returns (user_text, schema_sdl, run_graphql, None), or an error response as the last item."""
     data = request.get_json(silent=True) or {}
     user_text = data.get("query", "")
     run_graphql = request.args.get("run", "true").lower() != "false"
 
     if not user_text.strip():
         payload, status = json_error("Missing 'query' in body", 400)
-        return jsonify(payload), status
+        return None, None, None, (jsonify(payload), status)
 
-    schema_for_llm_path = os.path.join(os.path.dirname(__file__), "schema_for_llm.graphql")
     try:
-        with open(schema_for_llm_path, "r", encoding="utf-8") as f:
+        with open(llm_schema_path, "r", encoding="utf-8") as f:
             schema_sdl = f.read()
     except Exception as e:
         payload, status = json_error(f"Failed to read LLM schema file: {e}", 500)
-        return jsonify(payload), status
+        return None, None, None, (jsonify(payload), status)
+    return user_text, schema_sdl, run_graphql, None
 
-    def execute_graphql_query(gql_data):
-        return graphql_sync(schema, gql_data, context_value={"request": request, "user": g.user}, debug=app.debug)
+@app.route("/nl2gql", methods=["POST"])
+def nl2gql():
+    user_text, schema_sdl, run_graphql, error = read_nl2gql_request()
+    if error:
+        return error
 
     payload, status_code = process_nl2gql_request(
-        user_text, schema_sdl, run_graphql, execute_graphql_query, g.user
+        user_text, schema_sdl, run_graphql, execute_graphql, g.user
     )
     return jsonify(payload), status_code
 
+@app.route("/nl2gql/stream", methods=["POST"])
+def nl2gql_stream():
+    """Same as /nl2gql, but streams generated tokens and then the result as Server-Sent Events."""
+    user_text, schema_sdl, run_graphql, error = read_nl2gql_request()
+    if error:
+        return error
+
+    events = stream_nl2gql_request(user_text, schema_sdl, run_graphql, execute_graphql, g.user)
+    return Response(
+        stream_with_context(events),
+        mimetype="text/event-stream",
+        # Stop reverse proxies from buffering the stream.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 if __name__ == "__main__":
     print("🚀 Starting Flask server on http://localhost:8000 ...")
     app.run(host="0.0.0.0", port=8000, debug=True)
\ No newline at end of file
@@ -0,0 +1,239 @@
+# asgi.py
+# Async entry point: uvicorn src.backend.asgi:app --port 8000
+# The Flask app in app.py remains the default; both serve the same schema.
+import asyncio
+import contextlib
+import inspect
+import os
+import sys
+# Add project root (src/) to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from dotenv import load_dotenv
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+from ariadne import graphql
+from ariadne.asgi import GraphQL
+from ariadne.asgi.handlers import GraphQLHTTPHandler
+
+# Load environment variables
+load_dotenv(os.path.join(os.path.dirname(__file__), '../../config/.env'))
+
+from src.backend import metrics
+from src.backend.errors import json_error
+from src.backend.services import auth_service
+from src.backend.services.nl2gql_service import process_nl2gql_request_async, stream_nl2gql_request_async
+from src.backend.services.response_cache_service import response_cache, encode_result, etag_matches
+from src.backend.graphql_schema import build_schema, llm_schema_path
+from src.backend.resolvers.async_resolvers import query as async_query, application as async_application
+from src.backend.dataloaders import build_async_loaders
+from src.backend.document_cache import DocumentCache, PersistedQueryError
+from src.backend.query_limits import validation_rules
+from src.backend.db import ensure_user_counter, ensure_job_counter, ensure_application_counter, ensure_indexes
+from src.backend.repository.job_stats_repo import ensure_job_stats
+
+DEBUG = os.getenv("ASGI_DEBUG", "false").lower() == "true"
+
+# Same type definitions and resolvers as the Flask app, with async overrides for the read paths.
+schema = build_schema(async_query, async_application)
+document_cache = DocumentCache(maxsize=int(os.getenv("GRAPHQL_DOCUMENT_CACHE_SIZE", "512")))
+
+_ROOT_TYPES = ("Query", "Mutation")
+
+def offload_sync_root_resolvers(resolver, obj, info, **kwargs):
+    """
+    GraphQL middleware: root resolvers that are still synchronous (mutations,
+    recommendations, auth) do blocking pymongo/bcrypt work, so run them in a
+    worker thread instead of on the event loop. Nested fields run inline.
+    """
+    if info.parent_type.name in _ROOT_TYPES and not inspect.iscoroutinefunction(resolver):
+        return asyncio.to_thread(resolver, obj, info, **kwargs)
+    return resolver(obj, info, **kwargs)
+
+def _user_from_request(request):
+    auth_header = request.headers.get("Authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        return auth_service.verify_token(auth_header.split(" ")[1])
+    return None
+
+async def get_context_value(request, data=None):
+    """Per-request GraphQL context, mirroring graphql_context() in app.py."""
+    return {"request": request, "user": _user_from_request(request), "async_loaders": build_async_loaders()}
+
+class PersistedQueryHTTPHandler(GraphQLHTTPHandler):
+    """
+    Applies the automatic-persisted-queries protocol before executing, and
+    serves cacheable reads from the response cache with an ETag, as app.py does.
+    """
+
+    async def execute_graphql_query(self, request, data, *, context_value=None, query_document=None):
+        if isinstance(data, dict):
+            try:
+                data = document_cache.resolve_persisted_query(data)
+            except PersistedQueryError as e:
+                return True, {"errors": [e.to_dict()]}
+            plan = response_cache.plan(data, _user_from_request(request))
+            request.state.response_plan = plan
+            if plan is not None:
+                request.state.cached_response = await asyncio.to_thread(response_cache.get, plan)
+                if request.state.cached_response is not None:
+                    return True, {}
+        return await super().execute_graphql_query(
+            request, data, context_value=context_value, query_document=query_document
+        )
+
+    async def create_json_response(self, request, result, success):
+        plan = getattr(request.state, "response_plan", None)
+        entry = getattr(request.state, "cached_response", None)
+        if plan is None or (entry is None and (not success or result.get("errors"))):
+            return await super().create_json_response(request, result, success)
+        if entry is None:
+            entry = await asyncio.to_thread(response_cache.put, plan, encode_result(result))
+        if etag_matches(request.headers.get("If-None-Match"), entry.etag):
+            return Response(status_code=304, headers=entry.headers())
+        return Response(entry.body, headers=entry.headers(), media_type="application/json")
+
+graphql_app = GraphQL(
+    schema,
+    context_value=get_context_value,
+    query_parser=document_cache.parse_query,
+    query_validator=document_cache.validate,
+    validation_rules=validation_rules,
+    debug=DEBUG,
+    http_handler=PersistedQueryHTTPHandler(
+        extensions=[metrics.MetricsExtension],
+        middleware=[offload_sync_root_resolvers],
+    ),
+)
+
+async def execute_graphql(request, data):
+    return await graphql(
+        schema, data,
+        context_value=await get_context_value(request),
+        query_parser=document_cache.parse_query,
+        query_validator=document_cache.validate,
+        validation_rules=validation_rules,
+        middleware=[offload_sync_root_resolvers],
+        extensions=[metrics.MetricsExtension],
+        debug=DEBUG,
+    )
+
+# --- API Endpoints ---
+async def health(request):
+    return JSONResponse({"status": "Backend is running!"}, status_code=200)
+
+async def metrics_endpoint(request):
+    return Response(metrics.render_metrics(), media_type=metrics.PROMETHEUS_CONTENT_TYPE)
+
+async def read_nl2gql_request(request):
+    """Returns (user_text, schema_sdl, run_graphql, None), or an error response as the last item."""
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    data = data if isinstance(data, dict) else {}
+    user_text = data.get("query", "")
+    run_graphql = request.query_params.get("run", "true").lower() != "false"
+
+    if not user_text.strip():
+        payload, status = json_error("Missing 'query' in body", 400)
+        return None, None, None, JSONResponse(payload, status_code=status)
+
+    try:
+        with open(llm_schema_path, "r", encoding="utf-8") as f:
+            schema_sdl = f.read()
+    except Exception as e:
+        payload, status = json_error(f"Failed to read LLM schema file: {e}", 500)
+        return None, None, None, JSONResponse(payload, status_code=status)
+    return user_text, schema_sdl, run_graphql, None
+
+async def nl2gql(request):
+    user_text, schema_sdl, run_graphql, error = await read_nl2gql_request(request)
+    if error:
+        return error
+
+    async def execute_graphql_query(gql_data):
+        return await execute_graphql(request, gql_data)
+
+    payload, status_code = await process_nl2gql_request_async(
+        user_text, schema_sdl, run_graphql, execute_graphql_query, _user_from_request(request)
+    )
+    return JSONResponse(payload, status_code=status_code)
+
+async def nl2gql_stream(request):
+    """Same as /nl2gql, but streams generated tokens and then the result as Server-Sent Events."""
+    user_text, schema_sdl, run_graphql, error = await read_nl2gql_request(request)
+    if error:
+        return error
+
+    async def execute_graphql_query(gql_data):
+        return await execute_graphql(request, gql_data)
+
+    events = stream_nl2gql_request_async(
+        user_text, schema_sdl, run_graphql, execute_graphql_query, _user_from_request(request)
+    )
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def init_db():
+    # Same initialization as the Flask app
+    ensure_user_counter()
+    ensure_job_counter()
+    ensure_application_counter()
+    index_report = ensure_indexes()
+    for failure in index_report["failed"]:
+        print(f"⚠️  Could not build index {failure}")
+    for name in index_report["mismatched"]:
+        print(f"⚠️  Index {name} differs from the registry; run scripts/manage_indexes.py reconcile")
+    ensure_job_stats()
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    await asyncio.to_thread(init_db)
+    yield
+
+routes = [
+    Route("/", health, methods=["GET"]),
+    Route("/graphql", graphql_app.handle_request, methods=["GET", "POST", "OPTIONS"]),
+    Route("/nl2gql", nl2gql, methods=["POST"]),
+    Route("/nl2gql/stream", nl2gql_stream, methods=["POST"]),
+    Route("/metrics", metrics_endpoint, methods=["GET"]),
+]
+_route_paths = {route.path for route in routes}
+
+class RequestMetricsMiddleware(BaseHTTPMiddleware):
+    """Starts the request trace and records the HTTP histogram, as the Flask before/after_request hooks do."""
+
+    async def dispatch(self, request, call_next):
+        trace = metrics.start_trace(request.method, request.url.path)
+        route = request.url.path if request.url.path in _route_paths else "unmatched"
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            # For streamed responses this measures time to the first byte.
+            metrics.finish_trace(trace, route, status)
+
+app = Starlette(
+    debug=DEBUG,
+    routes=routes,
+    middleware=[
+        Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"], expose_headers=["ETag"]),
+        Middleware(RequestMetricsMiddleware),
+    ],
+    lifespan=lifespan,
+)
+
+if __name__ == "__main__":
+    import uvicorn
+    print("🚀 Starting ASGI server on http://localhost:8000 ...")
+    uvicorn.run(app, host="0.0.0.0", port=8000)
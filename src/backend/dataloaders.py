@@ -0,0 +1,138 @@
+# dataloaders.py
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from .repository import user_repo, job_repo, async_user_repo, async_job_repo
+
+
+class BatchLoader:
+    """
+    Request-scoped batching loader.
+
+    Keys are queued as soon as a list resolver knows its rows; the first
+    `load` then fetches every queued key with a single batch call, and the
+    results are cached for the rest of the request. Nested fields on a list
+    therefore cost one round trip per collection instead of one per row.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[int]], Dict[int, dict]]):
+        self._batch_fn = batch_fn
+        self._cache: Dict[int, Optional[dict]] = {}
+        self._pending: Dict[int, None] = {}
+
+    def queue(self, keys: Iterable[Any]) -> None:
+        """Schedules keys for the next batch without fetching anything yet."""
+        for key in keys:
+            if key is None:
+                continue
+            key = int(key)
+            if key not in self._cache:
+                self._pending[key] = None
+
+    def _dispatch(self) -> None:
+        keys = list(self._pending)
+        self._pending.clear()
+        if not keys:
+            return
+        found = self._batch_fn(keys)
+        for key in keys:
+            self._cache[key] = found.get(key)
+
+    def load(self, key: Any) -> Optional[dict]:
+        """Returns the document for `key`, batching it with everything queued so far."""
+        key = int(key)
+        if key not in self._cache:
+            self._pending[key] = None
+            self._dispatch()
+        return self._cache.get(key)
+
+    def load_many(self, keys: Iterable[Any]) -> List[Optional[dict]]:
+        keys = [int(k) for k in keys]
+        self.queue(keys)
+        self._dispatch()
+        return [self._cache.get(k) for k in keys]
+
+
+def _load_users(user_ids: List[int]) -> Dict[int, dict]:
+    return {int(u["UserID"]): u for u in user_repo.find_users_by_ids(user_ids)}
+
+def _load_jobs(job_ids: List[int]) -> Dict[int, dict]:
+    return {int(j["jobId"]): j for j in job_repo.find_jobs_by_ids(job_ids)}
+
+
+def build_loaders() -> Dict[str, BatchLoader]:
+    """Creates a fresh set of loaders; call once per GraphQL request."""
+    return {
+        "users": BatchLoader(_load_users),
+        "jobs": BatchLoader(_load_jobs),
+    }
+
+def get_loaders(context: dict) -> Dict[str, BatchLoader]:
+    """Returns the loaders attached to a GraphQL context, creating them if missing."""
+    loaders = context.get("loaders")
+    if loaders is None:
+        loaders = context["loaders"] = build_loaders()
+    return loaders
+
+
+class AsyncBatchLoader:
+    """
+    Event-loop batching loader for the async executor.
+
+    `load` returns a future; every key requested during the same loop tick is
+    fetched by one batch call scheduled with `call_soon`, and results are
+    cached for the rest of the request.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[int]], Awaitable[Dict[int, dict]]]):
+        self._batch_fn = batch_fn
+        self._cache: Dict[int, "asyncio.Future"] = {}
+        self._pending: List[int] = []
+        # The loop only keeps weak references to tasks; hold running batches here.
+        self._tasks: Set["asyncio.Task"] = set()
+
+    def load(self, key: Any) -> "asyncio.Future":
+        key = int(key)
+        future = self._cache.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._cache[key] = loop.create_future()
+            if not self._pending:
+                loop.call_soon(self._start_dispatch)
+            self._pending.append(key)
+        return future
+
+    def _start_dispatch(self) -> None:
+        task = asyncio.ensure_future(self._dispatch())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        try:
+            found = await self._batch_fn(keys)
+        except Exception as error:
+            for key in keys:
+                future = self._cache.pop(key)
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for key in keys:
+            future = self._cache[key]
+            if not future.done():  # e.g. cancelled along with the resolver awaiting it
+                future.set_result(found.get(key))
+
+
+async def _load_users_async(user_ids: List[int]) -> Dict[int, dict]:
+    return {int(u["UserID"]): u for u in await async_user_repo.find_users_by_ids(user_ids)}
+
+async def _load_jobs_async(job_ids: List[int]) -> Dict[int, dict]:
+    return {int(j["jobId"]): j for j in await async_job_repo.find_jobs_by_ids(job_ids)}
+
+
+def build_async_loaders() -> Dict[str, AsyncBatchLoader]:
+    """Creates a fresh set of async loaders; call once per GraphQL request."""
+    return {
+        "users": AsyncBatchLoader(_load_users_async),
+        "jobs": AsyncBatchLoader(_load_jobs_async),
+    }
@@ -1,18 +1,30 @@
 # db.py
 import os
+import threading
 from datetime import datetime
 from dotenv import load_dotenv
-from pymongo import MongoClient, ReturnDocument
+from pymongo import ASCENDING, IndexModel, MongoClient, ReturnDocument
+from pymongo.errors import OperationFailure
+from .metrics import mongo_command_listener
 
 # ... (no changes to MONGO_URI, DB_NAME, _client, _db, get_db)
 load_dotenv(os.path.join(os.path.dirname(__file__), '../../config/.env'))
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
 DB_NAME = os.getenv("DB_NAME", "jobtracker")
-_client = MongoClient(MONGO_URI)
+_client = MongoClient(MONGO_URI, event_listeners=[mongo_command_listener])
 _db = _client[DB_NAME]
 def get_db():
     return _db
 
+# Async driver for the ASGI entry point; created lazily so the Flask app never opens it.
+_async_client = None
+def get_async_db():
+    global _async_client
+    if _async_client is None:
+        from pymongo import AsyncMongoClient
+        _async_client = AsyncMongoClient(MONGO_URI, event_listeners=[mongo_command_listener])
+    return _async_client[DB_NAME]
+
 
 # --- Collection Helpers ---
 def users_collection():
@@ -30,6 +42,195 @@ def counters_collection():
 def accounts_collection():
     return _db["accounts"]
 
+def response_cache_collection():
+    return _db["response_cache"]
+
+def change_log_collection():
+    return _db["change_log"]
+
+def revoked_tokens_collection():
+    return _db["revoked_tokens"]
+
+def job_stats_collection():
+    return _db["job_stats"]
+
+def async_users_collection():
+    return get_async_db()["users"]
+
+def async_jobs_collection():
+    return get_async_db()["jobs"]
+
+def async_applications_collection():
+    return get_async_db()["applications"]
+
+# --- Indexes ---
+# Declarative registry: collection name -> indexes it must have. `ensure_indexes`
+# creates missing ones on startup; `reconcile_indexes` (scripts/manage_indexes.py
+# reconcile) also rebuilds ones whose definition changed.
+INDEXES = {
+    "users": [
+        IndexModel([("UserID", ASCENDING)], name="UserID_unique", unique=True),
+        # Case-insensitive name filters query the normalized shadow fields.
+        IndexModel([("LastNameNorm", ASCENDING), ("FirstNameNorm", ASCENDING)], name="LastNameNorm_FirstNameNorm"),
+        IndexModel([("FirstNameNorm", ASCENDING)], name="FirstNameNorm"),
+    ],
+    "jobs": [
+        IndexModel([("jobId", ASCENDING)], name="jobId_unique", unique=True),
+        IndexModel([("companyNorm", ASCENDING), ("locationNorm", ASCENDING)], name="companyNorm_locationNorm"),
+        # Filter + jobId suffix lets keyset pages walk the index in order.
+        IndexModel([("companyNorm", ASCENDING), ("jobId", ASCENDING)], name="companyNorm_jobId"),
+        IndexModel([("locationNorm", ASCENDING), ("jobId", ASCENDING)], name="locationNorm_jobId"),
+        # Multikey index over title words; serves word-prefix title search.
+        IndexModel([("titleTokens", ASCENDING)], name="titleTokens"),
+    ],
+    "applications": [
+        IndexModel([("appId", ASCENDING)], name="appId_unique", unique=True),
+        # Serves the duplicate-application check in `apply` and userId lookups.
+        IndexModel([("userId", ASCENDING), ("jobId", ASCENDING)], name="userId_jobId_unique", unique=True),
+        IndexModel([("userId", ASCENDING), ("appId", ASCENDING)], name="userId_appId"),
+        IndexModel([("jobId", ASCENDING), ("appId", ASCENDING)], name="jobId_appId"),
+        IndexModel([("status", ASCENDING), ("appId", ASCENDING)], name="status_appId"),
+    ],
+    "accounts": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    # Materialized job counts per normalized company and location (job_stats_repo).
+    "job_stats": [
+        IndexModel([("company", ASCENDING), ("location", ASCENDING)], name="company_location_unique", unique=True),
+        IndexModel([("location", ASCENDING)], name="location"),
+    ],
+    # Ids of changed jobs/users, replayed into every process's in-memory indexes (change_log_repo).
+    "change_log": [
+        IndexModel([("kind", ASCENDING), ("seq", ASCENDING)], name="kind_seq_unique", unique=True),
+        IndexModel([("at", ASCENDING)], name="at_ttl", expireAfterSeconds=86400),
+    ],
+    # Logged-out JWTs (auth_service), kept until the token would have expired anyway.
+    "revoked_tokens": [
+        IndexModel([("expiresAt", ASCENDING)], name="expiresAt_ttl", expireAfterSeconds=0),
+        IndexModel([("revokedAt", ASCENDING)], name="revokedAt"),
+    ],
+    # Shared GraphQL response cache (RESPONSE_CACHE_BACKEND=mongo).
+    "response_cache": [
+        IndexModel([("expiresAt", ASCENDING)], name="expiresAt_ttl", expireAfterSeconds=0),
+        IndexModel([("tags", ASCENDING)], name="tags"),
+    ],
+}
+
+def _index_matches(existing: dict, spec: dict) -> bool:
+    """True if a live index (from index_information) has the declared keys and options."""
+    if list(existing.get("key", [])) != list(spec["key"].items()):
+        return False
+    for option in ("unique", "sparse"):
+        if bool(existing.get(option)) != bool(spec.get(option)):
+            return False
+    for option in ("partialFilterExpression", "expireAfterSeconds"):
+        if existing.get(option) != spec.get(option):
+            return False
+    # The server expands collations with defaults; compare only what we declared.
+    wanted = spec.get("collation") or {}
+    if bool(existing.get("collation")) != bool(wanted):
+        return False
+    return all(existing["collation"].get(k) == v for k, v in wanted.items())
+
+def _conflicting(existing: dict, spec: dict) -> list:
+    """Live index names that clash with `spec`: the same name, or the same keys under another name."""
+    keys = list(spec["key"].items())
+    return [n for n, info in existing.items()
+            if n != "_id_" and (n == spec["name"] or list(info.get("key", [])) == keys)]
+
+def ensure_indexes() -> dict:
+    """
+    Creates the indexes from INDEXES that are missing. Never drops anything, so
+    it is safe for every worker to run on startup: an index whose live
+    definition differs from the registry is only reported under "mismatched"
+    and left for `scripts/manage_indexes.py reconcile`.
+    Returns a report of created, mismatched and failed index names.
+    """
+    report = {"created": [], "mismatched": [], "failed": []}
+    for collection_name, models in INDEXES.items():
+        col = _db[collection_name]
+        existing = col.index_information()
+        for model in models:
+            spec = model.document
+            name = spec["name"]
+            label = f"{collection_name}.{name}"
+            if name in existing and _index_matches(existing[name], spec):
+                continue
+            if _conflicting(existing, spec):
+                report["mismatched"].append(label)
+                continue
+            try:
+                col.create_indexes([model])
+                report["created"].append(label)
+            except OperationFailure as e:
+                # e.g. existing duplicates prevent a unique index from building,
+                # or another worker created it first with a different definition.
+                report["failed"].append(f"{label}: {e}")
+    return report
+
+def _drop_index(col, name: str) -> None:
+    try:
+        col.drop_index(name)
+    except OperationFailure:
+        pass  # already gone, e.g. dropped by a concurrent reconcile
+
+def reconcile_indexes(drop_unknown: bool = False) -> dict:
+    """
+    Brings the live indexes in line with INDEXES: creates missing ones and
+    rebuilds ones whose definition changed. Indexes not in the registry are
+    dropped only when `drop_unknown` is set.
+
+    A rebuild never leaves its queries without an index. MongoDB refuses two
+    indexes with the same keys, so a "bridge" index on the same keys plus _id
+    is built first, the stale index is dropped and rebuilt, and the bridge is
+    dropped last. If the rebuild fails the bridge stays, and the failure is
+    reported. Uniqueness is not enforced while a unique index is being rebuilt.
+    Returns a report of created, dropped and failed index names.
+    """
+    report = {"created": [], "dropped": [], "failed": []}
+    for collection_name, models in INDEXES.items():
+        col = _db[collection_name]
+        existing = col.index_information()
+        declared = set()
+        for model in models:
+            spec = model.document
+            name = spec["name"]
+            declared.add(name)
+            label = f"{collection_name}.{name}"
+            if name in existing and _index_matches(existing[name], spec):
+                continue
+            stale = _conflicting(existing, spec)
+            bridge = None
+            if stale:
+                options = {k: spec[k] for k in ("partialFilterExpression", "collation") if k in spec}
+                bridge = f"{name}_bridge"
+                try:
+                    col.create_index(list(spec["key"].items()) + [("_id", ASCENDING)], name=bridge, **options)
+                except OperationFailure as e:
+                    report["failed"].append(f"{label}: could not build bridge index: {e}")
+                    continue
+                for stale_name in stale:
+                    _drop_index(col, stale_name)
+                    existing.pop(stale_name, None)
+                    report["dropped"].append(f"{collection_name}.{stale_name}")
+            try:
+                col.create_indexes([model])
+                report["created"].append(label)
+            except OperationFailure as e:
+                report["failed"].append(f"{label}: {e}" + (f" (kept {bridge})" if bridge else ""))
+                if bridge:
+                    declared.add(bridge)
+                continue
+            if bridge:
+                _drop_index(col, bridge)
+        if drop_unknown:
+            for name in col.index_information():
+                if name != "_id_" and name not in declared:
+                    _drop_index(col, name)
+                    report["dropped"].append(f"{collection_name}.{name}")
+    return report
+
+
 # --- Counters (User, Job, and new Application counter) ---
 def _ensure_counter(counter_id: str):
     counters_collection().update_one(
@@ -38,14 +239,87 @@ def _ensure_counter(counter_id: str):
         upsert=True,
     )
 
-def _next_id(counter_id: str):
+def _reserve_ids(counter_id: str, count: int):
+    """Atomically takes `count` IDs from a counter; returns the (first, last) of the range."""
     result = counters_collection().find_one_and_update(
         {"_id": counter_id},
-        {"$inc": {"sequence_value": 1}},
+        {"$inc": {"sequence_value": count}},
         return_document=ReturnDocument.AFTER,
         upsert=True,
     )
-    return int(result["sequence_value"])
+    last = int(result["sequence_value"])
+    return last - count + 1, last
+
+class IdAllocator:
+    """
+    hi/lo allocator for one counter: reserves `block_size` IDs with a single
+    $inc and hands them out from memory, so most inserts skip the counter
+    round trip. Every block comes from the shared counter document, so IDs
+    stay unique across threads and processes; they are increasing within a
+    process but not contiguous, and a restart abandons the rest of its block.
+    """
+
+    def __init__(self, counter_id: str, block_size: int):
+        self.counter_id = counter_id
+        self.block_size = max(1, block_size)
+        self._lock = threading.Lock()
+        self._next = 1
+        self._last = 0
+
+    def next_id(self) -> int:
+        with self._lock:
+            if self._next > self._last:
+                self._next, self._last = _reserve_ids(self.counter_id, self.block_size)
+            value = self._next
+            self._next += 1
+            return value
+
+    def reserve(self, count: int) -> range:
+        """`count` consecutive IDs for a bulk insert, with at most one counter round trip."""
+        if count <= 0:
+            return range(0)
+        with self._lock:
+            if self._last - self._next + 1 >= count:
+                first = self._next
+                self._next += count
+                return range(first, first + count)
+        first, last = _reserve_ids(self.counter_id, count)
+        return range(first, last + 1)
+
+    def reset(self) -> None:
+        """Drops the in-memory block; the next ID comes from a fresh reservation."""
+        with self._lock:
+            self._next, self._last = 1, 0
+
+    def _after_fork(self) -> None:
+        # The child may have inherited the lock held by another parent thread;
+        # acquiring it would deadlock, so rebind fresh state instead.
+        self._lock = threading.Lock()
+        self._next, self._last = 1, 0
+
+# Block size per counter; larger for the counters with the most inserts.
+ID_BLOCK_SIZES = {
+    "UserID": int(os.getenv("USER_ID_BLOCK_SIZE", "20")),
+    "jobId": int(os.getenv("JOB_ID_BLOCK_SIZE", "50")),
+    "appId": int(os.getenv("APPLICATION_ID_BLOCK_SIZE", "100")),
+}
+_allocators = {counter_id: IdAllocator(counter_id, size) for counter_id, size in ID_BLOCK_SIZES.items()}
+
+def reset_id_blocks():
+    """Discards every in-memory block, e.g. after a script rewrites the counters."""
+    for allocator in _allocators.values():
+        allocator.reset()
+
+def _reset_id_blocks_after_fork():
+    for allocator in _allocators.values():
+        allocator._after_fork()
+
+# A forked worker must not hand out IDs from its parent's block.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_id_blocks_after_fork)
+
+def _next_id(counter_id: str):
+    return _allocators[counter_id].next_id()
 
 def ensure_user_counter():
     _ensure_counter("UserID")
@@ -53,18 +327,27 @@ def ensure_user_counter():
 def next_user_id():
     return _next_id("UserID")
 
+def reserve_user_ids(count: int) -> range:
+    return _allocators["UserID"].reserve(count)
+
 def ensure_job_counter():
     _ensure_counter("jobId")
 
 def next_job_id():
     return _next_id("jobId")
 
+def reserve_job_ids(count: int) -> range:
+    return _allocators["jobId"].reserve(count)
+
 def ensure_application_counter(): # New
     _ensure_counter("appId")
 
 def next_application_id(): # New
     return _next_id("appId")
 
+def reserve_application_ids(count: int) -> range:
+    return _allocators["appId"].reserve(count)
+
 
 # --- Output Formatting (no changes to user/job, new for application) ---
 def to_user_output(doc: dict): # ... no changes
@@ -0,0 +1,134 @@
+# document_cache.py
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from graphql import DocumentNode, GraphQLError, GraphQLSchema, parse, specified_rules, validate
+
+
+def query_hash(query: str) -> str:
+    """sha256 hex digest of a query string; the key used by automatic persisted queries."""
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+class PersistedQueryError(Exception):
+    """Raised when an automatic-persisted-query request cannot be served."""
+
+    def __init__(self, message: str, code: str):
+        super().__init__(message)
+        self.code = code
+
+    def to_dict(self) -> dict:
+        return {"message": str(self), "extensions": {"code": self.code}}
+
+
+class _Entry:
+    __slots__ = ("query", "document", "errors")
+
+    def __init__(self, query: str, document: DocumentNode):
+        self.query = query
+        self.document = document
+        # Spec-rule validation results, per schema.
+        self.errors: Dict[int, List[GraphQLError]] = {}
+
+
+class DocumentCache:
+    """
+    Bounded LRU of parsed and validated GraphQL documents, keyed by query hash.
+
+    Plugs into ariadne as `query_parser` and `query_validator`, so a repeated
+    operation skips both parsing and spec validation. The same store backs
+    automatic persisted queries: a client may send only the sha256 hash and
+    must send the full text only after a PersistedQueryNotFound miss.
+    """
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._by_document: Dict[int, _Entry] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: str) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key: str, entry: _Entry) -> _Entry:
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                self._entries.move_to_end(key)
+                return existing
+            self._entries[key] = entry
+            self._by_document[id(entry.document)] = entry
+            while len(self._entries) > self.maxsize:
+                _, evicted = self._entries.popitem(last=False)
+                self._by_document.pop(id(evicted.document), None)
+            return entry
+
+    def get_document(self, query: str) -> DocumentNode:
+        """Returns the parsed document for `query`, parsing it only on a cache miss."""
+        key = query_hash(query)
+        entry = self._get(key)
+        if entry is None:
+            entry = self._put(key, _Entry(query, parse(query)))
+        return entry.document
+
+    # --- ariadne hooks ---
+    def parse_query(self, context_value: Any, data: dict) -> DocumentNode:
+        """`query_parser` for graphql_sync/graphql."""
+        return self.get_document(data["query"])
+
+    def validate(self, schema: GraphQLSchema, document_ast: DocumentNode, rules=None, max_errors=None, **kwargs) -> List[GraphQLError]:
+        """`query_validator` for graphql_sync/graphql; spec-rule results are cached per document."""
+        rules = tuple(rules) if rules is not None else tuple(specified_rules)
+        spec = tuple(r for r in rules if r in specified_rules)
+        custom = tuple(r for r in rules if r not in specified_rules)
+
+        with self._lock:
+            entry = self._by_document.get(id(document_ast))
+        if entry is not None and entry.document is document_ast and len(spec) == len(specified_rules):
+            errors = entry.errors.get(id(schema))
+            if errors is None:
+                errors = entry.errors[id(schema)] = validate(schema, document_ast, rules=spec, max_errors=max_errors)
+        else:
+            errors = validate(schema, document_ast, rules=spec, max_errors=max_errors) if spec else []
+
+        if errors or not custom:
+            return errors
+        # Custom rules (e.g. per-request cost limits) depend on variables, so they always run.
+        return validate(schema, document_ast, rules=custom, max_errors=max_errors)
+
+    # --- Automatic persisted queries ---
+    def resolve_persisted_query(self, data: dict) -> dict:
+        """
+        Applies the automatic-persisted-queries protocol to a request body.
+        Returns the body with `query` filled in, or raises PersistedQueryError.
+        """
+        extensions = data.get("extensions")
+        persisted = extensions.get("persistedQuery") if isinstance(extensions, dict) else None
+        if not isinstance(persisted, dict):
+            return data
+        if persisted.get("version") != 1:
+            raise PersistedQueryError("Unsupported persisted query version", "PERSISTED_QUERY_NOT_SUPPORTED")
+        sha = persisted.get("sha256Hash")
+        if not isinstance(sha, str):
+            raise PersistedQueryError("persistedQuery.sha256Hash must be a string", "BAD_USER_INPUT")
+
+        query = data.get("query")
+        if query:
+            if query_hash(query) != sha:
+                raise PersistedQueryError("provided sha does not match query", "BAD_USER_INPUT")
+            # Registered when graphql_sync parses it through `parse_query`.
+            return data
+
+        entry = self._get(sha)
+        if entry is None:
+            raise PersistedQueryError("PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND")
+        return {**data, "query": entry.query}
@@ -0,0 +1,25 @@
+# graphql_schema.py
+import os
+from ariadne import load_schema_from_path, make_executable_schema
+
+from .resolvers.user_resolvers import query as user_query, mutation as user_mutation
+from .resolvers.job_resolvers import query as job_query, mutation as job_mutation
+from .resolvers.application_resolvers import query as app_query, mutation as app_mutation, application as application_object
+from .resolvers.auth_resolvers import mutation as auth_mutation
+from .resolvers.recommendation_resolvers import query as recommendation_query
+
+schema_path = os.path.join(os.path.dirname(__file__), "schema.graphql")
+type_defs = load_schema_from_path(schema_path)
+
+# Trimmed SDL given to the LLM by /nl2gql
+llm_schema_path = os.path.join(os.path.dirname(__file__), "schema_for_llm.graphql")
+
+QUERY_BINDABLES = [user_query, job_query, app_query, recommendation_query]
+MUTATION_BINDABLES = [user_mutation, job_mutation, app_mutation, auth_mutation]
+OBJECT_BINDABLES = [application_object]
+
+def build_schema(*overrides):
+    """Builds the executable schema; bindables in `overrides` replace the resolvers of the fields they set."""
+    return make_executable_schema(type_defs, QUERY_BINDABLES, MUTATION_BINDABLES, OBJECT_BINDABLES, *overrides)
+
+schema = build_schema()
@@ -0,0 +1,299 @@
+# metrics.py
+import bisect
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from inspect import iscoroutinefunction
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from ariadne.types import Extension
+from graphql import GraphQLResolveInfo
+from pymongo import monitoring
+
+# Requests slower than this (seconds) are written to the slow-operation log.
+SLOW_REQUEST_THRESHOLD = float(os.getenv("SLOW_REQUEST_THRESHOLD", "1.0"))
+# MongoDB commands remembered per request for the slow-operation log.
+MAX_TRACED_COMMANDS = 50
+# Distinct GraphQL operation labels kept; operation names are chosen by clients,
+# so later ones are counted under "other" rather than growing /metrics forever.
+MAX_OPERATION_LABELS = int(os.getenv("MAX_OPERATION_LABELS", "200"))
+# HTTP methods labelled as such; anything else a client sends is "other".
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+slow_log = logging.getLogger("job_portal.slow_operations")
+
+
+# --- Prometheus primitives ---
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class Histogram:
+    """
+    A Prometheus histogram with fixed buckets and a fixed set of label names.
+    With `max_series`, label values first seen once that many series exist
+    are all recorded as "other".
+    """
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS,
+                 max_series: Optional[int] = None):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.max_series = max_series
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        key = tuple(str(v) for v in labelvalues)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None and self.max_series is not None and len(self._series) >= self.max_series:
+                key = ("other",) * len(self.labelnames)
+                series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(k, list(c), s[0]) for k, (c, s) in sorted(self._series.items())]
+        bounds = ['le="%s"' % b for b in self.buckets] + ['le="+Inf"']
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, bound)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+class Counter:
+    """A Prometheus counter with a fixed set of label names."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float, *labelvalues: str) -> None:
+        key = tuple(str(v) for v in labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines.extend(f"{self.name}{_labels(self.labelnames, key)} {value}" for key, value in items)
+        return lines
+
+
+HTTP_DURATION = Histogram("http_request_duration_seconds", "HTTP request latency.", ("method", "route", "status"))
+GRAPHQL_DURATION = Histogram("graphql_operation_duration_seconds", "GraphQL operation latency (parse, validate, execute).", ("operation",),
+                             max_series=MAX_OPERATION_LABELS)
+RESOLVER_DURATION = Histogram("graphql_resolver_duration_seconds", "Latency of fields with a custom resolver.", ("field",))
+MONGO_DURATION = Histogram("mongodb_command_duration_seconds", "MongoDB command latency.", ("collection", "command"))
+MONGO_DOCUMENTS = Counter("mongodb_documents_returned_total", "Documents returned by MongoDB commands.", ("collection", "command"))
+MONGO_FAILURES = Counter("mongodb_command_failures_total", "Failed MongoDB commands.", ("collection", "command"))
+OLLAMA_DURATION = Histogram("ollama_request_duration_seconds", "Ollama generation latency.", ("mode", "outcome"))
+
+REGISTRY = [HTTP_DURATION, GRAPHQL_DURATION, RESOLVER_DURATION, MONGO_DURATION, MONGO_DOCUMENTS, MONGO_FAILURES, OLLAMA_DURATION]
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# --- Per-request trace for the slow-operation log ---
+class RequestTrace:
+    """What one HTTP request did; set in a contextvar so the GraphQL and MongoDB hooks can add to it."""
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.operation: Optional[str] = None
+        self.variables_shape: Any = None
+        self.commands: List[dict] = []
+        self.dropped_commands = 0
+
+    def add_command(self, entry: dict) -> None:
+        if len(self.commands) < MAX_TRACED_COMMANDS:
+            self.commands.append(entry)
+        else:
+            self.dropped_commands += 1
+
+_current_trace: contextvars.ContextVar[Optional[RequestTrace]] = contextvars.ContextVar("request_trace", default=None)
+
+def start_trace(method: str, path: str) -> RequestTrace:
+    trace = RequestTrace(method, path)
+    _current_trace.set(trace)
+    return trace
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current_trace.get()
+
+def finish_trace(trace: Optional[RequestTrace], route: str, status: int) -> float:
+    """Records the HTTP histogram and, past the threshold, a slow-operation log entry. Returns the duration."""
+    if trace is None:
+        return 0.0
+    elapsed = time.perf_counter() - trace.started
+    HTTP_DURATION.observe(elapsed, trace.method if trace.method in HTTP_METHODS else "other", route, status)
+    if elapsed >= SLOW_REQUEST_THRESHOLD:
+        slow_log.warning(json.dumps({
+            "route": route,
+            "status": status,
+            "duration_ms": round(elapsed * 1000, 1),
+            "operation": trace.operation,
+            "variables": trace.variables_shape,
+            "mongodb": trace.commands,
+            "mongodb_dropped": trace.dropped_commands,
+        }, default=str))
+    return elapsed
+
+def value_shape(value: Any) -> Any:
+    """The structure of a value with leaves replaced by type names, so logs never carry user data."""
+    if isinstance(value, Mapping):
+        return {k: value_shape(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [value_shape(value[0]), f"x{len(value)}"] if value else []
+    return type(value).__name__
+
+
+# --- GraphQL ---
+def _operation_label(info: GraphQLResolveInfo) -> str:
+    operation = info.operation
+    if operation.name is not None:
+        return operation.name.value
+    # Anonymous operations are labelled by their root fields, e.g. "query:jobs,users".
+    fields = sorted({s.name.value for s in operation.selection_set.selections if hasattr(s, "name")})
+    return f"{operation.operation.value}:{','.join(fields)}"
+
+class MetricsExtension(Extension):
+    """
+    Times the whole operation and every field that has its own resolver;
+    fields served by the default attribute resolver are skipped to keep the
+    overhead off large lists.
+    """
+
+    def __init__(self):
+        self._started = 0.0
+        self._operation: Optional[str] = None
+
+    def request_started(self, context):
+        self._started = time.perf_counter()
+
+    def request_finished(self, context):
+        GRAPHQL_DURATION.observe(time.perf_counter() - self._started, self._operation or "invalid")
+
+    def resolve(self, next_, obj, info: GraphQLResolveInfo, **kwargs):
+        if info.path.prev is None and self._operation is None:
+            self._operation = _operation_label(info)
+            trace = current_trace()
+            if trace is not None:
+                trace.operation = self._operation
+                # graphql-core 3.3 wraps the coerced values; 3.2 passes the dict itself
+                variables = getattr(info.variable_values, "coerced", info.variable_values)
+                trace.variables_shape = value_shape(variables)
+
+        field_def = info.parent_type.fields.get(info.field_name)  # None for __schema, __type and __typename
+        if field_def is None or field_def.resolve is None or info.parent_type.name.startswith("__"):
+            return next_(obj, info, **kwargs)
+        field = f"{info.parent_type.name}.{info.field_name}"
+
+        if iscoroutinefunction(next_):
+            async def timed():
+                started = time.perf_counter()
+                try:
+                    return await next_(obj, info, **kwargs)
+                finally:
+                    RESOLVER_DURATION.observe(time.perf_counter() - started, field)
+            return timed()
+
+        started = time.perf_counter()
+        try:
+            return next_(obj, info, **kwargs)
+        finally:
+            RESOLVER_DURATION.observe(time.perf_counter() - started, field)
+
+
+# --- MongoDB ---
+_DOCUMENT_BATCHES = ("firstBatch", "nextBatch")
+
+def _documents_returned(reply: dict) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        for key in _DOCUMENT_BATCHES:
+            if key in cursor:
+                return len(cursor[key])
+    if isinstance(reply.get("value"), dict):  # findAndModify
+        return 1
+    return 0
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Records latency and documents returned per collection and command, and adds each command to the request trace."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._collections: Dict[Tuple[Any, int], str] = {}
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        collection = target if isinstance(target, str) else event.database_name
+        if event.command_name == "getMore":
+            collection = event.command.get("collection", collection)
+        with self._lock:
+            self._collections[(event.connection_id, event.request_id)] = collection
+
+    def _finish(self, event, failed: bool):
+        with self._lock:
+            collection = self._collections.pop((event.connection_id, event.request_id), "unknown")
+        seconds = event.duration_micros / 1e6
+        MONGO_DURATION.observe(seconds, collection, event.command_name)
+        documents = 0
+        if failed:
+            MONGO_FAILURES.inc(1, collection, event.command_name)
+        else:
+            documents = _documents_returned(event.reply)
+            if documents:
+                MONGO_DOCUMENTS.inc(documents, collection, event.command_name)
+        trace = current_trace()
+        if trace is not None:
+            trace.add_command({
+                "command": event.command_name,
+                "collection": collection,
+                "duration_ms": round(seconds * 1000, 2),
+                "documents": documents,
+                "failed": failed,
+            })
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+mongo_command_listener = MongoCommandListener()
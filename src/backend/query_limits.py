@@ -0,0 +1,123 @@
+# query_limits.py
+import os
+from typing import Any, Dict, List, Optional
+
+from ariadne.validation.query_cost import CostValidator
+from graphql import FieldNode, GraphQLError, InlineFragmentNode, SelectionSetNode, ValidationContext, ValidationRule
+
+from .repository.pagination import clamp_page_size, validate_first
+
+# Operations costing more than this, or nesting fields deeper than this, are
+# rejected during validation, before any resolver touches MongoDB.
+MAX_QUERY_COST = int(os.getenv("GRAPHQL_MAX_COST", "5000"))
+MAX_QUERY_DEPTH = int(os.getenv("GRAPHQL_MAX_DEPTH", "10"))
+
+_ONE = {"complexity": 1}
+_LIST = {"complexity": 1, "multipliers": ["limit"]}
+_PAGE = {"complexity": 1, "multipliers": ["first"]}
+
+# One point per object a field can load, times the page size of every list it
+# is nested in. Fields not listed (scalars, payload wrappers) are free.
+# Mutations are bounded by MAX_BULK_ITEMS instead.
+COST_MAP: Dict[str, Dict[str, Any]] = {
+    "Query": {
+        "users": _LIST,
+        "jobs": _LIST,
+        "applications": _LIST,
+        "recommendedJobs": _LIST,
+        "matchingCandidates": _LIST,
+        "semanticJobs": _LIST,
+        "semanticCandidates": _LIST,
+        "searchJobs": _LIST,
+        "usersConnection": _PAGE,
+        "jobsConnection": _PAGE,
+        "applicationsConnection": _PAGE,
+        "userById": _ONE,
+        "jobById": _ONE,
+        "applicationById": _ONE,
+        "analyticsJobsCount": _ONE,
+        "jobFacets": _ONE,
+    },
+    "Application": {
+        "candidate": _ONE,
+        "job": _ONE,
+    },
+}
+
+# How the resolvers turn each multiplier argument into the page size they use.
+_PAGE_SIZES = {"limit": clamp_page_size, "first": validate_first}
+
+
+class QueryCostRule(CostValidator):
+    """
+    ariadne's cost validator, except that `limit` and `first` are costed at the
+    page size the resolver will actually return. Upstream skips a missing
+    multiplier, which would price an unbounded list at a single object.
+    """
+
+    def get_multipliers_from_string(self, multipliers: List[str], field_args: dict) -> List[int]:
+        sizes = []
+        for name in multipliers:
+            try:
+                sizes.append(_PAGE_SIZES[name](field_args.get(name)))
+            except ValueError:
+                pass  # the resolver reports the invalid argument
+        return [size for size in sizes if size > 0]
+
+
+def query_cost_rule(variables: Optional[dict]) -> type:
+    """A QueryCostRule bound to one request's variables."""
+
+    class _QueryCostRule(QueryCostRule):
+        def __init__(self, context: ValidationContext):
+            super().__init__(context, maximum_cost=MAX_QUERY_COST, variables=variables, cost_map=COST_MAP)
+
+    return _QueryCostRule
+
+
+class DepthLimitRule(ValidationRule):
+    """Rejects operations whose field selections nest deeper than MAX_QUERY_DEPTH. Introspection is not counted."""
+
+    def __init__(self, context: ValidationContext):
+        super().__init__(context)
+        self._fragment_depths: Dict[str, int] = {}
+
+    def enter_operation_definition(self, node, *_args):
+        depth = self._depth(node.selection_set)
+        if depth > MAX_QUERY_DEPTH:
+            self.report_error(GraphQLError(
+                f"The query exceeds the maximum depth of {MAX_QUERY_DEPTH}. Actual depth is {depth}.",
+                node,
+                extensions={"depth": {"requestedQueryDepth": depth, "maximumAvailable": MAX_QUERY_DEPTH}},
+            ))
+
+    def _depth(self, selection_set: Optional[SelectionSetNode]) -> int:
+        if selection_set is None:
+            return 0
+        deepest = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                if selection.name.value.startswith("__"):
+                    continue
+                depth = 1 + self._depth(selection.selection_set)
+            elif isinstance(selection, InlineFragmentNode):
+                depth = self._depth(selection.selection_set)
+            else:
+                depth = self._fragment_depth(selection.name.value)
+            deepest = max(deepest, depth)
+        return deepest
+
+    def _fragment_depth(self, name: str) -> int:
+        # Memoized so fragments spread many times are walked once; cycles were
+        # already rejected by the spec rules, which run first.
+        if name not in self._fragment_depths:
+            self._fragment_depths[name] = 0
+            fragment = self.context.get_fragment(name)
+            self._fragment_depths[name] = self._depth(fragment.selection_set) if fragment else 0
+        return self._fragment_depths[name]
+
+
+def validation_rules(context_value: Any, document: Any, data: dict) -> list:
+    """`validation_rules` for graphql_sync/graphql: the depth limit and this request's cost limit."""
+    variables = data.get("variables") if isinstance(data, dict) else None
+    return [DepthLimitRule, query_cost_rule(variables)]
@@ -1,14 +1,35 @@
-from typing import Optional, Dict, Any, List
-from pymongo import ReturnDocument
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
 from ..db import applications_collection
+from .bulk import bulk_write_errors
+from .pagination import find_page
 
-def find_applications(q: Dict[str, Any]) -> List[dict]:
-    """Finds multiple applications in the database."""
-    return list(applications_collection().find(q, {"_id": 0}))
+def build_application_filter(user_id: Optional[int], job_id: Optional[int], status: Optional[str]) -> Dict[str, Any]:
+    """Builds an exact-match filter for applications."""
+    q: Dict[str, Any] = {}
+    if user_id: q["userId"] = int(user_id)
+    if job_id: q["jobId"] = int(job_id)
+    if status: q["status"] = status
+    return q
 
-def find_application_by_id(app_id: int) -> Optional[dict]:
+def find_applications(q: Dict[str, Any], projection: Optional[Dict[str, Any]] = None,
+                      skip: Optional[int] = None, limit: Optional[int] = None) -> List[dict]:
+    """Finds multiple applications in the database, returning only `projection` fields when given."""
+    cursor = applications_collection().find(q, projection or {"_id": 0})
+    if skip is not None:
+        cursor = cursor.skip(int(skip))
+    if limit is not None:
+        cursor = cursor.limit(int(limit))
+    return list(cursor)
+
+def find_applications_page(q: Dict[str, Any], after: Optional[int], first: int, projection: Optional[Dict[str, Any]] = None) -> Tuple[List[dict], bool]:
+    """Finds one keyset page of applications ordered by appId."""
+    return find_page(applications_collection(), q, "appId", after, first, projection)
+
+def find_application_by_id(app_id: int, projection: Optional[Dict[str, Any]] = None) -> Optional[dict]:
     """Finds a single application by its unique appId."""
-    return applications_collection().find_one({"appId": int(app_id)}, {"_id": 0})
+    return applications_collection().find_one({"appId": int(app_id)}, projection or {"_id": 0})
 
 def insert_application(doc: dict) -> None:
     """Inserts a new application document into the database."""
@@ -21,4 +42,20 @@ def update_one_application(q: Dict[str, Any], set_fields: Dict[str, Any]) -> Opt
         {"$set": set_fields},
         projection={"_id": 0},
         return_document=ReturnDocument.AFTER,
-    )
\ No newline at end of file
+    )
+
+def find_applications_by_ids(app_ids: Iterable[int]) -> List[dict]:
+    """Finds every application whose appId is in `app_ids` with a single query."""
+    ids = [int(i) for i in app_ids]
+    return list(applications_collection().find({"appId": {"$in": ids}}, {"_id": 0}))
+
+def update_applications(updates: List[Tuple[int, Dict[str, Any]]], ordered: bool = True) -> Dict[int, str]:
+    """Applies (appId, set_fields) pairs in one bulk_write; returns {position: error}."""
+    if not updates:
+        return {}
+    ops = [UpdateOne({"appId": int(app_id)}, {"$set": fields}) for app_id, fields in updates]
+    try:
+        applications_collection().bulk_write(ops, ordered=ordered)
+    except BulkWriteError as e:
+        return bulk_write_errors(e)
+    return {}
@@ -0,0 +1,23 @@
+from typing import Optional, Dict, Any, List, Tuple
+from ..db import async_applications_collection
+from .pagination import find_page_async
+
+# Async counterparts of the application_repo reads, for the ASGI entry point.
+
+async def find_applications(q: Dict[str, Any], projection: Optional[Dict[str, Any]] = None,
+                            skip: Optional[int] = None, limit: Optional[int] = None) -> List[dict]:
+    """Finds multiple applications in the database."""
+    cursor = async_applications_collection().find(q, projection or {"_id": 0})
+    if skip is not None:
+        cursor = cursor.skip(int(skip))
+    if limit is not None:
+        cursor = cursor.limit(int(limit))
+    return await cursor.to_list()
+
+async def find_applications_page(q: Dict[str, Any], after: Optional[int], first: int, projection: Optional[Dict[str, Any]] = None) -> Tuple[List[dict], bool]:
+    """Finds one keyset page of applications ordered by appId."""
+    return await find_page_async(async_applications_collection(), q, "appId", after, first, projection)
+
+async def find_application_by_id(app_id: int, projection: Optional[Dict[str, Any]] = None) -> Optional[dict]:
+    """Finds a single application by its unique appId."""
+    return await async_applications_collection().find_one({"appId": int(app_id)}, projection or {"_id": 0})
@@ -0,0 +1,27 @@
+from typing import Optional, Dict, Any, List, Tuple
+from ..db import async_jobs_collection
+from .pagination import find_page_async
+
+# Async counterparts of the job_repo reads, for the ASGI entry point.
+# Filters and output formatting are shared with job_repo.
+
+async def find_jobs(q: Dict[str, Any], skip: Optional[int], limit: Optional[int], projection: Optional[Dict[str, Any]] = None) -> List[dict]:
+    """Finds multiple jobs in the database."""
+    cursor = async_jobs_collection().find(q, projection or {"_id": 0})
+    if skip is not None:
+        cursor = cursor.skip(int(skip))
+    if limit is not None:
+        cursor = cursor.limit(int(limit))
+    return await cursor.to_list()
+
+async def find_jobs_page(q: Dict[str, Any], after: Optional[int], first: int, projection: Optional[Dict[str, Any]] = None) -> Tuple[List[dict], bool]:
+    """Finds one keyset page of jobs ordered by jobId."""
+    return await find_page_async(async_jobs_collection(), q, "jobId", after, first, projection)
+
+async def find_job_by_id(job_id: int, projection: Optional[Dict[str, Any]] = None) -> Optional[dict]:
+    """Finds a single job by its unique jobId."""
+    return await async_jobs_collection().find_one({"jobId": int(job_id)}, projection or {"_id": 0})
+
+async def find_jobs_by_ids(job_ids: List[int]) -> List[dict]:
+    """Finds all jobs whose jobId is in the given list, in a single query."""
+    return await async_jobs_collection().find({"jobId": {"$in": [int(j) for j in job_ids]}}, {"_id": 0}).to_list()
@@ -0,0 +1,23 @@
+from typing import Optional, Dict, Any, List, Tuple
+from ..db import async_users_collection
+from .pagination import find_page_async
+
+# Async counterparts of the user_repo reads, for the ASGI entry point.
+# Filters and output formatting are shared with user_repo.
+
+async def find_users(q: Dict[str, Any], skip: Optional[int], limit: Optional[int], projection: Optional[Dict[str, Any]] = None) -> List[dict]:
+    cursor = async_users_collection().find(q, projection or {"_id": 0})
+    if skip is not None:
+        cursor = cursor.skip(int(skip))
+    if limit is not None:
+        cursor = cursor.limit(int(limit))
+    return await cursor.to_list()
+
+async def find_users_page(q: Dict[str, Any], after: Optional[int], first: int, projection: Optional[Dict[str, Any]] = None) -> Tuple[List[dict], bool]:
+    return await find_page_async(async_users_collection(), q, "UserID", after, first, projection)
+
+async def find_one_by_id(user_id: int, projection: Optional[Dict[str, Any]] = None) -> Optional[dict]:
+    return await async_users_collection().find_one({"UserID": int(user_id)}, projection or {"_id": 0})
+
+async def find_users_by_ids(user_ids: List[int]) -> List[dict]:
+    return await async_users_collection().find({"UserID": {"$in": [int(u) for u in user_ids]}}, {"_id": 0}).to_list()
@@ -0,0 +1,23 @@
+from typing import Dict, List
+from pymongo.errors import BulkWriteError, OperationFailure
+
+def write_error(code, errmsg) -> str:
+    """The message reported for one failed write."""
+    return "Duplicate key." if code == 11000 else (errmsg or "Write failed.")
+
+def bulk_write_errors(e: BulkWriteError) -> Dict[int, str]:
+    """Maps the position of each failed operation in a bulk write to its error message."""
+    errors = {}
+    for err in (e.details or {}).get("writeErrors", []):
+        errors[int(err["index"])] = write_error(err.get("code"), err.get("errmsg"))
+    return errors
+
+def operation_error(e: OperationFailure) -> str:
+    """The message for a single write that failed, as `bulk_write_errors` reports it."""
+    return write_error(e.code, (e.details or {}).get("errmsg"))
+
+def applied_positions(count: int, errors: Dict[int, str], ordered: bool) -> List[int]:
+    """Positions of a `count`-operation bulk write that were applied, given its errors."""
+    if ordered and errors:
+        return list(range(min(errors)))
+    return [position for position in range(count) if position not in errors]
@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+from typing import Iterable, List
+from pymongo import ReturnDocument
+from ..db import change_log_collection, counters_collection
+
+# Every process keeps in-memory indexes over jobs and users. Writes through the
+# API append the ids they touched to the `change_log` collection, numbered by a
+# per-kind generation counter in `counters`; each process compares that counter
+# on every indexed query and re-reads only the logged ids. Entries expire after
+# a day (TTL index); a process that falls further behind rebuilds instead.
+
+KINDS = ("jobs", "users")
+
+def _counter_id(kind: str) -> str:
+    return f"changeLog:{kind}"
+
+def record_changes(kind: str, ids: Iterable[int], reset: bool = False) -> None:
+    """
+    Logs that the `kind` documents with `ids` were written or deleted. With
+    `reset`, e.g. after a script reloaded the collection, every process
+    rebuilds its indexes over `kind` from scratch instead.
+    """
+    ids = sorted({int(i) for i in ids})
+    if not ids and not reset:
+        return
+    counter = counters_collection().find_one_and_update(
+        {"_id": _counter_id(kind)},
+        {"$inc": {"sequence_value": 1}},
+        return_document=ReturnDocument.AFTER,
+        upsert=True,
+    )
+    if reset:
+        # Kept on the counter too: log entries expire, but files built before
+        # the reset must still be recognised as stale (see `last_reset`).
+        counters_collection().update_one({"_id": _counter_id(kind)}, {"$max": {"resetSeq": counter["sequence_value"]}})
+    change_log_collection().insert_one({
+        "kind": kind,
+        "seq": int(counter["sequence_value"]),
+        "ids": ids,
+        "reset": reset,
+        "at": datetime.now(timezone.utc),  # for the TTL index
+    })
+
+def current_generation(kind: str) -> int:
+    """The sequence number of the latest change to `kind`; 0 before any."""
+    doc = counters_collection().find_one({"_id": _counter_id(kind)})
+    return int(doc["sequence_value"]) if doc else 0
+
+def last_reset(kind: str) -> int:
+    """The sequence number of the latest reset of `kind`; 0 if it was never reset."""
+    doc = counters_collection().find_one({"_id": _counter_id(kind)})
+    return int(doc.get("resetSeq", 0)) if doc else 0
+
+def find_changes(kind: str, after: int) -> List[dict]:
+    """The change log entries for `kind` numbered above `after`, in order."""
+    cursor = change_log_collection().find({"kind": kind, "seq": {"$gt": int(after)}}, {"_id": 0, "seq": 1, "ids": 1, "reset": 1})
+    return list(cursor.sort("seq", 1))
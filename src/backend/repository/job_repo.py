@@ -1,7 +1,16 @@
 import re
-from typing import Optional, Dict, Any, List
-from pymongo import ReturnDocument
+from collections import Counter
+from typing import Optional, Dict, Any, Iterable, List, Set, Tuple
+from pymongo import DeleteOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
 from ..db import jobs_collection, next_job_id
+from ..validators.common_validators import normalize_ci, tokenize_words
+from .bulk import applied_positions, bulk_write_errors, operation_error
+from .job_stats_repo import adjust_job_stats, stats_key
+from .pagination import find_page
+
+# Every write below keeps the job_stats counters in step; see job_stats_repo.
+_STATS_PROJECTION = {"_id": 0, "jobId": 1, "companyNorm": 1, "locationNorm": 1}
 
 def to_job_output(doc: dict) -> dict:
     """Formats a job document from MongoDB for GraphQL output."""
@@ -18,45 +27,247 @@ def to_job_output(doc: dict) -> dict:
         "postedAt": doc.get("postedAt"),
     }
 
+def with_search_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns a copy of `fields` plus the normalized shadow fields that job filters query:
+    companyNorm/locationNorm (case-folded) and titleTokens (case-folded title words).
+    """
+    out = dict(fields)
+    if "company" in fields:
+        out["companyNorm"] = normalize_ci(fields["company"])
+    if "location" in fields:
+        out["locationNorm"] = normalize_ci(fields["location"])
+    if "title" in fields:
+        out["titleTokens"] = tokenize_words(fields["title"])
+    return out
+
 def build_job_filter(company: Optional[str], location: Optional[str], title: Optional[str]) -> Dict[str, Any]:
-    """Builds a filter query for jobs with case-insensitive regex matching."""
+    """Builds an index-friendly filter: case-insensitive equality on company/location, word-prefix match on title."""
     q: Dict[str, Any] = {}
     if company:
-        q["company"] = {"$regex": f"^{re.escape(company)}$", "$options": "i"}
+        q["companyNorm"] = normalize_ci(company)
     if location:
-        q["location"] = {"$regex": f"^{re.escape(location)}$", "$options": "i"}
+        q["locationNorm"] = normalize_ci(location)
     if title:
-        q["title"] = {"$regex": f".*{re.escape(title)}.*", "$options": "i"} # Partial match for title
+        tokens = tokenize_words(title)
+        if tokens:
+            # Every word of the search must prefix some word of the title, e.g. "data sci" -> "Senior Data Scientist".
+            # Anchored, case-sensitive prefixes are served as range scans on the titleTokens index.
+            q["$and"] = [{"titleTokens": re.compile(f"^{re.escape(t)}")} for t in tokens]
+        else:
+            q["title"] = {"$regex": re.escape(title), "$options": "i"} # No words to index, e.g. "++"
     return q
 
-def find_jobs(q: Dict[str, Any], skip: Optional[int], limit: Optional[int]) -> List[dict]:
-    """Finds multiple jobs in the database."""
+def find_jobs(q: Dict[str, Any], skip: Optional[int], limit: Optional[int], projection: Optional[Dict[str, Any]] = None) -> List[dict]:
+    """Finds multiple jobs in the database, returning only `projection` fields when given."""
     col = jobs_collection()
-    cursor = col.find(q, {"_id": 0})
+    cursor = col.find(q, projection or {"_id": 0})
     if skip is not None:
         cursor = cursor.skip(int(skip))
     if limit is not None:
         cursor = cursor.limit(int(limit))
     return list(cursor)
 
-def find_job_by_id(job_id: int) -> Optional[dict]:
+def find_jobs_page(q: Dict[str, Any], after: Optional[int], first: int, projection: Optional[Dict[str, Any]] = None) -> Tuple[List[dict], bool]:
+    """Finds one keyset page of jobs ordered by jobId."""
+    return find_page(jobs_collection(), q, "jobId", after, first, projection)
+
+def find_job_by_id(job_id: int, projection: Optional[Dict[str, Any]] = None) -> Optional[dict]:
     """Finds a single job by its unique jobId."""
-    return jobs_collection().find_one({"jobId": int(job_id)}, {"_id": 0})
+    return jobs_collection().find_one({"jobId": int(job_id)}, projection or {"_id": 0})
+
+def find_jobs_by_ids(job_ids: List[int]) -> List[dict]:
+    """Finds all jobs whose jobId is in the given list, in a single query."""
+    return list(jobs_collection().find({"jobId": {"$in": [int(j) for j in job_ids]}}, {"_id": 0}))
+
+def find_job_skills(job_ids: Optional[Iterable[int]] = None) -> Iterable[dict]:
+    """Streams only the jobId and skillsRequired of every job (or of `job_ids`), for building in-memory indexes."""
+    q = {"jobId": {"$in": [int(j) for j in job_ids]}} if job_ids is not None else {}
+    return jobs_collection().find(q, {"_id": 0, "jobId": 1, "skillsRequired": 1})
+
+def find_job_search_fields(job_ids: Optional[Iterable[int]] = None) -> Iterable[dict]:
+    """Streams the jobId and full-text fields of every job (or of `job_ids`), for building text indexes."""
+    q = {"jobId": {"$in": [int(j) for j in job_ids]}} if job_ids is not None else {}
+    return jobs_collection().find(q, {"_id": 0, "jobId": 1, "title": 1, "description": 1, "skillsRequired": 1})
+
+def find_distinct_skills() -> List[str]:
+    """Every skill name any job requires."""
+    return [s for s in jobs_collection().distinct("skillsRequired") if isinstance(s, str)]
+
+def find_job_ids() -> Iterable[int]:
+    """Streams every jobId, served from the jobId index alone."""
+    return (int(d["jobId"]) for d in jobs_collection().find({}, {"_id": 0, "jobId": 1}))
+
+def jobs_fingerprint() -> Tuple[int, Optional[int]]:
+    """(number of jobs, highest jobId), a cheap check that a saved index still describes the collection."""
+    col = jobs_collection()
+    last = col.find_one({}, {"_id": 0, "jobId": 1}, sort=[("jobId", -1)])
+    return col.count_documents({}), (int(last["jobId"]) if last else None)
 
 def insert_job(doc: dict) -> None:
     """Inserts a new job document into the database."""
+    doc = with_search_fields(doc)
     jobs_collection().insert_one(doc)
+    adjust_job_stats(Counter([stats_key(doc)]))
 
 def update_one_job(q: Dict[str, Any], set_fields: Dict[str, Any]) -> Optional[dict]:
     """Finds one job and updates it."""
-    return jobs_collection().find_one_and_update(
-        q,
-        {"$set": set_fields},
-        projection={"_id": 0},
-        return_document=ReturnDocument.AFTER,
+    fields = with_search_fields(set_fields)
+    if "company" not in fields and "location" not in fields:
+        return jobs_collection().find_one_and_update(
+            q, {"$set": fields}, projection={"_id": 0}, return_document=ReturnDocument.AFTER,
+        )
+    # The job may move between counters, so read the values it had before the update.
+    before = jobs_collection().find_one_and_update(
+        q, {"$set": fields}, projection={"_id": 0}, return_document=ReturnDocument.BEFORE,
     )
+    if before is None:
+        return None
+    after = {**before, **fields}
+    if stats_key(before) != stats_key(after):
+        adjust_job_stats(Counter({stats_key(before): -1, stats_key(after): 1}))
+    return after
 
 def delete_one_job(q: Dict[str, Any]) -> int:
     """Deletes one job matching the query."""
-    res = jobs_collection().delete_one(q)
-    return int(res.deleted_count)
\ No newline at end of file
+    deleted = jobs_collection().find_one_and_delete(q, projection=_STATS_PROJECTION)
+    if deleted is None:
+        return 0
+    adjust_job_stats(Counter({stats_key(deleted): -1}))
+    return 1
+
+def find_existing_job_ids(job_ids: Iterable[int]) -> Set[int]:
+    """Returns which of `job_ids` exist, in one query."""
+    ids = [int(i) for i in job_ids]
+    return {int(d["jobId"]) for d in jobs_collection().find({"jobId": {"$in": ids}}, {"_id": 0, "jobId": 1})}
+
+def insert_jobs(docs: List[dict], ordered: bool = True) -> Dict[int, str]:
+    """
+    Inserts many jobs in one insert_many; returns {position: error} for the
+    documents that failed. With `ordered`, nothing after the first failure is written.
+    """
+    if not docs:
+        return {}
+    docs = [with_search_fields(d) for d in docs]
+    errors: Dict[int, str] = {}
+    try:
+        jobs_collection().insert_many(docs, ordered=ordered)
+    except BulkWriteError as e:
+        errors = bulk_write_errors(e)
+    adjust_job_stats(Counter(stats_key(docs[p]) for p in applied_positions(len(docs), errors, ordered)))
+    return errors
+
+def update_jobs(updates: List[Tuple[int, Dict[str, Any]]], ordered: bool = True) -> Dict[int, str]:
+    """
+    Applies (jobId, set_fields) pairs; returns {position: error}. Runs of
+    updates that leave company and location alone go in one bulk_write each.
+    An update that changes them may move the job between job_stats counters,
+    so, as in `update_one_job`, it is applied on its own to read the values
+    it replaced; reading them beforehand would race with other writers.
+    """
+    if not updates:
+        return {}
+    updates = [(int(job_id), with_search_fields(fields)) for job_id, fields in updates]
+    errors: Dict[int, str] = {}
+    deltas: Counter = Counter()
+    position = 0
+    while position < len(updates) and not (ordered and errors):
+        job_id, fields = updates[position]
+        if _moves(fields):
+            try:
+                before = jobs_collection().find_one_and_update(
+                    {"jobId": job_id}, {"$set": fields}, projection=_STATS_PROJECTION, return_document=ReturnDocument.BEFORE,
+                )
+            except OperationFailure as e:
+                errors[position] = operation_error(e)
+            else:
+                if before is not None:
+                    deltas[stats_key(before)] -= 1
+                    deltas[stats_key({**before, **fields})] += 1
+            position += 1
+            continue
+        end = position + 1
+        while end < len(updates) and not _moves(updates[end][1]):
+            end += 1
+        try:
+            jobs_collection().bulk_write([UpdateOne({"jobId": j}, {"$set": f}) for j, f in updates[position:end]], ordered=ordered)
+        except BulkWriteError as e:
+            errors.update({position + index: message for index, message in bulk_write_errors(e).items()})
+        position = end
+    adjust_job_stats(deltas)
+    return errors
+
+def _moves(fields: Dict[str, Any]) -> bool:
+    return "company" in fields or "location" in fields
+
+def delete_jobs(job_ids: List[int], ordered: bool = True) -> Dict[int, str]:
+    """Deletes jobs by id in one bulk_write; returns {position: error}."""
+    if not job_ids:
+        return {}
+    job_ids = [int(job_id) for job_id in job_ids]
+    keys = _stats_keys(job_ids)
+    errors: Dict[int, str] = {}
+    try:
+        jobs_collection().bulk_write([DeleteOne({"jobId": job_id}) for job_id in job_ids], ordered=ordered)
+    except BulkWriteError as e:
+        errors = bulk_write_errors(e)
+    deltas: Counter = Counter()
+    for position in applied_positions(len(job_ids), errors, ordered):
+        key = keys.pop(job_ids[position], None)  # None for ids that did not exist or repeat
+        if key is not None:
+            deltas[key] -= 1
+    adjust_job_stats(deltas)
+    return errors
+
+def _stats_keys(job_ids: List[int]) -> Dict[int, Tuple[Optional[str], Optional[str]]]:
+    """{jobId: stats key} for the existing jobs among `job_ids`, in one query."""
+    if not job_ids:
+        return {}
+    cursor = jobs_collection().find({"jobId": {"$in": list(set(job_ids))}}, _STATS_PROJECTION)
+    return {int(d["jobId"]): stats_key(d) for d in cursor}
+
+def job_facets(q: Dict[str, Any], limit: int) -> dict:
+    """
+    Counts the jobs matching `q` and their top `limit` locations, companies and
+    skills in one $facet aggregation. Locations and companies are grouped
+    case-insensitively and labelled with one of their original spellings.
+    """
+    def top(field: str, label: str) -> List[dict]:
+        return [
+            {"$group": {"_id": f"${field}", "value": {"$first": f"${label}"}, "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+            {"$limit": limit},
+            {"$project": {"_id": 0, "value": 1, "count": 1}},
+        ]
+    rows = list(jobs_collection().aggregate([
+        {"$match": q},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "byLocation": top("locationNorm", "location"),
+            "byCompany": top("companyNorm", "company"),
+            "bySkill": [{"$unwind": "$skillsRequired"}] + top("skillsRequired", "skillsRequired"),
+        }},
+    ]))
+    facets = rows[0] if rows else {}
+    total = facets.get("total") or [{"count": 0}]
+    return {
+        "total": int(total[0]["count"]),
+        "byLocation": facets.get("byLocation", []),
+        "byCompany": facets.get("byCompany", []),
+        "bySkill": facets.get("bySkill", []),
+    }
+
+def backfill_search_fields(batch_size: int = 1000) -> int:
+    """Recomputes the normalized shadow fields on every job; the migration path for existing data."""
+    col = jobs_collection()
+    updated, ops = 0, []
+    for doc in col.find({}, {"_id": 1, "company": 1, "location": 1, "title": 1}):
+        fields = {k: doc.get(k) for k in ("company", "location", "title")}
+        shadow = {k: v for k, v in with_search_fields(fields).items() if k not in fields}
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": shadow}))
+        if len(ops) >= batch_size:
+            updated += col.bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        updated += col.bulk_write(ops, ordered=False).modified_count
+    return updated
\ No newline at end of file
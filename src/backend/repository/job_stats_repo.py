@@ -0,0 +1,60 @@
+from collections import Counter
+from typing import Optional, Tuple
+from pymongo import UpdateOne
+from ..db import job_stats_collection, jobs_collection
+from ..validators.common_validators import normalize_ci
+
+# Materialized job counts, one document per (company, location) pair of the
+# normalized shadow fields. job_repo adjusts them on every job write, so counts
+# are read from a handful of small documents instead of counting jobs.
+# rebuild_job_stats() recomputes them from scratch, e.g. after a bulk import.
+
+StatsKey = Tuple[Optional[str], Optional[str]]
+
+def stats_key(doc: dict) -> StatsKey:
+    """The (companyNorm, locationNorm) counter a job document counts towards."""
+    return doc.get("companyNorm"), doc.get("locationNorm")
+
+def adjust_job_stats(deltas: Counter) -> None:
+    """Applies {stats key: change in job count} in one bulk write."""
+    ops = [
+        UpdateOne({"company": company, "location": location}, {"$inc": {"count": delta}}, upsert=True)
+        for (company, location), delta in deltas.items() if delta
+    ]
+    if ops:
+        job_stats_collection().bulk_write(ops, ordered=False)
+
+def count_jobs(company: Optional[str] = None, location: Optional[str] = None) -> int:
+    """Number of jobs at `company` and/or `location` (case-insensitive), summed from the counters."""
+    q = {}
+    if company:
+        q["company"] = normalize_ci(company)
+    if location:
+        q["location"] = normalize_ci(location)
+    rows = job_stats_collection().aggregate([
+        {"$match": q},
+        {"$group": {"_id": None, "total": {"$sum": "$count"}}},
+    ])
+    return next((int(row["total"]) for row in rows), 0)
+
+def rebuild_job_stats() -> int:
+    """
+    Recomputes every counter from the jobs collection in one aggregation that
+    replaces job_stats via $out (its indexes are kept). Returns the number of counters.
+    """
+    jobs_collection().aggregate([
+        {"$group": {"_id": {"company": "$companyNorm", "location": "$locationNorm"}, "count": {"$sum": 1}}},
+        {"$project": {
+            "_id": 0,
+            "company": {"$ifNull": ["$_id.company", None]},
+            "location": {"$ifNull": ["$_id.location", None]},
+            "count": 1,
+        }},
+        {"$out": job_stats_collection().name},
+    ])
+    return job_stats_collection().count_documents({})
+
+def ensure_job_stats() -> None:
+    """Builds the counters on first start against an existing jobs collection."""
+    if job_stats_collection().estimated_document_count() == 0 and jobs_collection().estimated_document_count() > 0:
+        rebuild_job_stats()
@@ -0,0 +1,89 @@
+import base64
+import os
+from typing import Optional, Dict, Any, List, Tuple, Callable
+from pymongo import ASCENDING
+from pymongo.collection import Collection
+
+DEFAULT_PAGE_SIZE = 20
+# Plain list fields (users, jobs, applications, ...) return this many items when
+# no `limit` is given, and no page of any kind is larger than MAX_PAGE_SIZE.
+DEFAULT_LIST_LIMIT = int(os.getenv("GRAPHQL_DEFAULT_LIMIT", "100"))
+MAX_PAGE_SIZE = int(os.getenv("GRAPHQL_MAX_PAGE_SIZE", "500"))
+
+def encode_cursor(kind: str, key: int) -> str:
+    """Encodes a sort key as an opaque cursor string."""
+    return base64.urlsafe_b64encode(f"{kind}:{int(key)}".encode("utf-8")).decode("ascii")
+
+def decode_cursor(kind: str, cursor: Optional[str]) -> Optional[int]:
+    """Decodes a cursor produced by encode_cursor for the same kind."""
+    if not cursor:
+        return None
+    try:
+        prefix, key = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split(":", 1)
+        if prefix == kind:
+            return int(key)
+    except (ValueError, UnicodeError):
+        pass
+    raise ValueError("Invalid pagination cursor.")
+
+def _after(q: Dict[str, Any], key_field: str, after: Optional[int]) -> Dict[str, Any]:
+    if after is None:
+        return q
+    key_filter = {key_field: {"$gt": int(after)}}
+    return {"$and": [q, key_filter]} if q else key_filter
+
+def find_page(
+    col: Collection,
+    q: Dict[str, Any],
+    key_field: str,
+    after: Optional[int],
+    first: int,
+    projection: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[dict], bool]:
+    """
+    Keyset pagination: returns up to `first` documents with key_field > after,
+    in key order, plus whether another page follows. Cost is independent of
+    how deep the page is, unlike skip().
+    """
+    cursor = col.find(_after(q, key_field, after), projection or {"_id": 0}).sort(key_field, ASCENDING).limit(int(first) + 1)
+    docs = list(cursor)
+    return docs[:first], len(docs) > first
+
+async def find_page_async(
+    col,
+    q: Dict[str, Any],
+    key_field: str,
+    after: Optional[int],
+    first: int,
+    projection: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[dict], bool]:
+    """find_page for an AsyncCollection."""
+    cursor = col.find(_after(q, key_field, after), projection or {"_id": 0}).sort(key_field, ASCENDING).limit(int(first) + 1)
+    docs = await cursor.to_list()
+    return docs[:first], len(docs) > first
+
+def to_connection(kind: str, key_field: str, docs: List[dict], has_next: bool, to_output: Callable[[dict], dict]) -> dict:
+    """Formats a page of documents as a Relay-style connection."""
+    edges = [{"cursor": encode_cursor(kind, d[key_field]), "node": to_output(d)} for d in docs]
+    return {
+        "edges": edges,
+        "pageInfo": {
+            "hasNextPage": has_next,
+            "endCursor": edges[-1]["cursor"] if edges else None,
+        },
+    }
+
+def validate_first(first: Optional[int]) -> int:
+    if first is None:
+        return DEFAULT_PAGE_SIZE
+    if int(first) < 0:
+        raise ValueError("'first' must be zero or a positive integer.")
+    return min(int(first), MAX_PAGE_SIZE)
+
+def clamp_page_size(limit: Optional[int], default: int = DEFAULT_LIST_LIMIT) -> int:
+    """The number of items a list field returns: `default` when no limit is given, never more than MAX_PAGE_SIZE."""
+    if limit is None:
+        return min(default, MAX_PAGE_SIZE)
+    if int(limit) < 1:
+        raise ValueError("'limit' must be a positive integer.")
+    return min(int(limit), MAX_PAGE_SIZE)
@@ -1,7 +1,8 @@
-import re
-from typing import Optional, Dict, Any, List
-from pymongo import ReturnDocument
-from ..db import users_collection, counters_collection
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+from pymongo import ReturnDocument, UpdateOne
+from ..db import users_collection, counters_collection, accounts_collection
+from ..validators.common_validators import normalize_ci
+from .pagination import find_page
 
 def to_user_output(doc: dict) -> dict:
     if not doc:
@@ -16,12 +17,21 @@ def to_user_output(doc: dict) -> dict:
         "skills": doc.get("skills"),
     }
 
+def with_search_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns a copy of `fields` plus the case-folded FirstNameNorm/LastNameNorm shadow fields."""
+    out = dict(fields)
+    if "FirstName" in fields:
+        out["FirstNameNorm"] = normalize_ci(fields["FirstName"])
+    if "LastName" in fields:
+        out["LastNameNorm"] = normalize_ci(fields["LastName"])
+    return out
+
 def name_filter_ci(first_name: Optional[str], last_name: Optional[str]) -> Dict[str, Any]:
     q: Dict[str, Any] = {}
     if first_name:
-        q["FirstName"] = {"$regex": f"^{re.escape(first_name)}$", "$options": "i"}
+        q["FirstNameNorm"] = normalize_ci(first_name)
     if last_name:
-        q["LastName"] = {"$regex": f"^{re.escape(last_name)}$", "$options": "i"}
+        q["LastNameNorm"] = normalize_ci(last_name)
     return q
 
 def build_filter(first_name: Optional[str], last_name: Optional[str], dob: Optional[str]) -> Dict[str, Any]:
@@ -30,33 +40,122 @@ def build_filter(first_name: Optional[str], last_name: Optional[str], dob: Optio
         q["DateOfBirth"] = dob
     return q
 
-def find_users(q: Dict[str, Any], skip: Optional[int], limit: Optional[int]) -> List[dict]:
+def find_users(q: Dict[str, Any], skip: Optional[int], limit: Optional[int], projection: Optional[Dict[str, Any]] = None) -> List[dict]:
     col = users_collection()
-    cursor = col.find(q, {"_id": 0})
+    cursor = col.find(q, projection or {"_id": 0})
     if skip is not None:
         cursor = cursor.skip(int(skip))
     if limit is not None:
         cursor = cursor.limit(int(limit))
     return list(cursor)
 
-def find_one_by_id(user_id: int) -> Optional[dict]:
+def find_users_page(q: Dict[str, Any], after: Optional[int], first: int, projection: Optional[Dict[str, Any]] = None) -> Tuple[List[dict], bool]:
+    return find_page(users_collection(), q, "UserID", after, first, projection)
+
+def find_one_by_id(user_id: int, projection: Optional[Dict[str, Any]] = None) -> Optional[dict]:
+    col = users_collection()
+    return col.find_one({"UserID": int(user_id)}, projection or {"_id": 0})
+
+def find_users_by_ids(user_ids: List[int]) -> List[dict]:
     col = users_collection()
-    return col.find_one({"UserID": int(user_id)}, {"_id": 0})
+    return list(col.find({"UserID": {"$in": [int(u) for u in user_ids]}}, {"_id": 0}))
+
+def find_user_skills(user_ids: Optional[Iterable[int]] = None) -> Iterable[dict]:
+    q = {"UserID": {"$in": [int(u) for u in user_ids]}} if user_ids is not None else {}
+    return users_collection().find(q, {"_id": 0, "UserID": 1, "skills": 1})
+
+def find_user_profiles(user_ids: Optional[Iterable[int]] = None) -> Iterable[dict]:
+    """Streams the UserID and free-text profile fields of every user (or of `user_ids`), for building text indexes."""
+    q = {"UserID": {"$in": [int(u) for u in user_ids]}} if user_ids is not None else {}
+    return users_collection().find(q, {"_id": 0, "UserID": 1, "ProfessionalTitle": 1, "Summary": 1, "skills": 1})
+
+def find_distinct_skills() -> List[str]:
+    """Every skill name any user lists."""
+    return [s for s in users_collection().distinct("skills") if isinstance(s, str)]
+
+def find_user_ids() -> Iterable[int]:
+    """Streams every UserID, served from the UserID index alone."""
+    return (int(d["UserID"]) for d in users_collection().find({}, {"_id": 0, "UserID": 1}))
+
+def find_user_ids_by_email(emails: List[str]) -> Dict[str, int]:
+    """{email: UserID} for the job-seeker accounts among `emails`, in one query."""
+    if not emails:
+        return {}
+    docs = accounts_collection().find({"email": {"$in": list(set(emails))}, "role": "user"}, {"_id": 1, "email": 1})
+    return {d["email"]: int(d["_id"]) for d in docs}
+
+def merge_resume_profiles(profiles: List[Tuple[int, dict]]) -> int:
+    """
+    Merges parsed resume fields into user profiles with at most one update per
+    user, in one unordered bulk_write. Skills are added to the existing list
+    unless the profile already has them in any letter case, while
+    ProfessionalTitle and Summary only fill fields that are empty. Several
+    resumes for one user are merged first. Returns the number of profiles
+    modified.
+
+    The current profiles are read first; each update is guarded by the state it
+    was computed from, so a profile edited in between is left as it is.
+    """
+    merged: Dict[int, dict] = {}
+    for user_id, parsed in profiles:
+        entry = merged.setdefault(int(user_id), {"skills": []})
+        entry["skills"].extend(parsed.get("skills") or [])
+        for field in ("ProfessionalTitle", "Summary"):
+            if parsed.get(field) and not entry.get(field):
+                entry[field] = parsed[field]
+    if not merged:
+        return 0
+
+    current = {
+        int(d["UserID"]): d
+        for d in users_collection().find({"UserID": {"$in": list(merged)}}, {"_id": 0, "UserID": 1, "skills": 1, "ProfessionalTitle": 1, "Summary": 1})
+    }
+    ops = []
+    for user_id, entry in merged.items():
+        doc = current.get(user_id)
+        if doc is None:
+            continue
+        existing = doc.get("skills")
+        has_list = isinstance(existing, list)
+        seen = {s.casefold() for s in existing if isinstance(s, str)} if has_list else set()
+        new_skills = []
+        for skill in entry["skills"]:
+            if skill.casefold() not in seen:
+                seen.add(skill.casefold())
+                new_skills.append(skill)
+        query: Dict[str, Any] = {"UserID": user_id}
+        update: Dict[str, Any] = {}
+        if new_skills:
+            if has_list:
+                query["skills"] = {"$type": "array"}
+                update["$addToSet"] = {"skills": {"$each": new_skills}}
+            else:
+                query["skills"] = {"$not": {"$type": "array"}}
+                update["$set"] = {"skills": new_skills}
+        for field in ("ProfessionalTitle", "Summary"):
+            if entry.get(field) and doc.get(field) in (None, ""):
+                query[field] = {"$in": [None, ""]}
+                update.setdefault("$set", {})[field] = entry[field]
+        if update:
+            ops.append(UpdateOne(query, update))
+    if not ops:
+        return 0
+    return int(users_collection().bulk_write(ops, ordered=False).modified_count)
 
 def insert_user(doc: dict) -> None:
-    users_collection().insert_one(doc)
+    users_collection().insert_one(with_search_fields(doc))
 
 def update_one(q: Dict[str, Any], set_fields: Dict[str, Any]) -> Optional[dict]:
     col = users_collection()
     return col.find_one_and_update(
         q,
-        {"$set": set_fields},
+        {"$set": with_search_fields(set_fields)},
         projection={"_id": 0},
         return_document=ReturnDocument.AFTER,
     )
 
 def update_many(q: Dict[str, Any], set_fields: Dict[str, Any]) -> int:
-    res = users_collection().update_many(q, {"$set": set_fields})
+    res = users_collection().update_many(q, {"$set": with_search_fields(set_fields)})
     return int(res.modified_count)
 
 def delete_one(q: Dict[str, Any]) -> int:
@@ -65,4 +164,20 @@ def delete_one(q: Dict[str, Any]) -> int:
 
 def delete_many(q: Dict[str, Any]) -> int:
     res = users_collection().delete_many(q)
-    return int(res.deleted_count)
\ No newline at end of file
+    return int(res.deleted_count)
+
+def backfill_search_fields(batch_size: int = 1000) -> int:
+    """Recomputes FirstNameNorm/LastNameNorm on every user; the migration path for existing data."""
+    col = users_collection()
+    updated, ops = 0, []
+    for doc in col.find({}, {"_id": 1, "FirstName": 1, "LastName": 1}):
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {
+            "FirstNameNorm": normalize_ci(doc.get("FirstName")),
+            "LastNameNorm": normalize_ci(doc.get("LastName")),
+        }}))
+        if len(ops) >= batch_size:
+            updated += col.bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        updated += col.bulk_write(ops, ordered=False).modified_count
+    return updated
\ No newline at end of file
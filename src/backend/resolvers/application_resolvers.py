@@ -1,47 +1,67 @@
 from datetime import datetime
 from ariadne import QueryType, MutationType, ObjectType
+from pymongo.errors import DuplicateKeyError
 from ..db import next_application_id, to_application_output
-from ..validators.common_validators import clean_update_input
+from ..validators.common_validators import clean_update_input, require_non_empty_str
 from ..repository import user_repo, job_repo, application_repo
+from ..dataloaders import get_loaders
+from ..repository.pagination import clamp_page_size, decode_cursor, to_connection, validate_first
+from .bulk import BulkPlan
+from .projection import build_projection, APPLICATION_FIELD_DEPENDENCIES
 
 query = QueryType()
 mutation = MutationType()
 application = ObjectType("Application")
 
+def _queue_related(info, docs):
+    # Let nested candidate/job fields resolve with one $in query per collection.
+    loaders = get_loaders(info.context)
+    loaders["users"].queue(d.get("userId") for d in docs)
+    loaders["jobs"].queue(d.get("jobId") for d in docs)
+
 @query.field("applications")
-def resolve_applications(_, info, userId=None, jobId=None, status=None):
+def resolve_applications(_, info, limit=None, skip=None, userId=None, jobId=None, status=None):
     # AUTH REMOVED: Public Query
     
-    q = {}
-    if userId: q["userId"] = int(userId)
-    if jobId: q["jobId"] = int(jobId)
-    if status: q["status"] = status
-    
-    docs = application_repo.find_applications(q)
+    q = application_repo.build_application_filter(userId, jobId, status)
+    projection = build_projection(info, required=["appId"], dependencies=APPLICATION_FIELD_DEPENDENCIES)
+    docs = application_repo.find_applications(q, projection, skip, clamp_page_size(limit))
+    _queue_related(info, docs)
     return [to_application_output(d) for d in docs]
 
+@query.field("applicationsConnection")
+def resolve_applications_connection(_, info, first=None, after=None, userId=None, jobId=None, status=None):
+    # Public Query
+    q = application_repo.build_application_filter(userId, jobId, status)
+    first = validate_first(first)
+    projection = build_projection(info, ("edges", "node"), required=["appId"], dependencies=APPLICATION_FIELD_DEPENDENCIES)
+    docs, has_next = application_repo.find_applications_page(q, decode_cursor("application", after), first, projection)
+    _queue_related(info, docs)
+    return to_connection("application", "appId", docs, has_next, to_application_output)
+
 @query.field("applicationById")
 def resolve_application_by_id(_, info, appId):
     # AUTH REMOVED: Public Query
         
-    doc = application_repo.find_application_by_id(int(appId))
+    projection = build_projection(info, required=["appId"], dependencies=APPLICATION_FIELD_DEPENDENCIES)
+    doc = application_repo.find_application_by_id(int(appId), projection)
     if not doc:
         raise ValueError(f"Application with ID {appId} not found.")
     return to_application_output(doc)
 
 @application.field("candidate")
-def resolve_application_candidate(app_obj, _):
+def resolve_application_candidate(app_obj, info):
     user_id = app_obj.get("userId")
     if not user_id:
         return None
-    return user_repo.to_user_output(user_repo.find_one_by_id(user_id))
+    return user_repo.to_user_output(get_loaders(info.context)["users"].load(user_id))
 
 @application.field("job")
-def resolve_application_job(app_obj, _):
+def resolve_application_job(app_obj, info):
     job_id = app_obj.get("jobId")
     if not job_id:
         return None
-    return job_repo.to_job_output(job_repo.find_job_by_id(job_id))
+    return job_repo.to_job_output(get_loaders(info.context)["jobs"].load(job_id))
 
 @mutation.field("apply")
 def resolve_apply(_, info, jobTitle, companyName=None):
@@ -77,7 +97,37 @@ def resolve_apply(_, info, jobTitle, companyName=None):
         "status": "Applied",
         "submittedAt": datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
     }
-    application_repo.insert_application(doc)
+    try:
+        application_repo.insert_application(doc)
+    except DuplicateKeyError:
+        # Lost a race with a concurrent apply; the unique (userId, jobId) index caught it.
+        raise ValueError("You have already applied for this job.")
     return to_application_output(doc)
 
-# ... (other mutations like updateApplication would also have role checks removed)
\ No newline at end of file
+# ... (other mutations like updateApplication would also have role checks removed)
+
+def _application_update_fields(input):
+    set_fields = clean_update_input(input)
+    if not set_fields:
+        raise ValueError("No fields provided to update.")
+    if "status" in set_fields:
+        set_fields["status"] = require_non_empty_str(set_fields["status"], "status")
+    return set_fields
+
+@mutation.field("updateApplications")
+def resolve_update_applications(_, info, updates, ordered=True):
+    # Bulk status/notes changes in one bulk_write; failures are reported per item.
+    user = info.context.get("user")
+    user_id = user.get("sub") if user else None
+    if not user_id:
+        raise PermissionError("Access denied: Authentication required.")
+
+    plan = BulkPlan(updates, ordered, lambda item: (int(item["appId"]), _application_update_fields(item.get("input"))))
+    existing = {d["appId"] for d in application_repo.find_applications_by_ids(app_id for app_id, _ in plan.values())}
+    plan.reject(lambda u: u[0] not in existing, lambda u: f"Application with ID {u[0]} not found.")
+    plan.stop_at_first_error()
+    plan.record_write_errors(application_repo.update_applications(plan.values(), ordered))
+    by_id = {d["appId"]: d for d in application_repo.find_applications_by_ids(app_id for app_id, _ in plan.values())}
+    updated = [by_id[app_id] for app_id, _ in plan.values() if app_id in by_id]
+    _queue_related(info, updated)
+    return {"applications": [to_application_output(d) for d in updated], "errors": plan.error_list()}
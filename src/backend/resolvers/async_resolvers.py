@@ -0,0 +1,96 @@
+from ariadne import QueryType, ObjectType
+from ..db import to_application_output
+from ..validators.common_validators import validate_date_str
+from ..repository import user_repo, job_repo, application_repo
+from ..repository import async_user_repo, async_job_repo, async_application_repo
+from ..repository.pagination import clamp_page_size, decode_cursor, to_connection, validate_first
+from .projection import build_projection, APPLICATION_FIELD_DEPENDENCIES
+
+# Async overrides for the read paths, bound on top of the sync resolvers by the
+# ASGI entry point. They await the async MongoDB driver instead of blocking the
+# event loop; everything else keeps its sync resolver (see asgi.py).
+
+query = QueryType()
+application = ObjectType("Application")
+
+@query.field("jobs")
+async def resolve_jobs(_, info, limit=None, skip=None, company=None, location=None, title=None):
+    q = job_repo.build_job_filter(company, location, title)
+    docs = await async_job_repo.find_jobs(q, skip, clamp_page_size(limit), build_projection(info, required=["jobId"]))
+    return [job_repo.to_job_output(d) for d in docs]
+
+@query.field("jobsConnection")
+async def resolve_jobs_connection(_, info, first=None, after=None, company=None, location=None, title=None):
+    q = job_repo.build_job_filter(company, location, title)
+    first = validate_first(first)
+    projection = build_projection(info, ("edges", "node"), required=["jobId"])
+    docs, has_next = await async_job_repo.find_jobs_page(q, decode_cursor("job", after), first, projection)
+    return to_connection("job", "jobId", docs, has_next, job_repo.to_job_output)
+
+@query.field("jobById")
+async def resolve_job_by_id(_, info, jobId):
+    doc = await async_job_repo.find_job_by_id(int(jobId), build_projection(info, required=["jobId"]))
+    if not doc:
+        raise ValueError(f"Job with ID {jobId} not found.")
+    return job_repo.to_job_output(doc)
+
+@query.field("users")
+async def resolve_users(_, info, limit=None, skip=None, FirstName=None, LastName=None, DateOfBirth=None):
+    if DateOfBirth:
+        DateOfBirth = validate_date_str(DateOfBirth)
+    q = user_repo.build_filter(FirstName, LastName, DateOfBirth)
+    docs = await async_user_repo.find_users(q, skip, clamp_page_size(limit), build_projection(info, required=["UserID"]))
+    return [user_repo.to_user_output(d) for d in docs]
+
+@query.field("usersConnection")
+async def resolve_users_connection(_, info, first=None, after=None, FirstName=None, LastName=None, DateOfBirth=None):
+    if DateOfBirth:
+        DateOfBirth = validate_date_str(DateOfBirth)
+    q = user_repo.build_filter(FirstName, LastName, DateOfBirth)
+    first = validate_first(first)
+    projection = build_projection(info, ("edges", "node"), required=["UserID"])
+    docs, has_next = await async_user_repo.find_users_page(q, decode_cursor("user", after), first, projection)
+    return to_connection("user", "UserID", docs, has_next, user_repo.to_user_output)
+
+@query.field("userById")
+async def resolve_user_by_id(_, info, UserID):
+    doc = await async_user_repo.find_one_by_id(int(UserID), build_projection(info, required=["UserID"]))
+    return user_repo.to_user_output(doc)
+
+@query.field("applications")
+async def resolve_applications(_, info, limit=None, skip=None, userId=None, jobId=None, status=None):
+    q = application_repo.build_application_filter(userId, jobId, status)
+    projection = build_projection(info, required=["appId"], dependencies=APPLICATION_FIELD_DEPENDENCIES)
+    docs = await async_application_repo.find_applications(q, projection, skip, clamp_page_size(limit))
+    return [to_application_output(d) for d in docs]
+
+@query.field("applicationsConnection")
+async def resolve_applications_connection(_, info, first=None, after=None, userId=None, jobId=None, status=None):
+    q = application_repo.build_application_filter(userId, jobId, status)
+    first = validate_first(first)
+    projection = build_projection(info, ("edges", "node"), required=["appId"], dependencies=APPLICATION_FIELD_DEPENDENCIES)
+    docs, has_next = await async_application_repo.find_applications_page(q, decode_cursor("application", after), first, projection)
+    return to_connection("application", "appId", docs, has_next, to_application_output)
+
+@query.field("applicationById")
+async def resolve_application_by_id(_, info, appId):
+    projection = build_projection(info, required=["appId"], dependencies=APPLICATION_FIELD_DEPENDENCIES)
+    doc = await async_application_repo.find_application_by_id(int(appId), projection)
+    if not doc:
+        raise ValueError(f"Application with ID {appId} not found.")
+    return to_application_output(doc)
+
+# Nested lookups go through the tick-batched loaders in the request context.
+@application.field("candidate")
+async def resolve_application_candidate(app_obj, info):
+    user_id = app_obj.get("userId")
+    if not user_id:
+        return None
+    return user_repo.to_user_output(await info.context["async_loaders"]["users"].load(user_id))
+
+@application.field("job")
+async def resolve_application_job(app_obj, info):
+    job_id = app_obj.get("jobId")
+    if not job_id:
+        return None
+    return job_repo.to_job_output(await info.context["async_loaders"]["jobs"].load(job_id))
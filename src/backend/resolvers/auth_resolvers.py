@@ -1,6 +1,9 @@
 from ariadne import MutationType
-from ..db import accounts_collection, users_collection, next_user_id
+from pymongo.errors import DuplicateKeyError
+from ..db import accounts_collection, next_user_id
+from ..repository import user_repo
 from ..services import auth_service
+from .user_resolvers import index_user
 from datetime import datetime
 
 mutation = MutationType()
@@ -26,7 +29,11 @@ def resolve_register(*_, email, password, role):
         "role": role,
         "createdAt": datetime.utcnow()
     }
-    accounts_collection().insert_one(account_doc)
+    try:
+        accounts_collection().insert_one(account_doc)
+    except DuplicateKeyError:
+        # Lost a race with a concurrent registration of the same email.
+        raise ValueError("An account with this email already exists.")
 
     # If it's a job seeker, create a linked user profile
     if role == "user":
@@ -36,12 +43,22 @@ def resolve_register(*_, email, password, role):
             "LastName": "User",
             "skills": []
         }
-        users_collection().insert_one(user_doc)
+        user_repo.insert_user(user_doc)
+        index_user(user_doc)
         
     # Create JWT
     token = auth_service.create_token(account_id=new_id, email=email, role=role)
     return {"token": token}
 
+@mutation.field("logout")
+def resolve_logout(_, info):
+    """Revokes the bearer token the request was made with."""
+    auth_header = info.context["request"].headers.get("Authorization") or ""
+    if not info.context.get("user") or not auth_header.startswith("Bearer "):
+        raise PermissionError("Access denied: You must be logged in to log out.")
+    auth_service.revoke_token(auth_header.split(" ")[1])
+    return True
+
 @mutation.field("login")
 def resolve_login(*_, email, password):
     account = accounts_collection().find_one({"email": email})
@@ -49,6 +66,13 @@ def resolve_login(*_, email, password):
     if not account or not auth_service.check_password(password, account["password"]):
         raise ValueError("Invalid email or password.")
 
+    # Transparent cost upgrade: re-hash with the current BCRYPT_ROUNDS while we have the plaintext.
+    if auth_service.needs_rehash(account["password"]):
+        accounts_collection().update_one(
+            {"_id": account["_id"]},
+            {"$set": {"password": auth_service.hash_password(password)}},
+        )
+
     token = auth_service.create_token(
         account_id=account["_id"],
         email=account["email"],
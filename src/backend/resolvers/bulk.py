@@ -0,0 +1,69 @@
+import os
+from typing import Any, Callable, Dict, List, Tuple
+
+# Upper bound on items in one bulk mutation; larger feeds should be sent in chunks.
+MAX_BULK_ITEMS = int(os.getenv("MAX_BULK_ITEMS", "10000"))
+NOT_ATTEMPTED = "Not attempted: an earlier item failed."
+
+class BulkPlan:
+    """
+    Tracks the items of a bulk mutation through validation and the write.
+
+    `pending` holds (input index, value) for the items still going ahead;
+    every other item has an entry in `errors`. In ordered mode the first
+    failure stops the batch, so every later item is reported as not attempted,
+    which matches MongoDB's ordered bulk write semantics.
+    """
+
+    def __init__(self, items: List[Any], ordered: bool, prepare: Callable[[Any], Any]):
+        if len(items) > MAX_BULK_ITEMS:
+            raise ValueError(f"A bulk mutation accepts at most {MAX_BULK_ITEMS} items.")
+        self.ordered = ordered
+        self.pending: List[Tuple[int, Any]] = []
+        self.errors: Dict[int, str] = {}
+        for index, item in enumerate(items):
+            try:
+                self.pending.append((index, prepare(item)))
+            except ValueError as e:
+                self.errors[index] = str(e)
+
+    def values(self) -> List[Any]:
+        return [value for _, value in self.pending]
+
+    def reject(self, predicate: Callable[[Any], bool], message: Callable[[Any], str]) -> None:
+        """Fails every pending item whose value matches `predicate`."""
+        kept = []
+        for index, value in self.pending:
+            if predicate(value):
+                self.errors[index] = message(value)
+            else:
+                kept.append((index, value))
+        self.pending = kept
+
+    def reject_repeats(self, key: Callable[[Any], Any], message: Callable[[Any], str]) -> None:
+        """Fails every pending item whose `key` already appeared earlier in the batch."""
+        seen = set()
+        self.reject(lambda value: key(value) in seen or seen.add(key(value)), message)
+
+    def stop_at_first_error(self) -> None:
+        """In ordered mode, drops the pending items that come after the first failure."""
+        if not (self.ordered and self.errors):
+            return
+        first = min(self.errors)
+        for index, _ in self.pending:
+            if index > first:
+                self.errors[index] = NOT_ATTEMPTED
+        self.pending = [(index, value) for index, value in self.pending if index < first]
+
+    def record_write_errors(self, write_errors: Dict[int, str]) -> None:
+        """Applies {position in pending: message} from a bulk write."""
+        if not write_errors:
+            return
+        for position, message in write_errors.items():
+            self.errors[self.pending[position][0]] = message
+        failed = {self.pending[position][0] for position in write_errors}
+        self.pending = [(index, value) for index, value in self.pending if index not in failed]
+        self.stop_at_first_error()
+
+    def error_list(self) -> List[dict]:
+        return [{"index": index, "message": self.errors[index]} for index in sorted(self.errors)]
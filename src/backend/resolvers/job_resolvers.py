@@ -2,25 +2,100 @@ from datetime import datetime
 from ariadne import QueryType, MutationType
 from ..validators.common_validators import require_non_empty_str, clean_update_input
 from ..repository.job_repo import (
-    build_job_filter, find_jobs, find_job_by_id,
-    insert_job, update_one_job, delete_one_job, to_job_output
+    build_job_filter, find_jobs, find_jobs_page, find_job_by_id, find_jobs_by_ids, find_existing_job_ids,
+    insert_job, insert_jobs, update_one_job, update_jobs, delete_one_job, delete_jobs, to_job_output
 )
-from ..db import next_job_id
+from ..repository.pagination import clamp_page_size, decode_cursor, to_connection, validate_first
+from .bulk import BulkPlan
+from .projection import build_projection
+from ..db import next_job_id, reserve_job_ids
+from ..repository import change_log_repo
+from ..services.skill_index_service import job_skill_index
+from ..services.search_index_service import job_search_index
+from ..services.embedding_service import semantic_index
+from ..services.response_cache_service import response_cache
 
 query = QueryType()
 mutation = MutationType()
 
+# --- In-memory index hooks ---
+# Every job write goes through these so the derived indexes and cached responses stay in sync:
+# this process's indexes are patched directly, the other workers' via the change log.
+def index_jobs(docs):
+    docs = list(docs)
+    for doc in docs:
+        job_skill_index.add_job(doc)
+        job_search_index.add_job(doc)
+        semantic_index.add_job(doc)
+    change_log_repo.record_changes("jobs", (doc["jobId"] for doc in docs))
+    response_cache.invalidate("jobs")
+
+def unindex_jobs(job_ids):
+    job_ids = list(job_ids)
+    for job_id in job_ids:
+        job_skill_index.remove_job(job_id)
+        job_search_index.remove_job(job_id)
+        semantic_index.remove_job(job_id)
+    change_log_repo.record_changes("jobs", job_ids)
+    response_cache.invalidate("jobs")
+
+def _require_user_id(info):
+    user = info.context.get("user")
+    user_id = user.get("sub") if user else None
+    if not user_id:
+        raise PermissionError("Access denied: Authentication required.")
+    return user_id
+
+def _new_job_doc(input, job_id, user_id):
+    title = require_non_empty_str(input.get("title"), "title")
+    return {
+        "jobId": job_id,
+        "title": title,
+        "company": input.get("company"),
+        "location": input.get("location"),
+        "skillsRequired": input.get("skillsRequired", []),
+        "description": input.get("description"),
+        "postedAt": datetime.utcnow().strftime('%Y-%m-%d'),
+        "recruiterId": user_id,  # Keep tracking the creator
+    }
+
+def _update_fields(input):
+    set_fields = clean_update_input(input)
+    if not set_fields:
+        raise ValueError("No fields provided to update.")
+    return set_fields
+
 @query.field("jobs")
-def resolve_jobs(*_, limit=None, skip=None, company=None, location=None, title=None):
+def resolve_jobs(_, info, limit=None, skip=None, company=None, location=None, title=None):
     # Public Query
     q = build_job_filter(company, location, title)
-    docs = find_jobs(q, skip, limit)
+    docs = find_jobs(q, skip, clamp_page_size(limit), build_projection(info, required=["jobId"]))
     return [to_job_output(d) for d in docs]
 
+@query.field("jobsConnection")
+def resolve_jobs_connection(_, info, first=None, after=None, company=None, location=None, title=None):
+    # Public Query
+    q = build_job_filter(company, location, title)
+    first = validate_first(first)
+    projection = build_projection(info, ("edges", "node"), required=["jobId"])
+    docs, has_next = find_jobs_page(q, decode_cursor("job", after), first, projection)
+    return to_connection("job", "jobId", docs, has_next, to_job_output)
+
+@query.field("searchJobs")
+def resolve_search_jobs(_, info, query, limit=None):
+    # Public Query
+    text = require_non_empty_str(query, "query")
+    ranked = job_search_index.search(text, clamp_page_size(limit))
+    if not ranked:
+        return []
+    # Fetch just the hits, then restore the best-first order.
+    jobs_by_id = {j["jobId"]: j for j in find_jobs_by_ids([job_id for job_id, _ in ranked])}
+    return [to_job_output(jobs_by_id[job_id]) for job_id, _ in ranked if job_id in jobs_by_id]
+
 @query.field("jobById")
-def resolve_job_by_id(*_, jobId):
+def resolve_job_by_id(_, info, jobId):
     # Public Query
-    doc = find_job_by_id(int(jobId))
+    doc = find_job_by_id(int(jobId), build_projection(info, required=["jobId"]))
     if not doc:
         raise ValueError(f"Job with ID {jobId} not found.")
     return to_job_output(doc)
@@ -33,19 +108,9 @@ def resolve_create_job(_, info, input):
     if not user_id:
         raise PermissionError("Access denied: Authentication required.")
         
-    title = require_non_empty_str(input.get("title"), "title")
-    
-    doc = {
-        "jobId": next_job_id(),
-        "title": title,
-        "company": input.get("company"),
-        "location": input.get("location"),
-        "skillsRequired": input.get("skillsRequired", []),
-        "description": input.get("description"),
-        "postedAt": datetime.utcnow().strftime('%Y-%m-%d'),
-        "recruiterId": user_id,  # Keep tracking the creator
-    }
+    doc = _new_job_doc(input, next_job_id(), user_id)
     insert_job(doc)
+    index_jobs([doc])
     return to_job_output(doc)
 
 @mutation.field("updateJob")
@@ -65,6 +130,7 @@ def resolve_update_job(_, info, jobId, input):
     updated = update_one_job({"jobId": int(jobId)}, set_fields)
     if not updated:
         raise ValueError(f"Job with ID {jobId} not found.")
+    index_jobs([updated])
     return to_job_output(updated)
 
 @mutation.field("deleteJob")
@@ -78,4 +144,48 @@ def resolve_delete_job(_, info, jobId):
     count = delete_one_job({"jobId": int(jobId)})
     if count == 0:
         raise ValueError(f"Job with ID {jobId} not found.")
-    return True
\ No newline at end of file
+    unindex_jobs([jobId])
+    return True
+
+# --- Bulk mutations ---
+# One insert_many/bulk_write per call instead of one round trip per job.
+# Invalid items are reported in `errors` by input index rather than failing the whole call.
+
+@mutation.field("createJobs")
+def resolve_create_jobs(_, info, inputs, ordered=True):
+    user_id = _require_user_id(info)
+    # Validate before reserving IDs; the placeholder id is replaced below.
+    plan = BulkPlan(inputs, ordered, lambda item: _new_job_doc(item, None, user_id))
+    plan.stop_at_first_error()
+    for doc, job_id in zip(plan.values(), reserve_job_ids(len(plan.pending))):
+        doc["jobId"] = job_id
+    plan.record_write_errors(insert_jobs(plan.values(), ordered))
+    created = plan.values()
+    index_jobs(created)
+    return {"jobs": [to_job_output(d) for d in created], "errors": plan.error_list()}
+
+@mutation.field("updateJobs")
+def resolve_update_jobs(_, info, updates, ordered=True):
+    _require_user_id(info)
+    plan = BulkPlan(updates, ordered, lambda item: (int(item["jobId"]), _update_fields(item.get("input"))))
+    existing = find_existing_job_ids(job_id for job_id, _ in plan.values())
+    plan.reject(lambda u: u[0] not in existing, lambda u: f"Job with ID {u[0]} not found.")
+    plan.stop_at_first_error()
+    plan.record_write_errors(update_jobs(plan.values(), ordered))
+    by_id = {d["jobId"]: d for d in find_jobs_by_ids(job_id for job_id, _ in plan.values())}
+    updated = [by_id[job_id] for job_id, _ in plan.values() if job_id in by_id]
+    index_jobs(by_id.values())
+    return {"jobs": [to_job_output(d) for d in updated], "errors": plan.error_list()}
+
+@mutation.field("deleteJobs")
+def resolve_delete_jobs(_, info, jobIds, ordered=True):
+    _require_user_id(info)
+    plan = BulkPlan(jobIds, ordered, int)
+    plan.reject_repeats(lambda job_id: job_id, lambda job_id: f"Job with ID {job_id} is listed more than once.")
+    existing = find_existing_job_ids(plan.values())
+    plan.reject(lambda job_id: job_id not in existing, lambda job_id: f"Job with ID {job_id} not found.")
+    plan.stop_at_first_error()
+    plan.record_write_errors(delete_jobs(plan.values(), ordered))
+    deleted = plan.values()
+    unindex_jobs(deleted)
+    return {"deletedCount": len(deleted), "errors": plan.error_list()}
\ No newline at end of file
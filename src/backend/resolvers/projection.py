@@ -0,0 +1,55 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+from graphql import FieldNode, FragmentSpreadNode, InlineFragmentNode, GraphQLResolveInfo
+
+# GraphQL fields that are computed from other document fields.
+APPLICATION_FIELD_DEPENDENCIES = {"candidate": ["userId"], "job": ["jobId"]}
+
+def _collect(info: GraphQLResolveInfo, selection_set, names: Set[str], path: Sequence[str]) -> None:
+    if selection_set is None:
+        return
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            if path:
+                if selection.name.value == path[0]:
+                    _collect(info, selection.selection_set, names, path[1:])
+            else:
+                names.add(selection.name.value)
+        elif isinstance(selection, FragmentSpreadNode):
+            fragment = info.fragments.get(selection.name.value)
+            if fragment is not None:
+                _collect(info, fragment.selection_set, names, path)
+        elif isinstance(selection, InlineFragmentNode):
+            _collect(info, selection.selection_set, names, path)
+
+def selected_fields(info: GraphQLResolveInfo, path: Sequence[str] = ()) -> Set[str]:
+    """
+    Names of the fields selected under the current field, following fragments.
+    `path` descends into nested selections first, e.g. ("edges", "node") for connections.
+    """
+    names: Set[str] = set()
+    for field_node in info.field_nodes:
+        _collect(info, field_node.selection_set, names, path)
+    return names
+
+def build_projection(
+    info: GraphQLResolveInfo,
+    path: Sequence[str] = (),
+    required: Iterable[str] = (),
+    dependencies: Optional[Dict[str, List[str]]] = None,
+) -> Dict[str, int]:
+    """
+    Derives a MongoDB projection from the GraphQL selection set, so only the
+    document fields a client asked for leave the database. Fields listed in
+    `dependencies` are replaced by the document fields they are computed from.
+    Pass the document's key field in `required` so a sparse document never
+    projects to an empty dict, which the to_*_output helpers treat as missing.
+    """
+    projection = {"_id": 0}
+    for name in selected_fields(info, path):
+        if name.startswith("__"):
+            continue
+        for doc_field in (dependencies or {}).get(name, [name]):
+            projection[doc_field] = 1
+    for doc_field in required:
+        projection[doc_field] = 1
+    return projection
@@ -1,6 +1,9 @@
 from ariadne import QueryType
-from ..repository import user_repo, job_repo
-from ..db import jobs_collection
+from ..repository import user_repo, job_repo, job_stats_repo
+from ..repository.pagination import clamp_page_size
+from ..services.skill_index_service import job_skill_index
+from ..services.candidate_index_service import candidate_skill_matrix
+from ..services.embedding_service import semantic_index
 
 query = QueryType()
 
@@ -22,7 +25,7 @@ def calculate_match_score(candidate_skills, required_skills):
 # --- Smart Query Resolvers ---
 
 @query.field("recommendedJobs")
-def resolve_recommended_jobs(_, info, skillMatchThreshold=50):
+def resolve_recommended_jobs(_, info, skillMatchThreshold=50, limit=None):
     user = info.context.get("user")
     # CRITICAL: Replaced explicit permission check with an ID existence check.
     user_id = user.get("sub") if user else None
@@ -36,27 +39,18 @@ def resolve_recommended_jobs(_, info, skillMatchThreshold=50):
         
     candidate_skills = candidate.get("skills")
     
-    # Fetch all jobs to compare against.
-    all_jobs = job_repo.find_jobs({}, None, None)
-    
-    matched_jobs = []
-    for job in all_jobs:
-        required_skills = job.get("skillsRequired")
-        score = calculate_match_score(candidate_skills, required_skills)
-        
-        if score >= skillMatchThreshold:
-            # Add the score to the job object so we can sort by it (optional but useful)
-            job_with_score = {**job, "matchScore": score}
-            matched_jobs.append(job_with_score)
-            
-    # Sort the jobs from the highest match score to the lowest
-    matched_jobs.sort(key=lambda j: j["matchScore"], reverse=True)
-    
-    return [job_repo.to_job_output(j) for j in matched_jobs]
+    # Only jobs sharing skills with the candidate are scored, via the inverted index.
+    top = job_skill_index.top_matches(candidate_skills, skillMatchThreshold, clamp_page_size(limit))
+    if not top:
+        return []
+
+    # Fetch just the winning jobs, then restore the best-first order.
+    jobs_by_id = {j["jobId"]: j for j in job_repo.find_jobs_by_ids([job_id for job_id, _ in top])}
+    return [job_repo.to_job_output(jobs_by_id[job_id]) for job_id, _ in top if job_id in jobs_by_id]
 
 
 @query.field("matchingCandidates")
-def resolve_matching_candidates(_, info, jobId, skillMatchThreshold=50):
+def resolve_matching_candidates(_, info, jobId, skillMatchThreshold=50, limit=None):
     # Public Query
     job = job_repo.find_job_by_id(jobId)
     if not job or not job.get("skillsRequired"):
@@ -64,32 +58,53 @@ def resolve_matching_candidates(_, info, jobId, skillMatchThreshold=50):
         
     required_skills = job.get("skillsRequired")
     
-    # Fetch all users to compare against
-    all_users = user_repo.find_users({}, None, None)
-    
-    matched_users = []
-    for candidate in all_users:
-        candidate_skills = candidate.get("skills")
-        score = calculate_match_score(candidate_skills, required_skills)
-        
-        if score >= skillMatchThreshold:
-            user_with_score = {**candidate, "matchScore": score}
-            matched_users.append(user_with_score)
-            
-    # Sort by best match
-    matched_users.sort(key=lambda u: u["matchScore"], reverse=True)
-    
-    return [user_repo.to_user_output(u) for u in matched_users]
+    # Score every candidate at once against the packed skill bitsets.
+    top = candidate_skill_matrix.top_matches(required_skills, skillMatchThreshold, clamp_page_size(limit))
+    if not top:
+        return []
+
+    users_by_id = {u["UserID"]: u for u in user_repo.find_users_by_ids([user_id for user_id, _ in top])}
+    return [user_repo.to_user_output(users_by_id[user_id]) for user_id, _ in top if user_id in users_by_id]
+
+
+@query.field("semanticJobs")
+def resolve_semantic_jobs(_, info, limit=None):
+    user = info.context.get("user")
+    user_id = user.get("sub") if user else None
+    if not user_id:
+        raise PermissionError("Access denied: You must be logged in to get job recommendations.")
+
+    candidate = user_repo.find_one_by_id(user_id)
+    if not candidate:
+        return []
+
+    # Nearest jobs to the whole profile (title, summary and skills) in embedding space.
+    top = semantic_index.jobs_for_user(candidate, clamp_page_size(limit))
+    jobs_by_id = {j["jobId"]: j for j in job_repo.find_jobs_by_ids([job_id for job_id, _ in top])} if top else {}
+    return [job_repo.to_job_output(jobs_by_id[job_id]) for job_id, _ in top if job_id in jobs_by_id]
+
+
+@query.field("semanticCandidates")
+def resolve_semantic_candidates(_, info, jobId, limit=None):
+    # Public Query
+    job = job_repo.find_job_by_id(jobId)
+    if not job:
+        return []
+
+    top = semantic_index.candidates_for_job(job, clamp_page_size(limit))
+    users_by_id = {u["UserID"]: u for u in user_repo.find_users_by_ids([user_id for user_id, _ in top])} if top else {}
+    return [user_repo.to_user_output(users_by_id[user_id]) for user_id, _ in top if user_id in users_by_id]
 
 
 @query.field("analyticsJobsCount")
 def resolve_analytics_jobs_count(_, info, location=None, company=None):
     # Public Query
-    
-    # Build a filter using the same logic as our regular job search
+    # Summed from the materialized per-company/location counters instead of counting jobs.
+    return job_stats_repo.count_jobs(company, location)
+
+
+@query.field("jobFacets")
+def resolve_job_facets(_, info, company=None, location=None, limit=10):
+    # Public Query
     job_filter = job_repo.build_job_filter(company, location, None)
-    
-    # Use MongoDB's efficient count_documents method
-    count = jobs_collection().count_documents(job_filter)
-    
-    return count
\ No newline at end of file
+    return job_repo.job_facets(job_filter, clamp_page_size(limit))
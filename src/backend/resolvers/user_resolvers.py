@@ -2,27 +2,59 @@ from typing import Optional
 from ariadne import QueryType, MutationType
 from ..validators.common_validators import require_non_empty_str, validate_date_str, clean_update_input
 from ..db import next_user_id
+from ..repository import change_log_repo
 from ..repository.user_repo import (
-    to_user_output, build_filter, name_filter_ci, find_users, find_one_by_id,
+    to_user_output, build_filter, name_filter_ci, find_users, find_users_page, find_one_by_id,
     insert_user, update_one, delete_one
 )
+from ..repository.pagination import clamp_page_size, decode_cursor, to_connection, validate_first
+from .projection import build_projection
+from ..services.candidate_index_service import candidate_skill_matrix
+from ..services.embedding_service import semantic_index
+from ..services.response_cache_service import response_cache
 
 query = QueryType()
 mutation = MutationType()
 
+# --- In-memory index hooks ---
+# Every user write goes through these so the candidate indexes and cached responses stay in sync:
+# this process's indexes are patched directly, the other workers' via the change log.
+def index_user(doc):
+    candidate_skill_matrix.upsert_user(doc)
+    semantic_index.add_user(doc)
+    change_log_repo.record_changes("users", [doc["UserID"]])
+    response_cache.invalidate("users")
+
+def unindex_user(user_id):
+    candidate_skill_matrix.remove_user(user_id)
+    semantic_index.remove_user(user_id)
+    change_log_repo.record_changes("users", [user_id])
+    response_cache.invalidate("users")
+
 @query.field("users")
 def resolve_users(_, info, limit=None, skip=None, FirstName=None, LastName=None, DateOfBirth=None):
     # Public Query
     if DateOfBirth:
         DateOfBirth = validate_date_str(DateOfBirth)
     q = build_filter(FirstName, LastName, DateOfBirth)
-    docs = find_users(q, skip, limit)
+    docs = find_users(q, skip, clamp_page_size(limit), build_projection(info, required=["UserID"]))
     return [to_user_output(d) for d in docs]
 
+@query.field("usersConnection")
+def resolve_users_connection(_, info, first=None, after=None, FirstName=None, LastName=None, DateOfBirth=None):
+    # Public Query
+    if DateOfBirth:
+        DateOfBirth = validate_date_str(DateOfBirth)
+    q = build_filter(FirstName, LastName, DateOfBirth)
+    first = validate_first(first)
+    projection = build_projection(info, ("edges", "node"), required=["UserID"])
+    docs, has_next = find_users_page(q, decode_cursor("user", after), first, projection)
+    return to_connection("user", "UserID", docs, has_next, to_user_output)
+
 @query.field("userById")
 def resolve_user_by_id(_, info, UserID):
     # Public Query: Anyone can look up a user by ID
-    doc = find_one_by_id(int(UserID))
+    doc = find_one_by_id(int(UserID), build_projection(info, required=["UserID"]))
     return to_user_output(doc)
 
 @mutation.field("updateUser")
@@ -43,6 +75,8 @@ def resolve_update_user(_, info, UserID, input):
         raise ValueError("No fields provided to update")
 
     updated = update_one({"UserID": int(UserID)}, set_fields)
+    if updated:
+        index_user(updated)
     return to_user_output(updated)
 
 @mutation.field("updateMyProfile")
@@ -67,7 +101,8 @@ def resolve_update_my_profile(_, info, input):
 
     if not updated_doc:
         raise ValueError(f"Could not find a user profile for your account (ID: {user_id}). Please contact support.")
-        
+    index_user(updated_doc)
+
     return to_user_output(updated_doc)
 
 @mutation.field("deleteUser")
@@ -78,4 +113,7 @@ def resolve_delete_user(_, info, UserID):
     if not user_id:
         raise PermissionError("Access denied: Authentication required.")
     
-    return delete_one({"UserID": int(UserID)}) == 1
\ No newline at end of file
+    deleted = delete_one({"UserID": int(UserID)}) == 1
+    if deleted:
+        unindex_user(UserID)
+    return deleted
\ No newline at end of file
@@ -1,16 +1,61 @@
 import os
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import bcrypt
 import jwt
 from datetime import datetime, timedelta, timezone
+from ..db import revoked_tokens_collection
 
 # --- Password Hashing ---
+# bcrypt releases the GIL, so a thread pool hashes on every core. The pool is
+# bounded and so is its queue: past BCRYPT_QUEUE_LIMIT waiting jobs, callers
+# fail fast instead of every worker stalling behind a login storm.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(os.cpu_count() or 2)))
+BCRYPT_QUEUE_LIMIT = int(os.getenv("BCRYPT_QUEUE_LIMIT", str(BCRYPT_WORKERS * 8)))
+BCRYPT_QUEUE_TIMEOUT = float(os.getenv("BCRYPT_QUEUE_TIMEOUT", "2"))
+
+class PasswordHashingBusyError(RuntimeError):
+    """Raised when the hashing pool's queue is full."""
+
+_hash_pool = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+_hash_slots = threading.BoundedSemaphore(BCRYPT_WORKERS + BCRYPT_QUEUE_LIMIT)
+
+def _run_hashing(fn, *args):
+    if not _hash_slots.acquire(timeout=BCRYPT_QUEUE_TIMEOUT):
+        raise PasswordHashingBusyError("Server is busy; please retry shortly.")
+    try:
+        return _hash_pool.submit(fn, *args).result()
+    finally:
+        _hash_slots.release()
+
+def _hashpw(password: str) -> bytes:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
+
+def _checkpw(password: str, hashed_password: bytes) -> bool:
+    return bcrypt.checkpw(password.encode('utf-8'), hashed_password)
+
 def hash_password(password: str) -> bytes:
-    """Hashes a password using bcrypt."""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+    """Hashes a password using bcrypt at BCRYPT_ROUNDS, on the hashing pool."""
+    return _run_hashing(_hashpw, password)
 
 def check_password(password: str, hashed_password: bytes) -> bool:
-    """Checks a password against a stored hash."""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed_password)
+    """Checks a password against a stored hash, on the hashing pool."""
+    return _run_hashing(_checkpw, password, hashed_password)
+
+def hash_passwords(passwords: list[str]) -> list[bytes]:
+    """Hashes many passwords in parallel, for seeding and imports; bypasses the request queue limit."""
+    return list(_hash_pool.map(_hashpw, passwords))
+
+def needs_rehash(hashed_password: bytes) -> bool:
+    """True when a stored hash was made with a different cost than BCRYPT_ROUNDS."""
+    try:
+        return int(hashed_password.split(b"$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
 
 # --- JWT Token Management ---
 JWT_SECRET = os.getenv("JWT_SECRET", "your-default-super-secret-key") # Use a strong, random secret in production!
@@ -28,9 +73,149 @@ def create_token(account_id: int, email: str, role: str) -> str:
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
+# --- Verified-token cache ---
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "4096"))
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+class TokenCache:
+    """
+    Bounded LRU of verified JWT payloads, keyed by the sha256 of the token so
+    raw tokens are never held as keys. An entry lives until the token's `exp`,
+    so a hit can skip the signature check without extending a token's life.
+    Revoked digests are remembered until their own expiry and always fail.
+    """
+
+    def __init__(self, maxsize: int = JWT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple[dict, float]]" = OrderedDict()
+        self._revoked: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, digest: str) -> dict | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return dict(entry[0])
+
+    def put(self, digest: str, payload: dict) -> None:
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)):
+            return  # no expiry to bound the entry by; verify these every time
+        with self._lock:
+            if digest in self._revoked:
+                return
+            self._entries[digest] = (dict(payload), float(exp))
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def revoke(self, digest: str, exp: float | None = None) -> None:
+        with self._lock:
+            entry = self._entries.get(digest)
+        if exp is None:
+            exp = entry[1] if entry else time.time() + JWT_EXP_DAYS * 86400
+        self.revoke_many({digest: exp})
+
+    def revoke_many(self, revocations: dict[str, float]) -> None:
+        """Revokes {digest: exp} pairs, e.g. a batch pulled from the shared store."""
+        now = time.time()
+        with self._lock:
+            for digest, exp in revocations.items():
+                self._entries.pop(digest, None)
+                self._revoked[digest] = exp
+            # Expired tokens fail verification anyway, so stop tracking them.
+            for d in [d for d, e in self._revoked.items() if e <= now]:
+                del self._revoked[d]
+
+    def is_revoked(self, digest: str) -> bool:
+        with self._lock:
+            return digest in self._revoked
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+token_cache = TokenCache()
+
+# --- Shared revocations ---
+# Logouts are written to the `revoked_tokens` collection and every process
+# pulls the new ones into its token_cache at most this often, so a revoked
+# token may keep working on another worker for up to this many seconds.
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "5"))
+# Pulls overlap by this much, covering revocations stamped by a worker whose clock lags.
+REVOCATION_CLOCK_SKEW = timedelta(seconds=30)
+
+_sync_lock = threading.Lock()
+_synced_at = float("-inf")  # time.monotonic() of the last pull
+_synced_since: datetime | None = None  # revokedAt covered by the last pull
+
+def sync_revocations(force: bool = False) -> None:
+    """Pulls tokens revoked by other processes into token_cache, at most every REVOCATION_SYNC_SECONDS."""
+    global _synced_at, _synced_since
+    now = time.monotonic()
+    if not force and now - _synced_at < REVOCATION_SYNC_SECONDS:
+        return
+    if not _sync_lock.acquire(blocking=False):
+        return  # another thread is already pulling
+    try:
+        started = datetime.now(timezone.utc)
+        query = {} if _synced_since is None else {"revokedAt": {"$gte": _synced_since - REVOCATION_CLOCK_SKEW}}
+        revoked = {d["_id"]: float(d["exp"]) for d in revoked_tokens_collection().find(query, {"exp": 1})}
+        if revoked:
+            token_cache.revoke_many(revoked)
+        _synced_at, _synced_since = now, started
+    finally:
+        _sync_lock.release()
+
+def _decode(token: str) -> dict:
+    # create_token issues an integer `sub`; PyJWT >= 2.10 rejects that unless told not to.
+    return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM], options={"verify_sub": False})
+
 def verify_token(token: str) -> dict | None:
-    """Verifies a JWT and returns its payload if valid."""
+    """Verifies a JWT and returns its payload if valid, from token_cache when possible."""
+    sync_revocations()
+    digest = token_digest(token)
+    payload = token_cache.get(digest)
+    if payload is not None:
+        return payload
+    if token_cache.is_revoked(digest):
+        return None
     try:
-        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        payload = _decode(token)
     except (jwt.ExpiredSignatureError, jwt.InvalidTokenError):
-        return None
\ No newline at end of file
+        return None
+    token_cache.put(digest, payload)
+    return payload
+
+def revoke_token(token: str) -> None:
+    """
+    Makes `token` fail verification: at once in this process, and in the
+    others sharing the database within REVOCATION_SYNC_SECONDS.
+    """
+    try:
+        exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+    except jwt.InvalidTokenError:
+        exp = None
+    exp = float(exp) if isinstance(exp, (int, float)) else time.time() + JWT_EXP_DAYS * 86400
+    digest = token_digest(token)
+    revoked_tokens_collection().update_one({"_id": digest}, {"$set": {
+        "exp": exp,
+        "expiresAt": datetime.fromtimestamp(exp, tz=timezone.utc),  # for the TTL index
+        "revokedAt": datetime.now(timezone.utc),
+    }}, upsert=True)
+    token_cache.revoke(digest, exp)
\ No newline at end of file
@@ -0,0 +1,194 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ..repository import user_repo
+from .change_feed_service import ChangeFeed
+
+_WORD_BITS = 64
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    """Counts set bits per uint64 element."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    # NumPy < 2.0 has no popcount ufunc; count bits on the byte view instead.
+    as_bytes = words.view(np.uint8).reshape(words.shape + (8,))
+    return np.unpackbits(as_bytes, axis=-1).sum(axis=-1)
+
+
+class SkillDictionary:
+    """Interns skill names as dense integer IDs (0, 1, 2, ...)."""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def intern(self, skill: str) -> int:
+        """Returns the ID for `skill`, assigning the next free one if it is new."""
+        skill_id = self._ids.get(skill)
+        if skill_id is None:
+            skill_id = len(self._ids)
+            self._ids[skill] = skill_id
+        return skill_id
+
+    def lookup(self, skill: str) -> Optional[int]:
+        """Returns the ID for `skill`, or None if no candidate has it."""
+        return self._ids.get(skill)
+
+
+class CandidateSkillMatrix:
+    """
+    Every candidate's skills as a packed bitset in one NumPy matrix.
+
+    The matrix is laid out word-major (one row per 64-skill word, one column
+    per candidate), so scoring a job only touches the few words that hold its
+    required skills: one vectorized AND plus popcount across all candidates.
+    Writes through other workers arrive via the change log.
+    """
+
+    def __init__(self, initial_capacity: int = 1024):
+        self._lock = threading.RLock()
+        self._initial_capacity = initial_capacity
+        self._feed = ChangeFeed("users")
+        self._clear()
+
+    def _clear(self) -> None:
+        self.skills = SkillDictionary()
+        self._bits = np.zeros((1, self._initial_capacity), dtype=np.uint64)
+        self._user_ids = np.zeros(self._initial_capacity, dtype=np.int64)
+        self._active = np.zeros(self._initial_capacity, dtype=bool)
+        self._row_of: Dict[int, int] = {}
+        self._size = 0
+        self._loaded = False
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            self._feed.catch_up(self._apply_changes, self._rebuild)
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._feed.start()
+            for doc in user_repo.find_user_skills():
+                self._upsert(doc)
+            self._loaded = True
+
+    def _apply_changes(self, user_ids: Set[int]) -> None:
+        # Re-read the users other workers wrote; the ones not found were deleted.
+        docs = list(user_repo.find_user_skills(user_ids))
+        with self._lock:
+            for doc in docs:
+                self._upsert(doc)
+            for user_id in user_ids - {int(d["UserID"]) for d in docs}:
+                self.remove_user(user_id)
+
+    def _rebuild(self) -> None:
+        with self._lock:
+            self._clear()
+            self._ensure_loaded()
+
+    def _grow_rows(self, needed: int) -> None:
+        capacity = self._bits.shape[1]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        bits = np.zeros((self._bits.shape[0], new_capacity), dtype=np.uint64)
+        bits[:, :capacity] = self._bits
+        user_ids = np.zeros(new_capacity, dtype=np.int64)
+        user_ids[:capacity] = self._user_ids
+        active = np.zeros(new_capacity, dtype=bool)
+        active[:capacity] = self._active
+        self._bits, self._user_ids, self._active = bits, user_ids, active
+
+    def _grow_words(self, skill_id: int) -> None:
+        needed = skill_id // _WORD_BITS + 1
+        words = self._bits.shape[0]
+        if needed <= words:
+            return
+        extra = np.zeros((max(needed, words * 2) - words, self._bits.shape[1]), dtype=np.uint64)
+        self._bits = np.vstack([self._bits, extra])
+
+    def _upsert(self, doc: dict) -> None:
+        user_id = int(doc["UserID"])
+        row = self._row_of.get(user_id)
+        if row is None:
+            row = self._size
+            self._grow_rows(row + 1)
+            self._row_of[user_id] = row
+            self._user_ids[row] = user_id
+            self._size += 1
+        self._bits[:, row] = 0
+        for skill in set(doc.get("skills") or []):
+            skill_id = self.skills.intern(skill)
+            self._grow_words(skill_id)
+            self._bits[skill_id // _WORD_BITS, row] |= np.uint64(1 << (skill_id % _WORD_BITS))
+        self._active[row] = True
+
+    def upsert_user(self, doc: dict) -> None:
+        """Refreshes one candidate's bitset from a user document with UserID and skills."""
+        with self._lock:
+            if self._loaded:
+                # Before the first load there is nothing to patch; the load reads MongoDB.
+                self._upsert(doc)
+
+    def remove_user(self, user_id: int) -> None:
+        """Excludes a candidate from future matches."""
+        with self._lock:
+            if not self._loaded:
+                return
+            row = self._row_of.get(int(user_id))
+            if row is not None:
+                self._bits[:, row] = 0
+                self._active[row] = False
+
+    def reset(self) -> None:
+        """Forgets everything; the next lookup reloads from MongoDB."""
+        with self._lock:
+            self._clear()
+
+    def top_matches(self, required_skills: Iterable[str], threshold: int, limit: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Returns (UserID, score) pairs for candidates scoring at least `threshold`,
+        best first, using the same scoring as `calculate_match_score`.
+        """
+        required = list(required_skills or [])
+        if not required:
+            return []
+        self._ensure_loaded()
+
+        with self._lock:
+            n = self._size
+            masks: Dict[int, int] = {}
+            for skill in set(required):
+                skill_id = self.skills.lookup(skill)
+                if skill_id is not None:
+                    word = skill_id // _WORD_BITS
+                    masks[word] = masks.get(word, 0) | (1 << (skill_id % _WORD_BITS))
+
+            if masks:
+                words = np.fromiter(masks.keys(), dtype=np.intp, count=len(masks))
+                word_masks = np.fromiter(masks.values(), dtype=np.uint64, count=len(masks))
+                matched = self._bits[words, :n] & word_masks[:, None]
+                counts = _popcount(matched).sum(axis=0)
+            else:
+                counts = np.zeros(n, dtype=np.int64)
+
+            scores = (counts / len(required) * 100).astype(np.int64)
+            rows = np.flatnonzero(self._active[:n] & (scores >= threshold))
+            scores = scores[rows]
+            user_ids = self._user_ids[rows]
+
+        if limit is not None and 0 <= int(limit) < len(rows):
+            # Best score first, lowest UserID breaking ties.
+            rank = scores * (1 << 40) - user_ids
+            keep = np.argpartition(-rank, int(limit))[:int(limit)] if int(limit) else np.empty(0, dtype=np.intp)
+            scores, user_ids = scores[keep], user_ids[keep]
+        order = np.lexsort((user_ids, -scores))
+        return [(int(user_ids[i]), int(scores[i])) for i in order]
+
+
+candidate_skill_matrix = CandidateSkillMatrix()
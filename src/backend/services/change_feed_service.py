@@ -0,0 +1,72 @@
+import os
+import threading
+import time
+from typing import Callable, Optional, Set
+
+from dotenv import load_dotenv
+
+from ..repository import change_log_repo
+
+env_path = os.path.join(os.path.dirname(__file__), '../../config/.env')
+load_dotenv(dotenv_path=env_path)
+
+# Seconds a missing change log entry may stay missing before a follower stops
+# waiting and rebuilds. Entries go missing briefly while a writer sits between
+# taking its sequence number and inserting, and for good once they expire.
+INDEX_CHANGE_GAP_TIMEOUT = float(os.getenv("INDEX_CHANGE_GAP_TIMEOUT", "5"))
+
+
+class ChangeFeed:
+    """
+    Follows the change log of one kind ("jobs" or "users") for an in-process
+    index, so that writes made through other workers reach it. While nothing
+    changed, `catch_up` costs one read of the generation counter.
+    """
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.position = 0
+        self._lock = threading.Lock()
+        self._gap_since: Optional[float] = None
+
+    def start(self, position: Optional[int] = None) -> None:
+        """
+        Follows from `position` (e.g. one saved with a snapshot), else from now.
+        Call before a full load, so changes racing the load are replayed too.
+        """
+        with self._lock:
+            self.position = change_log_repo.current_generation(self.kind) if position is None else int(position)
+            self._gap_since = None
+
+    def poll(self) -> Optional[Set[int]]:
+        """The ids changed since the last poll, or None when the index must be rebuilt."""
+        generation = change_log_repo.current_generation(self.kind)
+        if generation == self.position:
+            return set()
+        with self._lock:
+            if generation < self.position:
+                return None  # the counter was reset
+            start = self.position
+            changed: Set[int] = set()
+            for entry in change_log_repo.find_changes(self.kind, start):
+                if entry["seq"] != self.position + 1:
+                    break  # stop at a gap; later entries are re-read next time
+                self.position += 1
+                if entry.get("reset"):
+                    return None
+                changed.update(entry["ids"])
+            if self.position >= generation:
+                self._gap_since = None
+            elif self.position > start or self._gap_since is None:
+                self._gap_since = time.monotonic()
+            elif time.monotonic() - self._gap_since > INDEX_CHANGE_GAP_TIMEOUT:
+                return None
+            return changed
+
+    def catch_up(self, apply: Callable[[Set[int]], None], rebuild: Callable[[], None]) -> None:
+        """Passes the changed ids to `apply`, or calls `rebuild` when they cannot be known."""
+        changed = self.poll()
+        if changed is None:
+            rebuild()
+        elif changed:
+            apply(changed)
@@ -0,0 +1,462 @@
+import json
+import logging
+import math
+import os
+import shutil
+import threading
+import zlib
+from collections import Counter
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+from ..repository import change_log_repo, job_repo, user_repo
+from .change_feed_service import ChangeFeed
+from .search_index_service import STOP_WORDS, TOKEN_RE, stem
+
+env_path = os.path.join(os.path.dirname(__file__), '../../config/.env')
+load_dotenv(dotenv_path=env_path)
+
+EMBEDDING_DIR = os.getenv("EMBEDDING_DIR")  # written by scripts/build_embeddings.py; unset = built in memory on first use
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "256"))
+EMBEDDING_NPROBE = int(os.getenv("EMBEDDING_NPROBE", "16"))
+# Up to this many vectors a search scores them all; past it, the IVF index is trained and probed.
+EXACT_SEARCH_LIMIT = int(os.getenv("EMBEDDING_EXACT_LIMIT", "20000"))
+
+# Abbreviations and alternative names, expanded before hashing so that "ML"
+# and "Machine Learning" produce the same features.
+SYNONYMS = {
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "dl": "deep learning",
+    "nlp": "natural language processing",
+    "ds": "data science",
+    "js": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "golang": "go",
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "aws": "amazon web services",
+    "gcp": "google cloud platform",
+    "db": "database",
+    "sre": "site reliability engineering",
+    "swe": "software engineer",
+    "dev": "developer",
+    "ui": "user interface",
+    "ux": "user experience",
+    "qa": "quality assurance",
+}
+
+log = logging.getLogger(__name__)
+
+
+# --- Hashed TF-IDF ---
+def _terms(text) -> List[str]:
+    if not isinstance(text, str):
+        return []
+    terms = []
+    for token in (t.casefold() for t in TOKEN_RE.findall(text)):
+        expansion = SYNONYMS.get(token)
+        for word in (expansion.split() if expansion else (token,)):
+            if word not in STOP_WORDS:
+                terms.append(stem(word))
+    return terms
+
+def text_features(texts: Iterable[Optional[str]]) -> Counter:
+    """Counts of the words and adjacent word pairs in `texts`; pairs never span two texts."""
+    counts: Counter = Counter()
+    for text in texts:
+        terms = _terms(text)
+        counts.update(terms)
+        counts.update(f"{a} {b}" for a, b in zip(terms, terms[1:]))
+    return counts
+
+def job_features(doc: dict) -> Counter:
+    return text_features([doc.get("title"), doc.get("description"), *(doc.get("skillsRequired") or [])])
+
+def user_features(doc: dict) -> Counter:
+    return text_features([doc.get("ProfessionalTitle"), doc.get("Summary"), *(doc.get("skills") or [])])
+
+
+class HashedTfidf:
+    """
+    Maps feature counts to unit-length float32 vectors: each feature is hashed
+    to one of `dim` signed buckets (the hashing trick, so there is no
+    vocabulary to store) and weighted by 1 + log(tf) times the bucket's IDF.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM, idf: Optional[np.ndarray] = None):
+        self.dim = dim
+        self.idf = idf if idf is not None else np.ones(dim, dtype=np.float32)
+        self._bucket = lru_cache(maxsize=1 << 16)(self._hash)
+
+    def _hash(self, feature: str) -> Tuple[int, float]:
+        h = zlib.crc32(feature.encode("utf-8"))
+        return h % self.dim, (1.0 if h & 0x80000000 else -1.0)
+
+    def fit(self, documents: Iterable[Counter]) -> None:
+        """Sets the IDF of every bucket from the documents that hash into it."""
+        df = np.zeros(self.dim, dtype=np.float64)
+        n = 0
+        for counts in documents:
+            df[list({self._bucket(f)[0] for f in counts})] += 1
+            n += 1
+        self.idf = (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+
+    def embed(self, counts: Counter) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, tf in counts.items():
+            bucket, sign = self._bucket(feature)
+            vector[bucket] += sign * (1.0 + math.log(tf))
+        vector *= self.idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+# --- Vector storage and ANN search ---
+class VectorIndex:
+    """
+    Unit-length float32 vectors keyed by document id, searched by cosine
+    similarity through an inverted-file (IVF) index: rows are bucketed by
+    their nearest k-means centroid, and a search only scores the rows in the
+    EMBEDDING_NPROBE buckets nearest the query.
+
+    Rows are append-only. Re-embedding a document retires its old row, so
+    the IVF lists never need to be edited; `train` (run by the offline build)
+    starts from a compact matrix again. Loaded indexes map the vector file
+    copy-on-write, so every worker shares the same pages and their own later
+    writes stay private.
+    """
+
+    def __init__(self, dim: int, capacity: int = 1024):
+        self.dim = dim
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._active = np.zeros(capacity, dtype=bool)
+        self._labels = np.full(capacity, -1, dtype=np.int32)
+        self._row_of: Dict[int, int] = {}
+        self._size = 0
+        self._centroids: Optional[np.ndarray] = None
+        self._build_lists()
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def ids(self) -> Set[int]:
+        return set(self._row_of)
+
+    def _grow(self, needed: int) -> None:
+        capacity = self._vectors.shape[0]
+        if needed <= capacity:
+            return
+        # Past the file's headroom a mapped index moves into memory.
+        new_capacity = max(needed, capacity * 2)
+        vectors = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        self._vectors = vectors
+        self._ids = np.concatenate([self._ids, np.zeros(new_capacity - capacity, dtype=np.int64)])
+        self._active = np.concatenate([self._active, np.zeros(new_capacity - capacity, dtype=bool)])
+        self._labels = np.concatenate([self._labels, np.full(new_capacity - capacity, -1, dtype=np.int32)])
+
+    def upsert(self, doc_id: int, vector: np.ndarray) -> None:
+        self.remove(doc_id)
+        row = self._size
+        self._grow(row + 1)
+        self._vectors[row] = vector
+        self._ids[row] = doc_id
+        self._active[row] = True
+        self._row_of[doc_id] = row
+        self._size += 1
+        if self._centroids is not None:
+            label = int(np.argmax(self._centroids @ vector))
+            self._labels[row] = label
+            self._appended.setdefault(label, []).append(row)
+
+    def remove(self, doc_id: int) -> None:
+        row = self._row_of.pop(doc_id, None)
+        if row is not None:
+            self._active[row] = False
+
+    def train(self, iterations: int = 8, sample_size: int = 50000, seed: int = 0) -> None:
+        """Compacts out retired rows, then fits sqrt(n) spherical k-means centroids and assigns every row."""
+        live = np.flatnonzero(self._active[:self._size])
+        vectors = np.ascontiguousarray(self._vectors[live])
+        ids = self._ids[live]
+        n = len(live)
+        self._vectors, self._size = vectors, n
+        self._ids, self._active = ids, np.ones(n, dtype=bool)
+        self._row_of = {int(doc_id): row for row, doc_id in enumerate(ids)}
+        self._labels = np.full(n, -1, dtype=np.int32)
+        self._centroids = None
+        if n > EXACT_SEARCH_LIMIT:
+            rng = np.random.default_rng(seed)
+            sample = vectors[rng.choice(n, size=min(n, sample_size), replace=False)]
+            nlist = max(1, int(math.sqrt(n)))
+            centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+            for _ in range(iterations):
+                labels = self._nearest(sample, centroids)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, sample)
+                empty = np.bincount(labels, minlength=nlist) == 0
+                sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+                centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+            self._centroids = centroids.astype(np.float32)
+            self._labels = self._nearest(vectors, self._centroids)
+        self._build_lists()
+
+    @staticmethod
+    def _nearest(vectors: np.ndarray, centroids: np.ndarray, batch: int = 65536) -> np.ndarray:
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), batch):
+            labels[start:start + batch] = np.argmax(vectors[start:start + batch] @ centroids.T, axis=1)
+        return labels
+
+    def _build_lists(self) -> None:
+        # CSR layout: the rows of list c are _list_rows[_list_offsets[c]:_list_offsets[c + 1]].
+        labels = self._labels[:self._size]
+        assigned = np.flatnonzero(labels >= 0)
+        self._list_rows = assigned[np.argsort(labels[assigned], kind="stable")]
+        nlist = len(self._centroids) if self._centroids is not None else 0
+        self._list_offsets = np.concatenate([[0], np.cumsum(np.bincount(labels[assigned], minlength=nlist))])
+        self._appended: Dict[int, List[int]] = {}
+
+    def search(self, vector: np.ndarray, k: int, nprobe: int = EMBEDDING_NPROBE) -> List[Tuple[int, float]]:
+        """The `k` (id, cosine similarity) pairs closest to `vector`, best first."""
+        if not self._row_of or k <= 0 or not vector.any():
+            return []
+        if self._centroids is None:
+            rows = np.arange(self._size)
+        else:
+            nprobe = min(nprobe, len(self._centroids))
+            probes = np.argpartition(-(self._centroids @ vector), nprobe - 1)[:nprobe]
+            parts = [self._list_rows[self._list_offsets[c]:self._list_offsets[c + 1]] for c in probes]
+            parts.extend(np.asarray(self._appended[c], dtype=np.int64) for c in probes if c in self._appended)
+            rows = np.concatenate(parts)
+        rows = rows[self._active[rows]]
+        if not len(rows):
+            return []
+        scores = self._vectors[rows] @ vector
+        k = min(k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((self._ids[rows[top]], -scores[top]))]
+        return [(int(self._ids[rows[i]]), float(scores[i])) for i in top]
+
+    # --- Files ---
+    def save(self, directory: str, headroom: float = 0.25) -> None:
+        """Writes the live rows (a compacted index, see `train`) plus spare capacity for later upserts."""
+        os.makedirs(directory, exist_ok=True)
+        capacity = self._size + max(1024, int(self._size * headroom))
+        vectors = np.memmap(os.path.join(directory, "vectors.f32"), dtype=np.float32, mode="w+", shape=(capacity, self.dim))
+        vectors[:self._size] = self._vectors[:self._size]
+        vectors.flush()
+        del vectors
+        np.save(os.path.join(directory, "ids.npy"), self._ids[:self._size])
+        np.save(os.path.join(directory, "active.npy"), self._active[:self._size])
+        np.save(os.path.join(directory, "labels.npy"), self._labels[:self._size])
+        if self._centroids is not None:
+            np.save(os.path.join(directory, "centroids.npy"), self._centroids)
+        with open(os.path.join(directory, "meta.json"), "w") as f:
+            json.dump({"dim": self.dim, "size": self._size, "capacity": capacity}, f)
+
+    @classmethod
+    def load(cls, directory: str) -> "VectorIndex":
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        index = cls.__new__(cls)
+        index.dim, size, capacity = meta["dim"], meta["size"], meta["capacity"]
+        index._vectors = np.memmap(os.path.join(directory, "vectors.f32"), dtype=np.float32, mode="c", shape=(capacity, index.dim))
+        pad = capacity - size
+        index._ids = np.concatenate([np.load(os.path.join(directory, "ids.npy")), np.zeros(pad, dtype=np.int64)])
+        index._active = np.concatenate([np.load(os.path.join(directory, "active.npy")), np.zeros(pad, dtype=bool)])
+        index._labels = np.concatenate([np.load(os.path.join(directory, "labels.npy")), np.full(pad, -1, dtype=np.int32)])
+        index._size = size
+        index._row_of = {int(index._ids[row]): int(row) for row in np.flatnonzero(index._active[:size])}
+        centroids_path = os.path.join(directory, "centroids.npy")
+        index._centroids = np.load(centroids_path) if os.path.exists(centroids_path) else None
+        index._build_lists()
+        return index
+
+
+# --- Jobs and candidates ---
+def _related(hits: List[Tuple[int, float]]) -> List[Tuple[int, float]]:
+    # Documents sharing no features score zero or below; they are not matches.
+    return [(doc_id, score) for doc_id, score in hits if score > 0]
+
+class SemanticIndex:
+    """
+    Job postings and candidate profiles embedded into one hashed TF-IDF space,
+    so either side can be matched against the other by meaning rather than
+    by exact skill strings: "ML" finds "Machine Learning", and a candidate's
+    Summary counts as much as their skills list.
+
+    The vectors are produced offline by scripts/build_embeddings.py into
+    EMBEDDING_DIR. On first use the server maps those files and reconciles
+    them with MongoDB: documents created since the build are embedded, and
+    deleted ones are dropped. Edits made before the server started are only
+    picked up by the next build; later ones through any worker arrive via
+    the change log. Files built before the database was reloaded (the change
+    log records a reset) are ignored. Without EMBEDDING_DIR, the index is
+    built in memory.
+    """
+
+    def __init__(self, directory: Optional[str] = EMBEDDING_DIR, dim: int = EMBEDDING_DIM):
+        self.directory = directory
+        self.dim = dim
+        self._lock = threading.RLock()
+        self._loaded = False
+        self.embedder = HashedTfidf(dim)
+        self.jobs = VectorIndex(dim)
+        self.users = VectorIndex(dim)
+        self._job_feed = ChangeFeed("jobs")
+        self._user_feed = ChangeFeed("users")
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            # When the change log cannot say what changed (e.g. after a reseed), re-embed everything.
+            self._job_feed.catch_up(self._apply_job_changes, self.build)
+            self._user_feed.catch_up(self._apply_user_changes, self.build)
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if self.directory and os.path.exists(os.path.join(self.directory, "idf.npy")):
+                self._job_feed.start()
+                self._user_feed.start()
+                generations = self._load(self.directory)
+                if any(change_log_repo.last_reset(kind) > generations.get(kind, 0)
+                       or generations.get(kind, 0) > change_log_repo.current_generation(kind)
+                       for kind in change_log_repo.KINDS):
+                    # The collections were reloaded (e.g. reseeded) since the build; ids may be reused.
+                    log.warning("Embeddings in %s predate a reload of the database; rebuilding them in memory. Run scripts/build_embeddings.py.", self.directory)
+                    self.build()
+                else:
+                    self._reconcile()
+            else:
+                if self.directory:
+                    log.warning("No embeddings in %s; building them in memory. Run scripts/build_embeddings.py.", self.directory)
+                self.build()
+            self._loaded = True
+
+    def build(self) -> None:
+        """Embeds every job and user from MongoDB: one pass to fit the IDF, one to embed, then trains both indexes."""
+        with self._lock:
+            # Before reading, so changes racing the build are replayed, and `save` records where it started.
+            self._job_feed.start()
+            self._user_feed.start()
+            self.embedder.fit(chain(
+                (job_features(d) for d in job_repo.find_job_search_fields()),
+                (user_features(d) for d in user_repo.find_user_profiles()),
+            ))
+            self.jobs, self.users = VectorIndex(self.dim), VectorIndex(self.dim)
+            for doc in job_repo.find_job_search_fields():
+                self.jobs.upsert(int(doc["jobId"]), self.embedder.embed(job_features(doc)))
+            for doc in user_repo.find_user_profiles():
+                self.users.upsert(int(doc["UserID"]), self.embedder.embed(user_features(doc)))
+            self.jobs.train()
+            self.users.train()
+            self._loaded = True
+
+    def save(self, directory: str) -> None:
+        """Writes the index to `directory`, replacing any previous build only once the new one is complete."""
+        with self._lock:
+            staging = directory.rstrip("/\\") + ".building"
+            shutil.rmtree(staging, ignore_errors=True)
+            os.makedirs(staging)
+            np.save(os.path.join(staging, "idf.npy"), self.embedder.idf)
+            self.jobs.save(os.path.join(staging, "jobs"))
+            self.users.save(os.path.join(staging, "users"))
+            with open(os.path.join(staging, "meta.json"), "w") as f:
+                json.dump({"generations": {"jobs": self._job_feed.position, "users": self._user_feed.position}}, f)
+            # Servers that still map the old files keep reading them until they restart.
+            retired = directory.rstrip("/\\") + ".old"
+            shutil.rmtree(retired, ignore_errors=True)
+            if os.path.exists(directory):
+                os.replace(directory, retired)
+            os.replace(staging, directory)
+            shutil.rmtree(retired, ignore_errors=True)
+
+    def _load(self, directory: str) -> Dict[str, int]:
+        # Returns the change log generations the build started at; builds that predate them record none.
+        idf = np.load(os.path.join(directory, "idf.npy"))
+        self.dim = len(idf)
+        self.embedder = HashedTfidf(self.dim, idf)
+        self.jobs = VectorIndex.load(os.path.join(directory, "jobs"))
+        self.users = VectorIndex.load(os.path.join(directory, "users"))
+        meta_path = os.path.join(directory, "meta.json")
+        if not os.path.exists(meta_path):
+            return {}
+        with open(meta_path) as f:
+            return json.load(f).get("generations", {})
+
+    def _reconcile(self) -> None:
+        for index, ids, fetch, key, features in (
+            (self.jobs, job_repo.find_job_ids, job_repo.find_job_search_fields, "jobId", job_features),
+            (self.users, user_repo.find_user_ids, user_repo.find_user_profiles, "UserID", user_features),
+        ):
+            current, indexed = set(ids()), index.ids()
+            for doc_id in indexed - current:
+                index.remove(doc_id)
+            missing = list(current - indexed)
+            for start in range(0, len(missing), 1000):
+                for doc in fetch(missing[start:start + 1000]):
+                    index.upsert(int(doc[key]), self.embedder.embed(features(doc)))
+
+    def _apply_job_changes(self, job_ids: Set[int]) -> None:
+        # Re-read the jobs other workers wrote; the ones not found were deleted.
+        docs = list(job_repo.find_job_search_fields(job_ids))
+        with self._lock:
+            for doc in docs:
+                self.jobs.upsert(int(doc["jobId"]), self.embedder.embed(job_features(doc)))
+            for job_id in job_ids - {int(d["jobId"]) for d in docs}:
+                self.jobs.remove(job_id)
+
+    def _apply_user_changes(self, user_ids: Set[int]) -> None:
+        docs = list(user_repo.find_user_profiles(user_ids))
+        with self._lock:
+            for doc in docs:
+                self.users.upsert(int(doc["UserID"]), self.embedder.embed(user_features(doc)))
+            for user_id in user_ids - {int(d["UserID"]) for d in docs}:
+                self.users.remove(user_id)
+
+    def add_job(self, doc: dict) -> None:
+        """Embeds (or re-embeds) a full job document."""
+        with self._lock:
+            if self._loaded:
+                # Before the first load there is nothing to patch; the load reads MongoDB.
+                self.jobs.upsert(int(doc["jobId"]), self.embedder.embed(job_features(doc)))
+
+    def remove_job(self, job_id: int) -> None:
+        with self._lock:
+            if self._loaded:
+                self.jobs.remove(int(job_id))
+
+    def add_user(self, doc: dict) -> None:
+        """Embeds (or re-embeds) a full user profile."""
+        with self._lock:
+            if self._loaded:
+                self.users.upsert(int(doc["UserID"]), self.embedder.embed(user_features(doc)))
+
+    def remove_user(self, user_id: int) -> None:
+        with self._lock:
+            if self._loaded:
+                self.users.remove(int(user_id))
+
+    def jobs_for_user(self, user_doc: dict, limit: int) -> List[Tuple[int, float]]:
+        """(jobId, similarity) for the jobs closest to a user profile, best first."""
+        self._ensure_loaded()
+        with self._lock:
+            return _related(self.jobs.search(self.embedder.embed(user_features(user_doc)), limit))
+
+    def candidates_for_job(self, job_doc: dict, limit: int) -> List[Tuple[int, float]]:
+        """(UserID, similarity) for the candidates closest to a job posting, best first."""
+        self._ensure_loaded()
+        with self._lock:
+            return _related(self.users.search(self.embedder.embed(job_features(job_doc)), limit))
+
+
+semantic_index = SemanticIndex()
@@ -0,0 +1,278 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+from ..metrics import OLLAMA_DURATION
+
+env_path = os.path.join(os.path.dirname(__file__), '../../config/.env')
+load_dotenv(dotenv_path=env_path)
+
+# Generations allowed to run against the model at once; the rest queue.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "2"))
+# Seconds a request may wait for a free slot before failing fast with 503.
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "10"))
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "90"))
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "10"))
+
+
+class LLMError(Exception):
+    """A failed generation, carrying the HTTP status the route should return."""
+
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.status = status
+
+
+def _shared_error(error: BaseException) -> LLMError:
+    """What followers of a failed single-flight generation raise: the leader's LLMError, or a 502."""
+    if isinstance(error, LLMError):
+        return error
+    shared = LLMError("The language model request failed.", 502)
+    shared.__cause__ = error
+    return shared
+
+def _flight_key(url: str, body: dict) -> str:
+    raw = url + "\0" + json.dumps(body, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+@contextmanager
+def _observe(mode: str):
+    """Records the duration of a generation once it holds a slot, labelled with its outcome."""
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except LLMError as e:
+        outcome = str(e.status)
+        raise
+    except GeneratorExit:
+        outcome = "abandoned"  # the consumer stopped reading a stream
+        raise
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        OLLAMA_DURATION.observe(time.perf_counter() - started, mode, outcome)
+
+def _parse_chunk(line) -> dict:
+    """Parses one NDJSON line of a streaming generation."""
+    try:
+        chunk = json.loads(line)
+    except ValueError:
+        return {}
+    return chunk if isinstance(chunk, dict) else {}
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[dict] = None
+        self.error: Optional[LLMError] = None  # set for leader failures of any kind
+
+
+class LLMClient:
+    """
+    Client for a JSON generation endpoint (Ollama's /api/generate).
+
+    - One keep-alive requests.Session, so calls reuse pooled connections.
+    - At most `max_concurrency` generations in flight; a caller that cannot get
+      a slot within `queue_timeout` gets LLMError(503) instead of piling onto
+      an overloaded model and timing out after `timeout`.
+    - Single flight: concurrent calls with an identical body share the first
+      caller's generation instead of each running their own.
+    """
+
+    def __init__(self, url: str, max_concurrency: int = LLM_MAX_CONCURRENCY, queue_timeout: float = LLM_QUEUE_TIMEOUT,
+                 timeout: float = LLM_REQUEST_TIMEOUT, pool_size: int = LLM_POOL_SIZE):
+        self.url = url
+        self.queue_timeout = queue_timeout
+        self.timeout = timeout
+        self.coalesced = 0
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+
+    def _acquire(self) -> None:
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise LLMError("The language model is busy; please retry shortly.", 503)
+
+    def generate(self, body: dict, headers: Optional[dict] = None) -> dict:
+        """POSTs `body` and returns the decoded JSON response; raises LLMError."""
+        key = _flight_key(self.url, body)
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._generate(body, headers)
+            return flight.result
+        except BaseException as e:
+            # Whatever stopped the leader, followers must not read a missing result.
+            flight.error = _shared_error(e)
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _generate(self, body: dict, headers: Optional[dict]) -> dict:
+        self._acquire()
+        with _observe("generate"):
+            try:
+                resp = self._session.post(self.url, json=body, headers=headers or {}, timeout=self.timeout)
+            except requests.exceptions.Timeout:
+                raise LLMError("Upstream NL generation timed out", 504)
+            except requests.exceptions.RequestException as e:
+                raise LLMError(f"Ollama network error: {e}", 502)
+            finally:
+                self._slots.release()
+            if not resp.ok:
+                raise LLMError(f"Ollama error {resp.status_code}", 502)
+            try:
+                return resp.json()
+            except ValueError:
+                raise LLMError("Ollama returned non-JSON response", 502)
+
+    def stream(self, body: dict, headers: Optional[dict] = None) -> Iterator[dict]:
+        """
+        POSTs a streaming `body` and yields each decoded NDJSON chunk until
+        `done`. Holds a concurrency slot for the whole stream; streams are not
+        coalesced. Raises LLMError.
+        """
+        self._acquire()
+        with _observe("stream"):
+            try:
+                with self._session.post(self.url, json=body, headers=headers or {}, timeout=self.timeout, stream=True) as resp:
+                    if not resp.ok:
+                        raise LLMError(f"Ollama error {resp.status_code}", 502)
+                    for line in resp.iter_lines():
+                        chunk = _parse_chunk(line) if line else {}
+                        yield chunk
+                        if chunk.get("done"):
+                            break
+            except requests.exceptions.Timeout:
+                raise LLMError("Upstream NL generation timed out", 504)
+            except requests.exceptions.RequestException as e:
+                raise LLMError(f"Ollama network error: {e}", 502)
+            finally:
+                self._slots.release()
+
+
+class AsyncLLMClient:
+    """LLMClient for the ASGI app, on a shared httpx.AsyncClient and asyncio primitives."""
+
+    def __init__(self, url: str, max_concurrency: int = LLM_MAX_CONCURRENCY, queue_timeout: float = LLM_QUEUE_TIMEOUT,
+                 timeout: float = LLM_REQUEST_TIMEOUT, pool_size: int = LLM_POOL_SIZE):
+        self.url = url
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.coalesced = 0
+        self._client = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._flights: Dict[str, "asyncio.Future"] = {}
+
+    def _http(self):
+        # Created on first use so the Flask app never imports httpx.
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(limits=httpx.Limits(max_connections=self.pool_size))
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def _acquire(self) -> None:
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise LLMError("The language model is busy; please retry shortly.", 503)
+
+    async def generate(self, body: dict, headers: Optional[dict] = None) -> dict:
+        key = _flight_key(self.url, body)
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            # shield: a cancelled follower must not cancel the shared generation
+            return await asyncio.shield(flight)
+
+        flight = self._flights[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await self._generate(body, headers)
+        except BaseException as e:
+            # Even if the leader was cancelled, followers get an LLMError rather than a CancelledError.
+            flight.set_exception(_shared_error(e))
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            self._flights.pop(key, None)
+            if flight.done() and not flight.cancelled():
+                flight.exception()  # mark retrieved when there were no followers
+
+    async def _generate(self, body: dict, headers: Optional[dict]) -> dict:
+        import httpx
+
+        client = self._http()
+        await self._acquire()
+        with _observe("generate"):
+            try:
+                resp = await client.post(self.url, json=body, headers=headers or {}, timeout=self.timeout)
+            except httpx.TimeoutException:
+                raise LLMError("Upstream NL generation timed out", 504)
+            except httpx.HTTPError as e:
+                raise LLMError(f"Ollama network error: {e}", 502)
+            finally:
+                self._slots.release()
+            if not resp.is_success:
+                raise LLMError(f"Ollama error {resp.status_code}", 502)
+            try:
+                return resp.json()
+            except ValueError:
+                raise LLMError("Ollama returned non-JSON response", 502)
+
+    async def stream(self, body: dict, headers: Optional[dict] = None) -> AsyncIterator[dict]:
+        import httpx
+
+        client = self._http()
+        await self._acquire()
+        with _observe("stream"):
+            try:
+                async with client.stream("POST", self.url, json=body, headers=headers or {}, timeout=self.timeout) as resp:
+                    if not resp.is_success:
+                        raise LLMError(f"Ollama error {resp.status_code}", 502)
+                    async for line in resp.aiter_lines():
+                        chunk = _parse_chunk(line) if line else {}
+                        yield chunk
+                        if chunk.get("done"):
+                            break
+            except httpx.TimeoutException:
+                raise LLMError("Upstream NL generation timed out", 504)
+            except httpx.HTTPError as e:
+                raise LLMError(f"Ollama network error: {e}", 502)
+            finally:
+                self._slots.release()
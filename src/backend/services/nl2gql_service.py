@@ -1,18 +1,24 @@
 import os
-import requests
 import json
+from typing import AsyncIterator, Iterator
 from dotenv import load_dotenv
 
 env_path = os.path.join(os.path.dirname(__file__), '../../config/.env')
 load_dotenv(dotenv_path=env_path)
 
 from ..errors import json_error, unwrap_graphql_errors
+from .translation_cache_service import translation_cache, translation_key
+from .llm_service import AsyncLLMClient, LLMClient, LLMError
 
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
 OLLAMA_API_KEY = os.getenv("OLLAMA_API_KEY")
 OLLAMA_GENERATE_URL = f"{OLLAMA_HOST}/api/generate"
 
+# Pooled, concurrency-limited clients shared by every request (see llm_service).
+llm_client = LLMClient(OLLAMA_GENERATE_URL)
+async_llm_client = AsyncLLMClient(OLLAMA_GENERATE_URL)
+
 def build_nl2gql_prompt(user_text: str, schema_sdl: str) -> str:
     """Builds a non-restrictive prompt for the LLM with minimal authentication requirements."""
     return (
@@ -21,13 +27,13 @@ def build_nl2gql_prompt(user_text: str, schema_sdl: str) -> str:
         "**KEY INSTRUCTIONS:**\n"
         "1. Most queries are public - freely use:\n"
         "   - `users` and `userById` for user searches\n"
-        "   - `jobs` and `jobById` for job searches\n"
-        "   - `matchingCandidates` for candidate matching\n"
-        "   - `analyticsJobsCount` for job counts\n\n"
+        "   - `jobs` and `jobById` for job searches, `searchJobs` for free-text searches like 'remote python jobs'\n"
+        "   - `matchingCandidates` for candidate matching by skills, `semanticCandidates` for matching by overall profile\n"
+        "   - `analyticsJobsCount` for job counts, `jobFacets` for counts by location, company or skill\n\n"
         "2. Auth-required operations - use these if the request implies it's the logged-in user acting:\n"
         "   - `updateMyProfile` for profile updates like 'update my skills'\n"
         "   - `apply` for job applications like 'apply to job X'\n"
-        "   - `recommendedJobs` for personalized recommendations\n\n"
+        "   - `recommendedJobs` (by skills) or `semanticJobs` (by whole profile) for personalized recommendations\n\n"
         "3. Admin operations (no role restrictions) - use if explicitly requested:\n"
         "   - `createJob` for creating jobs\n"
         "   - `updateJob`/`deleteJob` for managing jobs\n"
@@ -53,40 +59,140 @@ def extract_graphql(text: str) -> str:
                 return parts[i].strip()
     return text.strip()
 
-def process_nl2gql_request(user_text: str, schema_sdl: str, run_graphql: bool, graphql_executor_fn, user_context: dict | None = None):
-    # Role parameter removed - not needed in non-RBAC MVP
+def _generation_request(user_text: str, schema_sdl: str, stream: bool = False):
+    """Returns the (json body, headers) for an Ollama generate call."""
     prompt = build_nl2gql_prompt(user_text, schema_sdl)
     headers = {}
     if OLLAMA_API_KEY:
         headers["Authorization"] = f"Bearer {OLLAMA_API_KEY}"
-    try:
-        resp = requests.post(
-            OLLAMA_GENERATE_URL,
-            json={"model": OLLAMA_MODEL, "prompt": prompt, "stream": False},
-            headers=headers,
-            timeout=90,
-        )
-    except requests.exceptions.Timeout:
-        return json_error("Upstream NL generation timed out", 504)
-    except requests.exceptions.RequestException as e:
-        return json_error(f"Ollama network error: {e}", 502)
-    if not resp.ok:
-        return json_error(f"Ollama error {resp.status_code}", 502)
-    try:
-        gen_body = resp.json()
-    except ValueError:
-        return json_error("Ollama returned non-JSON response", 502)
+    return {"model": OLLAMA_MODEL, "prompt": prompt, "stream": stream}, headers
+
+def _extract_operation(gen_body: dict):
+    """Returns (gql, None) for a usable generation, or (None, error) otherwise."""
     gen = gen_body.get("response", "")
     gql = extract_graphql(gen)
     if not gql or gql.strip().upper() == "INVALID":
-        return json_error(
+        return None, json_error(
             "Out of scope. Your request could not be mapped to a valid operation. Try asking about users or jobs.",
             400
         )
-    if not run_graphql:
-        return {"graphql": gql}, 200
-    success, result = graphql_executor_fn({"query": gql})
+    return gql, None
+
+def _wrap_result(gql: str, success: bool, result: dict):
     wrapped_error = unwrap_graphql_errors(result)
     if wrapped_error:
         return wrapped_error
     return {"graphql": gql, "result": result}, (200 if success else 400)
+
+def process_nl2gql_request(user_text: str, schema_sdl: str, run_graphql: bool, graphql_executor_fn, user_context: dict | None = None):
+    # Role parameter removed - not needed in non-RBAC MVP
+    key = translation_key(user_text, schema_sdl, OLLAMA_MODEL)
+    gql = translation_cache.get(key)
+    if gql is None:
+        gql, error = _generate_operation(user_text, schema_sdl)
+        if error:
+            return error
+        translation_cache.put(key, gql)
+    return _run_operation(gql, run_graphql, graphql_executor_fn)
+
+def _generate_operation(user_text: str, schema_sdl: str):
+    body, headers = _generation_request(user_text, schema_sdl)
+    try:
+        gen_body = llm_client.generate(body, headers)
+    except LLMError as e:
+        return None, json_error(str(e), e.status)
+    return _extract_operation(gen_body)
+
+def _run_operation(gql: str, run_graphql: bool, graphql_executor_fn):
+    if not run_graphql:
+        return {"graphql": gql}, 200
+    success, result = graphql_executor_fn({"query": gql})
+    return _wrap_result(gql, success, result)
+
+async def process_nl2gql_request_async(user_text: str, schema_sdl: str, run_graphql: bool, graphql_executor_fn, user_context: dict | None = None):
+    """
+    Async twin of process_nl2gql_request for the ASGI app: the Ollama call and
+    `graphql_executor_fn` (a coroutine function) are awaited, so a slow
+    generation does not hold a worker thread.
+    """
+    key = translation_key(user_text, schema_sdl, OLLAMA_MODEL)
+    gql = translation_cache.get(key)
+    if gql is None:
+        gql, error = await _generate_operation_async(user_text, schema_sdl)
+        if error:
+            return error
+        translation_cache.put(key, gql)
+    if not run_graphql:
+        return {"graphql": gql}, 200
+    success, result = await graphql_executor_fn({"query": gql})
+    return _wrap_result(gql, success, result)
+
+async def _generate_operation_async(user_text: str, schema_sdl: str):
+    body, headers = _generation_request(user_text, schema_sdl)
+    try:
+        gen_body = await async_llm_client.generate(body, headers)
+    except LLMError as e:
+        return None, json_error(str(e), e.status)
+    return _extract_operation(gen_body)
+
+# --- Server-Sent Events ---
+# The streaming routes emit `token` events with generated text as it arrives,
+# then exactly one `result` event ({"status", "body"}) carrying what the
+# non-streaming route would have returned. A cache hit skips straight to it.
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _result_event(payload_and_status) -> str:
+    payload, status = payload_and_status
+    return sse_event("result", {"status": status, "body": payload})
+
+def stream_nl2gql_request(user_text: str, schema_sdl: str, run_graphql: bool, graphql_executor_fn, user_context: dict | None = None) -> Iterator[str]:
+    """Streaming variant of process_nl2gql_request; yields SSE-formatted strings."""
+    key = translation_key(user_text, schema_sdl, OLLAMA_MODEL)
+    gql = translation_cache.get(key)
+    if gql is None:
+        body, headers = _generation_request(user_text, schema_sdl, stream=True)
+        generated = []
+        try:
+            for chunk in llm_client.stream(body, headers):
+                token = chunk.get("response")
+                if token:
+                    generated.append(token)
+                    yield sse_event("token", {"token": token})
+        except LLMError as e:
+            yield _result_event(json_error(str(e), e.status))
+            return
+        gql, error = _extract_operation({"response": "".join(generated)})
+        if error:
+            yield _result_event(error)
+            return
+        translation_cache.put(key, gql)
+    yield _result_event(_run_operation(gql, run_graphql, graphql_executor_fn))
+
+async def stream_nl2gql_request_async(user_text: str, schema_sdl: str, run_graphql: bool, graphql_executor_fn, user_context: dict | None = None) -> AsyncIterator[str]:
+    """Async twin of stream_nl2gql_request for the ASGI app."""
+    key = translation_key(user_text, schema_sdl, OLLAMA_MODEL)
+    gql = translation_cache.get(key)
+    if gql is None:
+        body, headers = _generation_request(user_text, schema_sdl, stream=True)
+        generated = []
+        try:
+            async for chunk in async_llm_client.stream(body, headers):
+                token = chunk.get("response")
+                if token:
+                    generated.append(token)
+                    yield sse_event("token", {"token": token})
+        except LLMError as e:
+            yield _result_event(json_error(str(e), e.status))
+            return
+        gql, error = _extract_operation({"response": "".join(generated)})
+        if error:
+            yield _result_event(error)
+            return
+        translation_cache.put(key, gql)
+    if not run_graphql:
+        yield _result_event(({"graphql": gql}, 200))
+        return
+    success, result = await graphql_executor_fn({"query": gql})
+    yield _result_event(_wrap_result(gql, success, result))
@@ -0,0 +1,342 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+from graphql import FieldNode, GraphQLError, OperationDefinitionNode, OperationType, parse, print_ast
+
+from pymongo import UpdateOne
+
+from ..db import counters_collection, response_cache_collection
+
+env_path = os.path.join(os.path.dirname(__file__), '../../config/.env')
+load_dotenv(dotenv_path=env_path)
+
+# memory (single process only) | mongo (shared by every worker) | off
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+
+# Root query fields whose results may be cached, and the data each one reads.
+# A write to that data invalidates the tag (see the index hooks in the resolvers).
+CACHEABLE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "jobs": ("jobs",),
+    "jobById": ("jobs",),
+    "jobsConnection": ("jobs",),
+    "analyticsJobsCount": ("jobs",),
+    "jobFacets": ("jobs",),
+    "searchJobs": ("jobs",),
+    "users": ("users",),
+    "userById": ("users",),
+    "usersConnection": ("users",),
+    "matchingCandidates": ("jobs", "users"),
+    "recommendedJobs": ("jobs", "users"),
+    "semanticCandidates": ("jobs", "users"),
+    "semanticJobs": ("jobs", "users"),
+}
+# Fields whose result depends on the caller; cached per user instead of shared.
+USER_SCOPED_FIELDS = {"recommendedJobs", "semanticJobs"}
+
+
+def encode_result(result: dict) -> bytes:
+    """The JSON body for a GraphQL result, encoded the same way on every server."""
+    return json.dumps(result, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header lists `etag` (weak comparison) or is `*`."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+@lru_cache(maxsize=1024)
+def describe_query(query: str) -> Optional[Tuple[str, Dict[Optional[str], Tuple[OperationType, Optional[Tuple[str, ...]]]]]]:
+    """
+    (normalized text, {operation name: (type, root field names)}) for a query
+    string, or None if it does not parse. Root fields are None when the root
+    selection uses fragments.
+    """
+    try:
+        document = parse(query)
+    except GraphQLError:
+        return None
+    operations = {}
+    for definition in document.definitions:
+        if not isinstance(definition, OperationDefinitionNode):
+            continue
+        selections = definition.selection_set.selections
+        fields = tuple(s.name.value for s in selections) if all(isinstance(s, FieldNode) for s in selections) else None
+        operations[definition.name.value if definition.name else None] = (definition.operation, fields)
+    return print_ast(document), operations
+
+
+class CachedResponse:
+    __slots__ = ("body", "etag", "tags", "expires", "user_scoped")
+
+    def __init__(self, body: bytes, tags: Iterable[str], expires: float, user_scoped: bool, etag: Optional[str] = None):
+        self.body = body
+        self.etag = etag or '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.tags = tuple(tags)
+        self.expires = expires
+        self.user_scoped = user_scoped
+
+    def headers(self) -> Dict[str, str]:
+        # no-cache: clients may keep the body but must revalidate, which costs a 304.
+        return {
+            "ETag": self.etag,
+            "Cache-Control": "private, no-cache" if self.user_scoped else "no-cache",
+            "Vary": "Authorization",
+        }
+
+
+class CachePlan:
+    """A cacheable request: its key, the data tags it depends on, and the tag versions seen before executing."""
+    __slots__ = ("key", "tags", "user_scoped", "versions")
+
+    def __init__(self, key: str, tags: Tuple[str, ...], user_scoped: bool):
+        self.key = key
+        self.tags = tags
+        self.user_scoped = user_scoped
+        self.versions: Optional[Tuple[int, ...]] = None  # read by ResponseCache.get
+
+
+class MemoryBackend:
+    """
+    Process-local LRU bounded by the total size of the cached bodies.
+
+    Single process only: every worker keeps its own entries and tag versions,
+    so a write through one worker leaves stale entries in the others until
+    their TTL. Run several workers with the mongo backend.
+    """
+
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[str]] = defaultdict(set)
+        self._versions: Dict[str, int] = defaultdict(int)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        if len(entry.body) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self.size += len(entry.body)
+            for tag in entry.tags:
+                self._keys_by_tag[tag].add(key)
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def versions(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._versions[t] for t in tags)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] += 1
+                for key in list(self._keys_by_tag.pop(tag, ())):
+                    self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+            self.size = 0
+
+    def _remove(self, key: str) -> None:
+        # Caller holds the lock.
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= len(entry.body)
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+class MongoBackend:
+    """
+    Entries in the `response_cache` collection, shared by every worker and
+    server process. A TTL index drops expired entries and invalidation is a
+    delete on the indexed `tags` field, so a write seen by one worker clears
+    the entry for all of them. Tag versions are counters in the `counters`
+    collection, so the race guard in ResponseCache.put also spans workers.
+    """
+
+    VERSION_PREFIX = "responseCacheTag:"
+
+    def __init__(self, collection=None):
+        self._collection = collection
+
+    def _col(self):
+        return self._collection if self._collection is not None else response_cache_collection()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        doc = self._col().find_one({"_id": key})
+        # The TTL monitor only runs once a minute, so check expiry here too.
+        if doc is None or doc["expires"] <= time.time():
+            return None
+        return CachedResponse(bytes(doc["body"]), doc["tags"], doc["expires"], doc["userScoped"], doc["etag"])
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        self._col().replace_one({"_id": key}, {
+            "_id": key,
+            "body": entry.body,
+            "etag": entry.etag,
+            "tags": list(entry.tags),
+            "userScoped": entry.user_scoped,
+            "expires": entry.expires,
+            "expiresAt": datetime.fromtimestamp(entry.expires, tz=timezone.utc),  # for the TTL index
+        }, upsert=True)
+
+    def versions(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        ids = [self.VERSION_PREFIX + t for t in tags]
+        found = {d["_id"]: d["sequence_value"] for d in counters_collection().find({"_id": {"$in": ids}})}
+        return tuple(int(found.get(i, 0)) for i in ids)
+
+    def delete(self, key: str) -> None:
+        self._col().delete_one({"_id": key})
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        tags = list(tags)
+        # Bump the versions before deleting, so a concurrent put either sees the bump or is deleted.
+        counters_collection().bulk_write([
+            UpdateOne({"_id": self.VERSION_PREFIX + t}, {"$inc": {"sequence_value": 1}}, upsert=True) for t in tags
+        ], ordered=False)
+        self._col().delete_many({"tags": {"$in": tags}})
+
+    def clear(self) -> None:
+        self._col().delete_many({})
+
+
+class ResponseCache:
+    """
+    Cache of serialized /graphql responses for read-only operations made up
+    entirely of CACHEABLE_FIELDS, keyed by the normalized operation, operation
+    name, variables and auth scope.
+
+    Entries are tagged with the data they read and dropped by `invalidate` when
+    a mutation writes that data. A version counter per tag, kept by the
+    backend, also stops a read that raced with a write from storing its
+    now-stale result. Writes made outside the API (seed scripts, other
+    services) are only picked up at TTL.
+    """
+
+    def __init__(self, backend=None, ttl: float = RESPONSE_CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def plan(self, data: dict, user: Optional[dict]) -> Optional[CachePlan]:
+        """A CachePlan if the request in `data` may be served from the cache, else None."""
+        query = data.get("query")
+        if not isinstance(query, str):
+            return None
+        description = describe_query(query)
+        if description is None:
+            return None
+        normalized, operations = description
+        operation_name = data.get("operationName")
+        if operation_name is None and len(operations) != 1:
+            return None
+        operation_type, fields = operations.get(operation_name, (None, None)) if operation_name else next(iter(operations.values()))
+        if operation_type is not OperationType.QUERY or not fields:
+            return None
+
+        tags: List[str] = []
+        for field in fields:
+            if field == "__typename":
+                continue
+            if field not in CACHEABLE_FIELDS:
+                return None
+            tags.extend(t for t in CACHEABLE_FIELDS[field] if t not in tags)
+        user_scoped = any(field in USER_SCOPED_FIELDS for field in fields)
+        scope = (f"user:{user.get('sub')}" if user else "anonymous") if user_scoped else "public"
+
+        raw = "\0".join((scope, normalized, operation_name or "", json.dumps(data.get("variables") or {}, sort_keys=True)))
+        key = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+        return CachePlan(key, tuple(tags), user_scoped)
+
+    def get(self, plan: CachePlan) -> Optional[CachedResponse]:
+        """The cached response for `plan`, if any. Call before executing: it records the tag versions `put` checks."""
+        entry = None
+        if self.backend is not None:
+            plan.versions = self.backend.versions(plan.tags)
+            entry = self.backend.get(plan.key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def put(self, plan: CachePlan, body: bytes) -> CachedResponse:
+        """Stores `body` unless one of its tags was invalidated since `plan`; returns the entry either way for its ETag."""
+        entry = CachedResponse(body, plan.tags, time.time() + self.ttl, plan.user_scoped)
+        if self.backend is not None and plan.versions is not None:
+            self.backend.set(plan.key, entry)
+            # Checked after the write: an invalidation that bumped a version
+            # before this read has already run its delete, so undo the write;
+            # one that bumps later deletes the entry itself.
+            if self.backend.versions(plan.tags) != plan.versions:
+                self.backend.delete(plan.key)
+        return entry
+
+    def invalidate(self, *tags: str) -> None:
+        if self.backend is not None:
+            self.backend.invalidate(tags)
+
+    def clear(self) -> None:
+        if self.backend is not None:
+            self.backend.clear()
+
+
+def _backend(name: str):
+    if name == "memory":
+        return MemoryBackend()
+    if name == "mongo":
+        return MongoBackend()
+    if name == "off":
+        return None
+    raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND {name!r}; expected memory, mongo or off.")
+
+response_cache = ResponseCache(_backend(RESPONSE_CACHE_BACKEND))
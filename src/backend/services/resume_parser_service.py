@@ -0,0 +1,294 @@
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..repository import change_log_repo, user_repo
+
+try:  # optional: only needed for .pdf resumes
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+try:  # optional: only needed for .docx resumes
+    import docx
+except ImportError:
+    docx = None
+
+RESUME_EXTENSIONS = (".txt", ".md", ".pdf", ".docx")
+# Text past this many characters is ignored, which bounds each worker's memory.
+MAX_RESUME_CHARS = 200_000
+SUMMARY_MAX_CHARS = 600
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+LEADING_ID_RE = re.compile(r"^(\d+)")
+SUMMARY_HEADINGS = ("summary", "professional summary", "profile", "about", "about me", "objective", "career objective")
+SECTION_HEADINGS = SUMMARY_HEADINGS + (
+    "experience", "work experience", "employment", "education", "skills", "technical skills",
+    "projects", "certifications", "languages", "interests", "references", "publications", "awards",
+)
+TITLE_WORDS = re.compile(
+    r"\b(engineer|developer|scientist|analyst|manager|designer|architect|consultant|specialist|"
+    r"administrator|researcher|lead|director|intern|programmer|technician|officer|coordinator)s?\b",
+    re.IGNORECASE,
+)
+
+
+# --- Skill matching ---
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over a skill vocabulary: one pass over a resume
+    finds every skill in it, however large the vocabulary. Matching is
+    case-insensitive and only whole words count ("Java" is not found in
+    "JavaScript"); where matches overlap, the longest wins.
+    """
+
+    def __init__(self, skills: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]  # pattern ids ending at each state
+        self._names: List[str] = []
+        self._lengths: List[int] = []
+        seen = set()
+        for skill in skills:
+            key = skill.strip().casefold() if isinstance(skill, str) else ""
+            if key and key not in seen:
+                seen.add(key)
+                self._insert(key, skill.strip())
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _insert(self, key: str, name: str) -> None:
+        state = 0
+        for ch in key:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(len(self._names))
+        self._names.append(name)
+        self._lengths.append(len(key))
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())  # depth-1 states keep failing to the root
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> List[str]:
+        """The vocabulary spellings of the skills in `text`, in order of first appearance."""
+        text = text.casefold()
+        goto, fail, out = self._goto, self._fail, self._out
+        matches: List[Tuple[int, int, int]] = []  # (start, -length, pattern id)
+        state = 0
+        for end, ch in enumerate(text, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern in out[state]:
+                start = end - self._lengths[pattern]
+                if _word_boundary(text, start - 1) and _word_boundary(text, end):
+                    matches.append((start, -self._lengths[pattern], pattern))
+        found: Dict[str, None] = {}
+        covered = 0
+        for start, negative_length, pattern in sorted(matches):
+            if start >= covered:
+                found.setdefault(self._names[pattern])
+                covered = start - negative_length
+        return list(found)
+
+def _word_boundary(text: str, index: int) -> bool:
+    # Word characters as search tokens have them (TOKEN_RE), so "C" is not found in "C++" or "C#".
+    return index < 0 or index >= len(text) or not (text[index].isalnum() or text[index] in "_+#")
+
+
+# --- Text extraction ---
+def extract_text(path: str) -> str:
+    """The plain text of a .txt/.md, .pdf or .docx resume, cut at MAX_RESUME_CHARS."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".txt", ".md"):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return f.read(MAX_RESUME_CHARS)
+    if ext == ".pdf":
+        if PdfReader is None:
+            raise ValueError("Reading PDF resumes requires the 'pypdf' package.")
+        parts, size = [], 0
+        for page in PdfReader(path).pages:
+            text = page.extract_text() or ""
+            parts.append(text)
+            size += len(text)
+            if size >= MAX_RESUME_CHARS:
+                break
+        return "\n".join(parts)[:MAX_RESUME_CHARS]
+    if ext == ".docx":
+        if docx is None:
+            raise ValueError("Reading DOCX resumes requires the 'python-docx' package.")
+        return "\n".join(p.text for p in docx.Document(path).paragraphs)[:MAX_RESUME_CHARS]
+    raise ValueError(f"Unsupported resume format '{ext}'.")
+
+
+# --- Heuristics ---
+def _heading(line: str) -> Optional[str]:
+    key = line.strip().strip(":").strip().casefold()
+    return key if key in SECTION_HEADINGS else None
+
+def extract_title(lines: List[str]) -> Optional[str]:
+    """A job title from the resume header: the first short line near the top that names a role."""
+    for line in lines[:12]:
+        line = line.strip(" \t|•-")
+        if not line or len(line) > 80 or "@" in line or _heading(line) or sum(c.isdigit() for c in line) > 4:
+            continue
+        if TITLE_WORDS.search(line):
+            return line
+    return None
+
+def extract_summary(lines: List[str]) -> Optional[str]:
+    """The text under a Summary/Profile/Objective heading, up to the next heading."""
+    collected: List[str] = []
+    inside = False
+    for line in lines:
+        heading = _heading(line)
+        if heading is not None:
+            if inside:
+                break
+            inside = heading in SUMMARY_HEADINGS
+            continue
+        if inside and line.strip():
+            collected.append(line.strip())
+    summary = " ".join(collected)
+    if len(summary) > SUMMARY_MAX_CHARS:
+        summary = summary[:SUMMARY_MAX_CHARS].rsplit(" ", 1)[0] + "…"
+    return summary or None
+
+def parse_resume(text: str, matcher: SkillMatcher) -> dict:
+    lines = text.splitlines()
+    email = EMAIL_RE.search(text)
+    return {
+        "skills": matcher.find(text),
+        "ProfessionalTitle": extract_title(lines),
+        "Summary": extract_summary(lines),
+        "email": email.group(0) if email else None,
+    }
+
+def user_id_from_path(path: str) -> Optional[int]:
+    """The UserID a resume file is named after, e.g. 1042.pdf or 1042_jane_doe.docx."""
+    match = LEADING_ID_RE.match(os.path.basename(path))
+    return int(match.group(1)) if match else None
+
+def iter_resume_files(root: str) -> Iterator[str]:
+    """Lazily walks `root` for resume files, so huge directories are never listed in memory at once."""
+    for dirpath, _, filenames in os.walk(root):
+        for name in sorted(filenames):
+            if name.lower().endswith(RESUME_EXTENSIONS):
+                yield os.path.join(dirpath, name)
+
+
+# --- Worker processes ---
+_worker_matcher: Optional[SkillMatcher] = None
+
+def _init_worker(skills: List[str]) -> None:
+    # The automaton is built once per process, not pickled with every task.
+    global _worker_matcher
+    _worker_matcher = SkillMatcher(skills)
+
+def _parse_chunk(paths: List[str]) -> List[dict]:
+    results = []
+    for path in paths:
+        try:
+            result = parse_resume(extract_text(path), _worker_matcher)
+            result["error"] = None
+        except Exception as e:  # one unreadable file must not sink its chunk
+            result = {"error": str(e) or type(e).__name__}
+        result["path"] = path
+        result["UserID"] = user_id_from_path(path)
+        results.append(result)
+    return results
+
+
+# --- Pipeline ---
+def ingest_resumes(
+    paths: Iterable[str],
+    skills: List[str],
+    workers: Optional[int] = None,
+    chunk_size: int = 32,
+    batch_size: int = 1000,
+    dry_run: bool = False,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Parses resumes in a process pool and merges the results into the users
+    collection with one bulk_write per `batch_size` profiles.
+
+    Paths are streamed in chunks and at most `workers * 2` chunks are in
+    flight, so memory stays flat however many files there are. A resume is
+    matched to its profile by a UserID at the start of the file name, else by
+    the account that owns the first email address in it.
+    """
+    workers = workers or os.cpu_count() or 2
+    report = {"files": 0, "parsed": 0, "modified": 0, "unmatched": 0, "failed": 0, "errors": []}
+    pending: List[dict] = []
+    started = time.perf_counter()
+
+    def flush() -> None:
+        by_email = user_repo.find_user_ids_by_email([r["email"] for r in pending if r["UserID"] is None and r["email"]])
+        profiles = []
+        for result in pending:
+            user_id = result["UserID"] if result["UserID"] is not None else by_email.get(result["email"])
+            if user_id is None:
+                report["unmatched"] += 1
+            else:
+                profiles.append((user_id, result))
+        if profiles and not dry_run:
+            report["modified"] += user_repo.merge_resume_profiles(profiles)
+            # Running servers re-read these profiles into their candidate indexes.
+            change_log_repo.record_changes("users", (user_id for user_id, _ in profiles))
+        pending.clear()
+
+    def collect(results: List[dict]) -> None:
+        for result in results:
+            report["files"] += 1
+            if result["error"]:
+                report["failed"] += 1
+                if len(report["errors"]) < 100:
+                    report["errors"].append(f"{result['path']}: {result['error']}")
+                continue
+            report["parsed"] += 1
+            pending.append(result)
+        if len(pending) >= batch_size:
+            flush()
+            if progress:
+                progress({**report, "elapsed": time.perf_counter() - started})
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(list(skills),)) as pool:
+        in_flight = set()
+        chunk: List[str] = []
+        for path in paths:
+            chunk.append(path)
+            if len(chunk) < chunk_size:
+                continue
+            if len(in_flight) >= workers * 2:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    collect(future.result())
+            in_flight.add(pool.submit(_parse_chunk, chunk))
+            chunk = []
+        if chunk:
+            in_flight.add(pool.submit(_parse_chunk, chunk))
+        for future in in_flight:
+            collect(future.result())
+    flush()
+    report["elapsed"] = time.perf_counter() - started
+    return report
@@ -0,0 +1,264 @@
+import atexit
+import heapq
+import math
+import os
+import pickle
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+from ..repository import job_repo
+from .change_feed_service import ChangeFeed
+
+env_path = os.path.join(os.path.dirname(__file__), '../../config/.env')
+load_dotenv(dotenv_path=env_path)
+
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH")  # e.g. data/job_search_index.pickle; unset = rebuilt on every start
+SEARCH_SNAPSHOT_DELAY = float(os.getenv("SEARCH_SNAPSHOT_DELAY", "30"))
+
+# BM25 parameters, and how much one occurrence in each field counts towards a
+# term's frequency (a simplified BM25F).
+BM25_K1 = 1.2
+BM25_B = 0.75
+FIELD_WEIGHTS = {"title": 3.0, "skillsRequired": 2.0, "description": 1.0}
+SNAPSHOT_VERSION = 1
+
+# Words, keeping the symbols of names like "c++", "c#" and "node.js".
+TOKEN_RE = re.compile(r"\w[\w+#]*(?:\.\w+)*")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the this to was we will with you your".split()
+)
+_INFLECTIONS = ("ing", "ed")
+_DERIVATIONS = ("ational", "ization", "fulness", "iveness", "ation", "ement", "ment", "ness", "able", "ible", "ity", "ive", "er", "or", "ly")
+
+
+def stem(word: str) -> str:
+    """
+    A light suffix-stripping stemmer, so "developers", "developer" and
+    "developing" all index as "develop". It only has to map variants of a word
+    to the same key, not produce dictionary words.
+    """
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif word.endswith(("sses", "xes", "ches", "shes")):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    for suffix in _INFLECTIONS:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "lsz":
+                word = word[:-1]  # planning -> plan
+            break
+    for suffix in _DERIVATIONS:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            word = word[:-len(suffix)]
+            break
+    if len(word) > 4 and word.endswith("e"):
+        word = word[:-1]  # manage / managed / manager -> manag
+    return word
+
+def analyze(text: Optional[str]) -> List[str]:
+    """The index terms of a piece of text: case-folded, stop words dropped, stemmed."""
+    if not isinstance(text, str):
+        return []
+    return [stem(t) for t in (m.casefold() for m in TOKEN_RE.findall(text)) if t not in STOP_WORDS]
+
+
+class JobSearchIndex:
+    """
+    In-process BM25 inverted index over job titles, descriptions and skills.
+
+    A query only visits the postings of its own terms, so a selective search
+    costs the same on a thousand jobs as on a million. Job writes patch the
+    index through the resolver hooks, and those made through other workers
+    arrive via the change log. With SEARCH_INDEX_PATH set, the index is
+    pickled there (debounced after writes, and on exit) with its change log
+    position, and reloaded on start if it holds as many jobs, up to the same
+    highest jobId, as the collection; the changes logged since are replayed.
+    That check cannot see jobs edited in place outside the API, so delete the
+    file (or call `reset()`) after such edits.
+    """
+
+    def __init__(self, path: Optional[str] = SEARCH_INDEX_PATH, snapshot_delay: float = SEARCH_SNAPSHOT_DELAY):
+        self.path = path
+        self.snapshot_delay = snapshot_delay
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self._feed = ChangeFeed("jobs")
+        self._clear()
+
+    def _clear(self) -> None:
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._doc_terms: Dict[int, Tuple[str, ...]] = {}
+        self._doc_lengths: Dict[int, float] = {}
+        self._total_length = 0.0
+        self._loaded = False
+        self._dirty = False
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._doc_lengths)
+
+    def _ensure_loaded(self) -> None:
+        with self._lock:
+            if not self._loaded:
+                if not self._load_snapshot():
+                    self._feed.start()
+                    for doc in job_repo.find_job_search_fields():
+                        self._add(doc)
+                    self._dirty = True
+                    self._schedule_snapshot(delay=0)
+                self._loaded = True
+            # Under the lock, so a snapshot never records a position whose changes
+            # are not applied yet. Also replays what was logged after a loaded snapshot.
+            self._feed.catch_up(self._apply_changes, self._rebuild)
+
+    def _apply_changes(self, job_ids: Set[int]) -> None:
+        # Caller holds the lock. Re-read the jobs other workers wrote; the ones not found were deleted.
+        docs = list(job_repo.find_job_search_fields(job_ids))
+        for doc in docs:
+            self._add(doc)
+        for job_id in job_ids - {int(d["jobId"]) for d in docs}:
+            self._remove(job_id)
+        self._dirty = True
+        self._schedule_snapshot()
+
+    def _rebuild(self) -> None:
+        # Caller holds the lock.
+        self.reset()
+        self._ensure_loaded()
+
+    def _add(self, doc: dict) -> None:
+        job_id = int(doc["jobId"])
+        self._remove(job_id)
+        frequencies: Dict[str, float] = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            value = doc.get(field)
+            texts = value if isinstance(value, list) else [value]
+            for text in texts:
+                for term in analyze(text):
+                    frequencies[term] += weight
+        length = sum(frequencies.values())
+        self._doc_terms[job_id] = tuple(frequencies)
+        self._doc_lengths[job_id] = length
+        self._total_length += length
+        for term, frequency in frequencies.items():
+            self._postings[term][job_id] = frequency
+
+    def _remove(self, job_id: int) -> None:
+        for term in self._doc_terms.pop(job_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(job_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(job_id, 0.0)
+
+    def add_job(self, doc: dict) -> None:
+        """Indexes (or re-indexes) a full job document."""
+        with self._lock:
+            if self._loaded:
+                # Before the first load there is nothing to patch; the load reads MongoDB.
+                self._add(doc)
+                self._dirty = True
+                self._schedule_snapshot()
+
+    def remove_job(self, job_id: int) -> None:
+        """Drops a job from the index."""
+        with self._lock:
+            if self._loaded:
+                self._remove(int(job_id))
+                self._dirty = True
+                self._schedule_snapshot()
+
+    def reset(self) -> None:
+        """Forgets everything, including the snapshot; the next search rebuilds from MongoDB."""
+        with self._lock:
+            self._clear()
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+
+    def search(self, query: str, limit: int) -> List[Tuple[int, float]]:
+        """(jobId, BM25 score) pairs for the jobs matching any term of `query`, best first."""
+        self._ensure_loaded()
+        terms = set(analyze(query))
+        with self._lock:
+            count = len(self._doc_lengths)
+            if not terms or not count:
+                return []
+            average_length = self._total_length / count or 1.0
+            scores: Dict[int, float] = defaultdict(float)
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for job_id, frequency in postings.items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_lengths[job_id] / average_length)
+                    scores[job_id] += idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+        return heapq.nsmallest(int(limit), scores.items(), key=lambda pair: (-pair[1], pair[0]))
+
+    # --- Snapshots ---
+    def _schedule_snapshot(self, delay: Optional[float] = None) -> None:
+        # Caller holds the lock. Coalesces a burst of writes into one snapshot.
+        if not self.path or self._timer is not None:
+            return
+        self._timer = threading.Timer(self.snapshot_delay if delay is None else delay, self.save_snapshot)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def save_snapshot(self) -> None:
+        """Writes the index to `path` atomically, so a crash never leaves a torn file."""
+        if not self.path:
+            return
+        with self._lock:
+            self._timer = None
+            if not (self._loaded and self._dirty):
+                return
+            state = {
+                "version": SNAPSHOT_VERSION,
+                "fingerprint": self._fingerprint(),
+                "generation": self._feed.position,
+                "postings": dict(self._postings),
+                "doc_terms": self._doc_terms,
+                "doc_lengths": self._doc_lengths,
+            }
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+    def _fingerprint(self) -> Tuple[int, Optional[int]]:
+        # Taken from the index itself, so a worker that missed another worker's
+        # writes saves a snapshot that no longer matches the collection.
+        return len(self._doc_lengths), max(self._doc_lengths, default=None)
+
+    def _load_snapshot(self) -> bool:
+        # Caller holds the lock. Only load snapshots this server wrote: unpickling runs code.
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "rb") as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return False
+        if state.get("version") != SNAPSHOT_VERSION or state.get("fingerprint") != job_repo.jobs_fingerprint():
+            return False
+        self._postings = defaultdict(dict, state["postings"])
+        self._doc_terms = state["doc_terms"]
+        self._doc_lengths = state["doc_lengths"]
+        self._total_length = sum(self._doc_lengths.values())
+        self._feed.start(state.get("generation"))
+        return True
+
+
+job_search_index = JobSearchIndex()
+atexit.register(job_search_index.save_snapshot)
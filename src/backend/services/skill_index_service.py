@@ -0,0 +1,127 @@
+import heapq
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..repository import job_repo
+from .change_feed_service import ChangeFeed
+
+
+class JobSkillIndex:
+    """
+    In-process inverted index from skill name to the jobIds that require it.
+
+    Only jobs sharing at least one skill with a candidate are ever visited,
+    so recommendation cost grows with the number of matching jobs rather
+    than with the size of the catalog. Writes through this process patch the
+    index directly; writes through other workers arrive via the change log.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._job_skills: Dict[int, Set[str]] = {}
+        self._required_counts: Dict[int, int] = {}
+        self._loaded = False
+        self._feed = ChangeFeed("jobs")
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            self._feed.catch_up(self._apply_changes, self._rebuild)
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._feed.start()
+            for doc in job_repo.find_job_skills():
+                self._add(doc)
+            self._loaded = True
+
+    def _apply_changes(self, job_ids: Set[int]) -> None:
+        # Re-read the jobs other workers wrote; the ones not found were deleted.
+        docs = list(job_repo.find_job_skills(job_ids))
+        with self._lock:
+            for doc in docs:
+                self._add(doc)
+            for job_id in job_ids - {int(d["jobId"]) for d in docs}:
+                self._remove(job_id)
+
+    def _rebuild(self) -> None:
+        with self._lock:
+            self.reset()
+            self._ensure_loaded()
+
+    def _add(self, doc: dict) -> None:
+        job_id = int(doc["jobId"])
+        self._remove(job_id)
+        required = doc.get("skillsRequired") or []
+        skills = set(required)
+        self._job_skills[job_id] = skills
+        self._required_counts[job_id] = len(required)
+        for skill in skills:
+            self._postings[skill].add(job_id)
+
+    def _remove(self, job_id: int) -> None:
+        for skill in self._job_skills.pop(job_id, ()):
+            postings = self._postings.get(skill)
+            if postings is not None:
+                postings.discard(job_id)
+                if not postings:
+                    del self._postings[skill]
+        self._required_counts.pop(job_id, None)
+
+    def add_job(self, doc: dict) -> None:
+        """Indexes (or re-indexes) a job document with jobId and skillsRequired."""
+        with self._lock:
+            if self._loaded:
+                # Before the first load there is nothing to patch; the load reads MongoDB.
+                self._add(doc)
+
+    def remove_job(self, job_id: int) -> None:
+        """Drops a job from the index."""
+        with self._lock:
+            if self._loaded:
+                self._remove(int(job_id))
+
+    def reset(self) -> None:
+        """Forgets everything; the next lookup reloads from MongoDB."""
+        with self._lock:
+            self._postings.clear()
+            self._job_skills.clear()
+            self._required_counts.clear()
+            self._loaded = False
+
+    def top_matches(self, candidate_skills: Iterable[str], threshold: int, limit: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Returns (jobId, score) pairs for jobs scoring at least `threshold`,
+        best first, using the same scoring as `calculate_match_score`.
+        """
+        self._ensure_loaded()
+        skills = set(candidate_skills or [])
+        with self._lock:
+            hits: Dict[int, int] = defaultdict(int)
+            for skill in skills:
+                for job_id in self._postings.get(skill, ()):
+                    hits[job_id] += 1
+            if threshold <= 0:
+                # A zero score still qualifies, so jobs sharing no skills count too.
+                candidates = {job_id: hits.get(job_id, 0) for job_id in self._required_counts}
+            else:
+                candidates = hits
+
+            scored = []
+            for job_id, matches in candidates.items():
+                required = self._required_counts.get(job_id, 0)
+                score = int((matches / required) * 100) if required else 0
+                if score >= threshold:
+                    scored.append((score, job_id))
+
+        key = lambda pair: (-pair[0], pair[1])
+        if limit is not None:
+            best = heapq.nsmallest(int(limit), scored, key=key)
+        else:
+            best = sorted(scored, key=key)
+        return [(job_id, score) for score, job_id in best]
+
+
+job_skill_index = JobSkillIndex()
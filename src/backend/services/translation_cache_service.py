@@ -0,0 +1,117 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+
+env_path = os.path.join(os.path.dirname(__file__), '../../config/.env')
+load_dotenv(dotenv_path=env_path)
+
+NL2GQL_CACHE_SIZE = int(os.getenv("NL2GQL_CACHE_SIZE", "1024"))
+NL2GQL_CACHE_TTL = float(os.getenv("NL2GQL_CACHE_TTL", "86400"))
+NL2GQL_CACHE_PATH = os.getenv("NL2GQL_CACHE_PATH")  # e.g. data/nl2gql_cache.sqlite3; unset = memory only
+
+
+def normalize_text(user_text: str) -> str:
+    """
+    Whitespace-insensitive form of a chat message. Case is kept: argument
+    values such as "Python Developer" end up verbatim in the generated
+    operation, so messages differing only in case must not share a translation.
+    """
+    return " ".join(user_text.split())
+
+def translation_key(user_text: str, schema_sdl: str, model: str) -> str:
+    """
+    Cache key for one translation. The schema and model are part of the key,
+    so editing schema_for_llm.graphql or switching OLLAMA_MODEL never serves
+    operations generated against the old ones.
+    """
+    schema_hash = hashlib.sha256(schema_sdl.encode("utf-8")).hexdigest()
+    raw = "\0".join((model, schema_hash, normalize_text(user_text)))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """
+    LRU + TTL cache from translation_key() to the GraphQL operation the LLM
+    produced, optionally written through to a SQLite file so entries survive
+    restarts.
+
+    Only the operation text is cached, never its result: the prompt carries no
+    user data, so a translation is the same for everyone, and the operation is
+    still executed per request with the caller's own context. "update my
+    skills" therefore always runs `updateMyProfile` as whoever sent it.
+    """
+
+    def __init__(self, maxsize: int = NL2GQL_CACHE_SIZE, ttl: float = NL2GQL_CACHE_TTL, path: Optional[str] = NL2GQL_CACHE_PATH):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._conn = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, gql TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            self._conn.execute("DELETE FROM translations WHERE expires <= ?", (time.time(),))
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._conn is not None:
+                row = self._conn.execute("SELECT gql, expires FROM translations WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    entry = self._remember(key, row[0], row[1])
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    self._forget(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, gql: str) -> None:
+        expires = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, gql, expires)
+            if self._conn is not None:
+                self._conn.execute("INSERT OR REPLACE INTO translations (key, gql, expires) VALUES (?, ?, ?)", (key, gql, expires))
+                self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM translations")
+                self._conn.commit()
+
+    def _remember(self, key: str, gql: str, expires: float) -> Tuple[str, float]:
+        # Caller holds the lock. The disk store is not size-bounded; expired rows are purged on startup.
+        entry = self._entries[key] = (gql, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def _forget(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM translations WHERE key = ?", (key,))
+            self._conn.commit()
+
+
+translation_cache = TranslationCache()
@@ -1,7 +1,8 @@
 import re
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+WORD_RE = re.compile(r"\w+")
 
 def require_non_empty_str(value: Optional[str], field: str) -> str:
     if value is None or (isinstance(value, str) and value.strip() == ""):
@@ -17,3 +18,15 @@ def validate_date_str(value: Optional[str]) -> Optional[str]:
 
 def clean_update_input(input_data: Dict[str, Any]) -> Dict[str, Any]:
     return {k: v for k, v in (input_data or {}).items() if v is not None}
+
+def normalize_ci(value: Optional[str]) -> Optional[str]:
+    """Case-folded, trimmed form of a string, used for index-friendly case-insensitive equality."""
+    if not isinstance(value, str):
+        return None
+    return value.strip().casefold()
+
+def tokenize_words(value: Optional[str]) -> List[str]:
+    """Distinct case-folded words of a string, in order of first appearance."""
+    if not isinstance(value, str):
+        return []
+    return list(dict.fromkeys(w.casefold() for w in WORD_RE.findall(value)))
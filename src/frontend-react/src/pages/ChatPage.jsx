@@ -1,6 +1,6 @@
 import { useState, useContext, useEffect, useRef } from "react";
 import { AuthContext } from "../context/AuthContext";
-import { sendNlQuery } from "../services/api"; // Import our new API service
+import { streamNlQuery } from "../services/api"; // Import our new API service
 import Message from "../components/Message";
 import MessageInput from "../components/MessageInput";
 import '../components/Chat.css'; // Import the shared chat styles
@@ -21,20 +21,35 @@ const ChatPage = () => {
     }
   }, [messages]);
 
+  // Replaces the content of the last message (the assistant reply being streamed).
+  const setLastMessage = (content) => {
+    setMessages(prevMessages => [...prevMessages.slice(0, -1), { role: "assistant", content }]);
+  };
+
   const handleSend = async (prompt) => {
     if (!prompt) return;
 
     setIsLoading(true);
-    // Immediately add the user's message to the chat for a responsive feel
-    setMessages(prevMessages => [...prevMessages, { role: "user", content: prompt }]);
+    // Immediately add the user's message and a placeholder reply that fills in as tokens arrive
+    setMessages(prevMessages => [
+      ...prevMessages,
+      { role: "user", content: prompt },
+      { role: "assistant", content: "_Generating..._" },
+    ]);
 
     try {
-      const response = await sendNlQuery(prompt);
-      
-      const data = response.data;
+      let generated = '';
+      const { status, body: data } = await streamNlQuery(prompt, {
+        onToken: (token) => {
+          generated += token;
+          // The model wraps its answer in a ```graphql fence; drop it so the draft renders as one code block
+          const draft = generated.replace(/```(graphql)?/g, '').trim();
+          setLastMessage(`**Generating GraphQL:**\n\n\`\`\`graphql\n${draft}\n\`\`\``);
+        },
+      });
       let assistantContent;
 
-      if (response.status !== 200 || data.error) {
+      if (status !== 200 || data.error) {
         // Handle application-level errors returned from the backend
         assistantContent = `**Error:** ${data.error?.message || 'An unknown error occurred.'}`;
       } else {
@@ -43,13 +58,12 @@ const ChatPage = () => {
         const result = data.result || {};
         assistantContent = `**Generated GraphQL:**\n\n\`\`\`graphql\n${gql}\n\`\`\`\n\n**Result:**\n\n\`\`\`json\n${JSON.stringify(result, null, 2)}\n\`\`\``;
       }
-      // Add the assistant's response to the chat
-      setMessages(prevMessages => [...prevMessages, { role: "assistant", content: assistantContent }]);
+      // Replace the streamed draft with the final response
+      setLastMessage(assistantContent);
 
     } catch (error) {
       // Handle network errors (e.g., backend is down, CORS issues)
-      const errorMsg = error.response?.data?.error?.message || error.message;
-      setMessages(prevMessages => [...prevMessages, { role: "assistant", content: `**Error:** ${errorMsg}` }]);
+      setLastMessage(`**Error:** ${error.message}`);
     } finally {
       // Re-enable the input form regardless of success or failure
       setIsLoading(false);
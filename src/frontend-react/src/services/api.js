@@ -23,8 +23,77 @@ export const sendNlQuery = (query) => {
   return apiClient.post('/nl2gql', { query });
 };
 
-export const sendGqlQuery = (query, variables = {}) => {
+// Parses one Server-Sent Events block ("event: x\ndata: {...}") into { event, data }.
+const parseSseEvent = (block) => {
+  let event = 'message';
+  const dataLines = [];
+  for (const line of block.split('\n')) {
+    if (line.startsWith('event:')) event = line.slice(6).trim();
+    else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+  }
+  return dataLines.length ? { event, data: JSON.parse(dataLines.join('\n')) } : null;
+};
+
+// Streams /nl2gql/stream: calls onToken(text) per generated token, then resolves
+// with the final { status, body } result event (body matches /nl2gql's response).
+// Uses fetch because axios cannot expose a response body as it arrives.
+export const streamNlQuery = async (query, { onToken } = {}) => {
+  const headers = { 'Content-Type': 'application/json' };
+  const token = localStorage.getItem('token');
+  if (token) {
+    headers['Authorization'] = `Bearer ${token}`;
+  }
+  const response = await fetch(`${API_URL}/nl2gql/stream`, {
+    method: 'POST',
+    headers,
+    body: JSON.stringify({ query }),
+  });
+  if (!response.ok || !response.body) {
+    // Validation errors are returned as plain JSON before the stream starts.
+    const body = await response.json().catch(() => ({}));
+    return { status: response.status, body };
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let result = null;
+  for (;;) {
+    const { value, done } = await reader.read();
+    buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const parsed = parseSseEvent(buffer.slice(0, boundary));
+      buffer = buffer.slice(boundary + 2);
+      if (parsed?.event === 'token') onToken?.(parsed.data.token);
+      else if (parsed?.event === 'result') result = parsed.data;
+    }
+    if (done) break;
+  }
+  return result || { status: 502, body: { error: { message: 'Stream ended without a result.' } } };
+};
+
+// sha256 hex digest of the query text, as used by automatic persisted queries.
+const sha256Hex = async (text) => {
+  const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(text));
+  return Array.from(new Uint8Array(digest)).map((b) => b.toString(16).padStart(2, '0')).join('');
+};
+
+const isPersistedQueryNotFound = (response) =>
+  response.data?.errors?.some((e) => e.extensions?.code === 'PERSISTED_QUERY_NOT_FOUND');
+
+// Automatic persisted queries: send only the hash, and the full text only after a cache miss.
+export const sendGqlQuery = async (query, variables = {}) => {
+  if (!globalThis.crypto?.subtle) {
+    // crypto.subtle is unavailable outside secure contexts; fall back to plain requests.
     return apiClient.post('/graphql', { query, variables });
+  }
+  const extensions = { persistedQuery: { version: 1, sha256Hash: await sha256Hex(query) } };
+  const response = await apiClient.post('/graphql', { variables, extensions });
+  if (!isPersistedQueryNotFound(response)) {
+    return response;
+  }
+  return apiClient.post('/graphql', { query, variables, extensions });
 };
 
 export default apiClient;
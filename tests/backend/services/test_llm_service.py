@@ -0,0 +1,124 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "scripts"))
+
+from src.backend.services.llm_service import LLMClient, LLMError
+from stub_ollama import start_stub_server
+
+BODY = {"model": "stub", "prompt": "list jobs", "stream": False}
+
+
+@pytest.fixture
+def stub():
+    server = start_stub_server(delay=0.3)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def _url(server, path="/api/generate"):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for condition"
+        time.sleep(0.005)
+
+def _run_concurrently(count, call):
+    """Runs `call` on `count` threads; returns each thread's result or raised exception."""
+    outcomes = [None] * count
+
+    def run(index):
+        try:
+            outcomes[index] = call()
+        except BaseException as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return outcomes
+
+def _hold_leader(client, followers):
+    """Wraps the client's session so the leader's POST waits until `followers` calls have joined its flight."""
+    post = client._session.post
+
+    def held_post(*args, **kwargs):
+        _wait_for(lambda: client.coalesced >= followers)
+        return post(*args, **kwargs)
+
+    client._session.post = held_post
+
+
+def test_busy_model_fails_fast_with_503(stub):
+    client = LLMClient(_url(stub), max_concurrency=1, queue_timeout=0.05)
+    holder = threading.Thread(target=client.generate, args=({**BODY, "prompt": "slow"},))
+    holder.start()
+    _wait_for(lambda: stub.active == 1)
+
+    started = time.monotonic()
+    with pytest.raises(LLMError) as excinfo:
+        client.generate(BODY)
+    assert excinfo.value.status == 503
+    assert time.monotonic() - started < 0.3  # did not wait for the running generation
+    holder.join()
+    assert stub.requests == 1
+
+def test_identical_requests_share_one_generation(stub):
+    client = LLMClient(_url(stub))
+    _hold_leader(client, followers=4)
+
+    outcomes = _run_concurrently(5, lambda: client.generate(BODY))
+
+    assert stub.requests == 1
+    assert client.coalesced == 4
+    assert all(isinstance(o, dict) and o["done"] for o in outcomes)
+    assert all(o is outcomes[0] for o in outcomes)
+
+def test_leader_llm_error_reaches_followers(stub):
+    client = LLMClient(_url(stub, "/api/missing"))  # the stub answers 404
+    _hold_leader(client, followers=2)
+
+    outcomes = _run_concurrently(3, lambda: client.generate(BODY))
+
+    assert all(isinstance(o, LLMError) and o.status == 502 for o in outcomes)
+    assert stub.requests == 0
+
+def test_unexpected_leader_failure_reaches_followers_as_502(stub):
+    client = LLMClient(_url(stub))
+
+    def failing_post(*args, **kwargs):
+        _wait_for(lambda: client.coalesced >= 2)
+        raise RuntimeError("boom")
+
+    client._session.post = failing_post
+    outcomes = _run_concurrently(3, lambda: client.generate(BODY))
+
+    assert sum(isinstance(o, RuntimeError) for o in outcomes) == 1  # the leader sees the original error
+    followers = [o for o in outcomes if isinstance(o, LLMError)]
+    assert len(followers) == 2
+    assert all(o.status == 502 and isinstance(o.__cause__, RuntimeError) for o in followers)
+
+def test_failed_flight_is_not_reused(stub):
+    client = LLMClient(_url(stub))
+    post = client._session.post
+
+    def failing_post(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    client._session.post = failing_post
+    with pytest.raises(RuntimeError):
+        client.generate(BODY)
+
+    client._session.post = post
+    assert client.generate(BODY)["done"] is True
+    assert stub.requests == 1
@@ -0,0 +1,16 @@
+import os
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
+sys.path.insert(0, project_root)
+
+from src.backend.services.resume_parser_service import SkillMatcher
+
+
+def test_skill_is_not_found_inside_a_longer_token():
+    matcher = SkillMatcher(["C", "Python", "Go"])
+    assert matcher.find("Skills: C++, C#, Python, golang") == ["Python"]
+
+def test_skills_ending_in_plus_or_hash_match_whole():
+    matcher = SkillMatcher(["C", "C++", "C#"])
+    assert matcher.find("Skills: C++, C#, and some C.") == ["C++", "C#", "C"]